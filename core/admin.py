@@ -13,11 +13,11 @@ import base64
 from io import BytesIO
 from decimal import Decimal
 from datetime import timedelta
-from datetime import date
 from django.contrib import admin
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.admin.views.main import ChangeList
 from django.utils.html import format_html
 from django.contrib import messages
 from django.contrib.auth.forms import PasswordResetForm
@@ -26,6 +26,7 @@ from django.shortcuts import redirect, get_object_or_404
 from django.utils import timezone
 from django.http import JsonResponse
 from django.http import HttpResponse, FileResponse
+from django.template.response import TemplateResponse
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
@@ -55,7 +56,26 @@ from .models import (
     Apresentacao,
     ApresentacaoItem,
     PromotorApresentacao,
+    BuscaSalva,
 )
+from .areas import filtro_areas, filtro_areas_texto
+from .buscas_salvas import (
+    invalidar_todas as invalidar_buscas_salvas,
+    limpar_querystring,
+    querystring_abertura,
+    recalcular as recalcular_busca,
+    resultado as resultado_busca,
+)
+from .candidatos import ranquear_candidatos
+from .contadores import update_com_contadores
+from .dashboard import invalidar_snapshot
+from .geo import filtrar_por_raio
+from .idade import filtro_idade
+from .matching import parse_areas
+from .miniaturas import srcset, url_miniatura
+from .reputacao import ORDEM_CHOICES as ORDEM_REPUTACAO_CHOICES, ORDENS as ORDENS_REPUTACAO, filtrar_reputacao
+from .site_config import obter_site_config
+from .texto import numero
 
 import requests
 
@@ -465,26 +485,9 @@ class AreasAtuacaoFilter(admin.SimpleListFilter):
         if not tokens:
             return queryset
 
-        field = 'areas_atuacao'
-
-        # O campo é salvo como string com tokens separados por vírgula, ex:
-        # "recepcao, degustacao, bartender" e opcionalmente ", Outros: ..."
-        # Fazemos match por token com limites (início / ", ") para reduzir falsos positivos.
-        def token_match_q(token):
-            return (
-                Q(**{f"{field}__iexact": token}) |
-                Q(**{f"{field}__istartswith": f"{token},"}) |
-                Q(**{f"{field}__istartswith": f"{token}, "}) |
-                Q(**{f"{field}__icontains": f", {token},"}) |
-                Q(**{f"{field}__icontains": f", {token}, "}) |
-                Q(**{f"{field}__iendswith": f", {token}"})
-            )
-
-        combined_q = Q()
-        for token in tokens:
-            combined_q |= token_match_q(token)
-
-        return queryset.filter(combined_q)
+        # Códigos ou rótulos legados -> busca na relação UserProfile.areas (indexada)
+        slugs = parse_areas(', '.join(tokens))
+        return queryset.filter(filtro_areas(slugs))
 
 # Definições de parâmetros para a Sidebar Dinâmica (Ranges)
 class IdadeMinFilter(GhostFilter): title = 'Idade Mín'; parameter_name = 'idade_min'
@@ -495,6 +498,28 @@ class PesoMinFilter(GhostFilter): title = 'Peso Mín'; parameter_name = 'peso_mi
 class PesoMaxFilter(GhostFilter): title = 'Peso Máx'; parameter_name = 'peso_max'
 class SapatoMinFilter(GhostFilter): title = 'Sapato Mín'; parameter_name = 'sapato_min'
 class SapatoMaxFilter(GhostFilter): title = 'Sapato Máx'; parameter_name = 'sapato_max'
+class CalcadoFilter(GhostFilter): title = 'Calçado'; parameter_name = 'calcado'
+# Texto livre do modal (icontains/iexact em get_queryset), não lookup exato
+class CidadeFilter(GhostFilter): title = 'Cidade'; parameter_name = 'cidade'
+class EstadoFilter(GhostFilter): title = 'UF'; parameter_name = 'estado'
+class BairroFilter(GhostFilter): title = 'Bairro'; parameter_name = 'bairro'
+class ManequimFilter(GhostFilter): title = 'Manequim'; parameter_name = 'manequim'
+class RaioKmFilter(GhostFilter): title = 'Raio (km)'; parameter_name = 'raio_km'
+class RaioJobFilter(GhostFilter): title = 'Job (centro do raio)'; parameter_name = 'job'
+class AreasTextoFilter(GhostFilter): title = 'Áreas (texto do modal)'; parameter_name = 'areas_atuacao'
+class NotaMinFilter(GhostFilter): title = 'Nota Mínima'; parameter_name = 'nota_min'
+class JobsMinFilter(GhostFilter): title = 'Jobs Mínimos'; parameter_name = 'jobs_min'
+class OrdemReputacaoFilter(GhostFilter): title = 'Ordenar por'; parameter_name = 'ordem'
+class BuscaSalvaFilter(GhostFilter): title = 'Busca salva'; parameter_name = 'busca'
+
+
+class ChangeListSemContagem(ChangeList):
+    """ChangeList só para obter o queryset filtrado (buscas salvas): sem COUNTs."""
+    def get_results(self, request):
+        self.result_count = self.full_result_count = 0
+        self.result_list = []
+        self.can_show_all = self.multi_page = False
+        self.paginator = None
 
 # ==============================================================================
 # 3. AÇÕES DE CRM EM MASSA (AÇÕES DE GESTÃO)
@@ -502,7 +527,9 @@ class SapatoMaxFilter(GhostFilter): title = 'Sapato Máx'; parameter_name = 'sap
 
 @admin.action(description='✅ Aprovar Talentos Selecionados')
 def aprovar_modelos_massa(modeladmin, request, queryset):
-    updated = queryset.update(status='aprovado')
+    updated = update_com_contadores(queryset, status='aprovado')
+    invalidar_snapshot()  # queryset.update não dispara signals
+    invalidar_buscas_salvas()
     messages.success(request, f"{updated} talentos aprovados com sucesso.")
 
 @admin.action(description='❌ Reprovar em Massa (Popup Inteligente)')
@@ -510,11 +537,14 @@ def reprovar_modelos_massa(modeladmin, request, queryset):
     """Ação que recebe parâmetros injetados via JavaScript para reprovação."""
     motivo = request.POST.get('motivo_massa', 'outros')
     obs = request.POST.get('obs_massa', '')
-    queryset.update(status='reprovado', motivo_reprovacao=motivo, observacao_admin=obs, data_reprovacao=timezone.now())
+    update_com_contadores(queryset, status='reprovado', motivo_reprovacao=motivo, observacao_admin=obs, data_reprovacao=timezone.now())
+    invalidar_snapshot()
+    invalidar_buscas_salvas()
     messages.warning(request, "Lote de talentos atualizado para REPROVADO.")
 
 @admin.action(description='🗑️ Excluir Permanentemente')
 def excluir_modelos_massa(modeladmin, request, queryset):
+    # O delete do queryset envia post_delete por objeto: contadores/dashboard acompanham
     queryset.delete()
     messages.error(request, "Registros selecionados foram removidos definitivamente.")
 
@@ -558,6 +588,7 @@ class UserProfileAdmin(admin.ModelAdmin):
         'exibir_foto', 
         'nome_com_status', 
         'whatsapp_link', 
+        'reputacao',
         'acoes_rapidas'
     )
     
@@ -573,7 +604,13 @@ class UserProfileAdmin(admin.ModelAdmin):
         IdadeMinFilter, IdadeMaxFilter, 
         AlturaMinFilter, AlturaMaxFilter,
         PesoMinFilter, PesoMaxFilter,
-        SapatoMinFilter, SapatoMaxFilter
+        SapatoMinFilter, SapatoMaxFilter,
+        CalcadoFilter, ManequimFilter,
+        CidadeFilter, EstadoFilter, BairroFilter,
+        RaioJobFilter, RaioKmFilter,
+        AreasTextoFilter,
+        NotaMinFilter, JobsMinFilter, OrdemReputacaoFilter,
+        BuscaSalvaFilter,
     )
     
     search_fields = ('nome_completo', 'cpf', 'whatsapp')
@@ -589,6 +626,11 @@ class UserProfileAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         p = request.GET
 
+        # Busca salva (?busca=<id>): resultado materializado, pk__in com subconsulta
+        if p.get('busca'):
+            busca = BuscaSalva.objects.filter(pk=p.get('busca')).first() if p.get('busca').isdigit() else None
+            return qs.filter(pk__in=resultado_busca(busca)) if busca is not None else qs.none()
+
         # --- FILTROS ESPECIAIS (MODAL) ---
         if p.get('cidade'):
             qs = qs.filter(cidade__icontains=p.get('cidade'))
@@ -597,28 +639,29 @@ class UserProfileAdmin(admin.ModelAdmin):
         if p.get('bairro'):
             qs = qs.filter(bairro__icontains=p.get('bairro'))
         if p.get('areas_atuacao'):
-            qs = qs.filter(areas_atuacao__icontains=p.get('areas_atuacao'))
+            qs = qs.filter(filtro_areas_texto(p.get('areas_atuacao')))
         if p.get('manequim'):
-            qs = qs.filter(manequim__exact=p.get('manequim'))
+            # Numérico ("38" casa com "38/40"); letras (P, M...) comparam o texto
+            manequim = numero(p.get('manequim'), maximo=99)
+            if manequim is not None:
+                qs = qs.filter(manequim_num=int(manequim))
+            else:
+                qs = qs.filter(manequim__iexact=p.get('manequim').strip())
         if p.get('calcado'):  # Filtro direto do modal
-            qs = qs.filter(calcado__exact=p.get('calcado'))
+            calcado = numero(p.get('calcado'), maximo=99)
+            if calcado is not None:
+                qs = qs.filter(calcado_num=calcado)
+            else:
+                qs = qs.filter(calcado__iexact=p.get('calcado').strip())
             
-        # Filtro de Idade
-        if p.get('idade_min'): 
-            try:
-                idade_min = int(p.get('idade_min'))
-                data_limite = date.today().replace(year=date.today().year - idade_min)
-                qs = qs.filter(data_nascimento__lte=data_limite)
-            except (ValueError, TypeError):
-                pass
-        
-        if p.get('idade_max'): 
+        # Filtro de Idade: intervalo de data_nascimento (índice status+data_nascimento)
+        def idade_param(nome):
             try:
-                idade_max = int(p.get('idade_max'))
-                data_limite = date.today().replace(year=date.today().year - idade_max - 1)
-                qs = qs.filter(data_nascimento__gt=data_limite)
+                return int(p.get(nome))
             except (ValueError, TypeError):
-                pass
+                return None
+
+        qs = qs.filter(filtro_idade(idade_param('idade_min'), idade_param('idade_max')))
 
         # Função auxiliar para aplicar faixas numéricas
         def apply_range(queryset, p_min, p_max, db_field):
@@ -631,14 +674,25 @@ class UserProfileAdmin(admin.ModelAdmin):
             return queryset
 
         # Processamento das Faixas Solicitadas
+        # (status, campo) indexados; calçado usa a cópia numérica (texto compara "40" < "5")
         qs = apply_range(qs, 'altura_min', 'altura_max', 'altura')
-        # qs = apply_range(qs, 'peso_min', 'peso_max', 'peso') # Ajuste: peso pode vir so como peso_min do modal
-        if p.get('peso_min'):
-            qs = qs.filter(peso__gte=clean_number(p.get('peso_min')))
-        if p.get('peso_max'):
-             qs = qs.filter(peso__lte=clean_number(p.get('peso_max')))
-             
-        qs = apply_range(qs, 'sapato_min', 'sapato_max', 'calcado')
+        qs = apply_range(qs, 'peso_min', 'peso_max', 'peso')
+        qs = apply_range(qs, 'sapato_min', 'sapato_max', 'calcado_num')
+
+        # Raio a partir do local de um job (?job=<id>&raio_km=<km>), ordenado por distância
+        raio_km = clean_number(p.get('raio_km'))
+        if raio_km and raio_km > 0 and p.get('job'):
+            try:
+                job = Job.objects.only('latitude', 'longitude').get(pk=int(p.get('job')))
+            except (Job.DoesNotExist, ValueError, TypeError):
+                job = None
+            if job is not None and job.latitude is not None and job.longitude is not None:
+                qs = filtrar_por_raio(qs, job.latitude, job.longitude, raio_km)
+                # A ChangeList reordena o queryset: a distância entra por get_ordering
+                request.ordem_distancia = True
+
+        # Reputação mínima (colunas desnormalizadas, ver core.reputacao)
+        qs = filtrar_reputacao(qs, p)
 
         # ------------------------------------------------------------------
         # SUPORTE A MULTI-SELEÇÃO (via JS na sidebar)
@@ -688,6 +742,26 @@ class UserProfileAdmin(admin.ModelAdmin):
 
         return qs
 
+    def get_ordering(self, request):
+        # ?ordem=nota|jobs (modal): "melhor avaliados" / "mais trabalhos"
+        ordem = ORDENS_REPUTACAO.get(request.GET.get('ordem', ''))
+        if ordem:
+            return (*ordem, '-pk')
+        # Filtro de raio ativo (get_queryset anotou distancia_km2): mais perto primeiro
+        if getattr(request, 'ordem_distancia', False):
+            return ('distancia_km2', 'pk')
+        return super().get_ordering(request)
+
+    def get_changelist(self, request, **kwargs):
+        if getattr(request, 'sem_contagem', False):
+            return ChangeListSemContagem
+        return super().get_changelist(request, **kwargs)
+
+    def queryset_filtrado(self, request):
+        """Queryset da listagem para request.GET (filtros, busca e abas), sem paginar nem contar."""
+        request.sem_contagem = True
+        return self.get_changelist_instance(request).queryset
+
     # --- NAVEGAÇÃO: APROVADOS / PENDENTES ---
     def changelist_view(self, request, extra_context=None):
         """Por padrão, a Base de Promotores abre em APROVADOS.
@@ -712,8 +786,35 @@ class UserProfileAdmin(admin.ModelAdmin):
         except Exception:
             pass
 
+        extra_context = extra_context or {}
+        extra_context.setdefault(
+            'jobs_raio',
+            Job.objects.filter(status='aberto', latitude__isnull=False, longitude__isnull=False)
+            .only('id', 'titulo')
+            .order_by('titulo'),
+        )
+        extra_context.setdefault('buscas_salvas', [
+            (busca, querystring_abertura(busca))
+            for busca in BuscaSalva.objects.only('id', 'nome', 'querystring', 'total')
+        ])
+        extra_context.setdefault('busca_ativa', request.GET.get('busca', ''))
+        extra_context.setdefault('ordem_reputacao_choices', ORDEM_REPUTACAO_CHOICES)
         return super().changelist_view(request, extra_context=extra_context)
 
+    def salvar_busca_view(self, request):
+        """Salva a querystring atual da listagem como uma busca nomeada."""
+        if request.method != 'POST':
+            return redirect('admin:core_userprofile_changelist')
+        nome = (request.POST.get('nome') or '').strip()[:80]
+        querystring = limpar_querystring(request.POST.get('querystring', ''))
+        if not nome:
+            messages.error(request, "Informe um nome para a busca.")
+            return redirect(f"{reverse('admin:core_userprofile_changelist')}?{querystring}")
+        busca = BuscaSalva.objects.create(nome=nome, querystring=querystring, criado_por=request.user)
+        recalcular_busca(busca)
+        messages.success(request, f'Busca "{nome}" salva ({busca.total} promotores).')
+        return redirect(f"{reverse('admin:core_userprofile_changelist')}?{querystring_abertura(busca)}")
+
     def aprovados_view(self, request):
         return redirect('/admin/core/userprofile/?status__exact=aprovado')
 
@@ -734,7 +835,11 @@ class UserProfileAdmin(admin.ModelAdmin):
 
     def exibir_foto(self, obj):
         if obj.foto_rosto:
-            return format_html('<img src="{}" style="width:48px; height:48px; border-radius:50%; object-fit:cover; border:2px solid #eee;">', obj.foto_rosto.url)
+            return format_html(
+                '<img src="{}" srcset="{}" sizes="48px" loading="lazy" style="width:48px; height:48px; border-radius:50%; object-fit:cover; border:2px solid #eee;">',
+                url_miniatura(obj.miniaturas, 'foto_rosto', 'p', obj.foto_rosto),
+                srcset(obj.miniaturas, 'foto_rosto'),
+            )
         return format_html('<div style="width:48px; height:48px; border-radius:50%; background:#f5f5f5; display:flex; align-items:center; justify-content:center;"><i class="fas fa-user text-muted"></i></div>')
     exibir_foto.short_description = "Avatar"
 
@@ -751,6 +856,20 @@ class UserProfileAdmin(admin.ModelAdmin):
         return "---"
     whatsapp_link.short_description = "Contato"
 
+    def reputacao(self, obj):
+        if not obj.total_avaliacoes and not obj.total_jobs_aprovados:
+            return "---"
+        nota = f'{obj.nota_media:.1f}'.replace('.', ',')
+        return format_html(
+            '<span style="font-size:12px;"><i class="fas fa-star text-warning"></i> {} ({})'
+            ' &middot; {} job(s)</span>',
+            nota if obj.total_avaliacoes else '-',
+            obj.total_avaliacoes,
+            obj.total_jobs_aprovados,
+        )
+    reputacao.short_description = "Reputação"
+    reputacao.admin_order_field = 'nota_media'
+
     def acoes_rapidas(self, obj): 
         return format_html(f'<a href="/admin/core/userprofile/{obj.id}/change/" class="btn btn-sm btn-info" style="border-radius:20px; font-weight:bold; padding:3px 18px;"><i class="fas fa-search"></i> ABRIR</a>')
     acoes_rapidas.short_description = "Gestão"
@@ -764,6 +883,7 @@ class UserProfileAdmin(admin.ModelAdmin):
             path('aprovados/', self.admin_site.admin_view(self.aprovados_view), name='userprofile_aprovados'),
             path('pendentes/', self.admin_site.admin_view(self.pendentes_view), name='userprofile_pendentes'),
             path('aguardando-ajuste/', self.admin_site.admin_view(self.correcao_view), name='userprofile_correcao'),
+            path('buscas/salvar/', self.admin_site.admin_view(self.salvar_busca_view), name='userprofile_salvar_busca'),
 
             # Ações por objeto
             path('<int:object_id>/aprovar/', self.admin_site.admin_view(self.aprovar_view), name='userprofile_aprovar'),
@@ -888,7 +1008,7 @@ class UserProfileAdmin(admin.ModelAdmin):
 
         cfg = None
         try:
-            cfg = ConfiguracaoSite.load()
+            cfg = obter_site_config().config
         except Exception:
             cfg = None
 
@@ -1254,6 +1374,40 @@ class JobAdmin(admin.ModelAdmin):
         'criado_em',
     )
 
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path('<int:object_id>/candidatos/', self.admin_site.admin_view(self.candidatos_view), name='job_candidatos'),
+        ]
+        return custom_urls + urls
+
+    def candidatos_view(self, request, object_id):
+        """Ranking dos promotores aprovados para o job (requisitos + distância + nota + jobs)."""
+        job = get_object_or_404(Job, pk=object_id)
+        p = request.GET
+
+        try:
+            limite = min(max(int(p.get('limite') or 50), 1), 200)
+        except (TypeError, ValueError):
+            limite = 50
+        raio_km = clean_number(p.get('raio_km'))
+        so_compativeis = p.get('compativeis') == '1'
+
+        candidatos = ranquear_candidatos(job, limite=limite, raio_km=raio_km, so_compativeis=so_compativeis)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': f'Candidatos compatíveis: {job.titulo}',
+            'job': job,
+            'candidatos': candidatos,
+            'limite': limite,
+            'raio_km': raio_km,
+            'so_compativeis': so_compativeis,
+            'tem_local': job.latitude is not None and job.longitude is not None,
+        }
+        return TemplateResponse(request, 'admin/core/job/candidatos.html', context)
+
 admin.site.register(Candidatura)
 admin.site.register(Resposta)
 admin.site.register(Avaliacao)
@@ -1560,7 +1714,8 @@ class OrcamentoAdmin(admin.ModelAdmin):
         from django.utils import timezone
 
         orcamento = get_object_or_404(Orcamento.objects.prefetch_related('itens', 'cliente'), pk=orcamento_id)
-        config_site = ConfiguracaoSite.load()
+        site = obter_site_config()
+        config_site = site.config
 
         pdf_engine = (os.getenv('ORCAMENTO_PDF_ENGINE') or 'auto').strip().lower()
 
@@ -1578,52 +1733,15 @@ class OrcamentoAdmin(admin.ModelAdmin):
             except Exception:
                 return None
 
-        def _instagram_handle(url: str | None) -> str | None:
-            u = (url or '').strip()
-            if not u:
-                return None
-            u = u.replace('https://', '').replace('http://', '')
-            if 'instagram.com' in u:
-                parts = [p for p in u.split('/') if p]
-                if parts:
-                    last = parts[-1]
-                    if last.lower() in {'instagram.com', 'www.instagram.com'} and len(parts) >= 2:
-                        last = parts[-2]
-                    last = last.split('?')[0].strip('@')
-                    return f"@{last.upper()}" if last else None
-            # se já vier como @handle
-            if u.startswith('@'):
-                return u.upper()
-            return None
-
         meses = [
             'janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
             'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro',
         ]
 
-        contatos_qs = getattr(config_site, 'contatos', None)
-        contatos = list(contatos_qs.all()) if contatos_qs is not None else []
-        contatos_por_tipo = {
-            'email': [],
-            'telefone': [],
-            'instagram': [],
-            'facebook': [],
-        }
-        for c in contatos:
-            if c.tipo in contatos_por_tipo:
-                contatos_por_tipo[c.tipo].append(c)
-
-        contato_email_principal = contatos_por_tipo['email'][0] if contatos_por_tipo['email'] else None
-        contato_whatsapp_principal = None
-        for c in contatos_por_tipo['telefone']:
-            if (c.telefone_tipo or '').strip() in {'whatsapp', 'ambos'}:
-                contato_whatsapp_principal = c
-                break
-
         dt = timezone.localtime(orcamento.criado_em) if orcamento.criado_em else timezone.now()
         mes_ano = f"{meses[dt.month - 1].capitalize()}, {dt.year}"
         site_domain = request.get_host()
-        instagram_handle = _instagram_handle(getattr(config_site, 'instagram_link', None))
+        instagram_handle = site.contatos.instagram_handle
 
         data_evento_fmt = None
         if getattr(orcamento, 'data_evento', None):
@@ -1693,8 +1811,8 @@ class OrcamentoAdmin(admin.ModelAdmin):
                 'cliente_cnpj': (orcamento.cliente.cnpj_formatado if (orcamento.cliente_id and orcamento.cliente.cnpj) else None),
                 'data_evento': data_evento_fmt,
                 'frase_validade': frase_validade,
-                'contato_telefone': (getattr(contato_whatsapp_principal, 'valor', None) or None),
-                'contato_email': (getattr(contato_email_principal, 'valor', None) or None),
+                'contato_telefone': (getattr(site.contatos.whatsapp_principal, 'valor', None) or None),
+                'contato_email': (getattr(site.contatos.email_principal, 'valor', None) or None),
             },
             request=request,
         )
@@ -1787,8 +1905,8 @@ class OrcamentoAdmin(admin.ModelAdmin):
                 'cliente_cnpj': (orcamento.cliente.cnpj_formatado if (orcamento.cliente_id and orcamento.cliente.cnpj) else None),
                 'data_evento': data_evento_fmt,
                 'frase_validade': frase_validade,
-                'contato_telefone': (getattr(contato_whatsapp_principal, 'valor', None) or None),
-                'contato_email': (getattr(contato_email_principal, 'valor', None) or None),
+                'contato_telefone': (getattr(site.contatos.whatsapp_principal, 'valor', None) or None),
+                'contato_email': (getattr(site.contatos.email_principal, 'valor', None) or None),
             },
             request=request,
         )
@@ -1884,6 +2002,26 @@ class ConfiguracaoSiteAdmin(admin.ModelAdmin):
 
 admin.site.register(CpfBanido)
 
+
+@admin.register(BuscaSalva)
+class BuscaSalvaAdmin(admin.ModelAdmin):
+    list_display = ('nome', 'total', 'criado_por', 'calculado_em', 'abrir')
+    readonly_fields = ('criado_por', 'total', 'calculado_em')
+    fields = ('nome', 'querystring', 'criado_por', 'total', 'calculado_em')
+
+    def abrir(self, obj):
+        url = reverse('admin:core_userprofile_changelist')
+        return format_html('<a href="{}?{}" class="btn btn-sm btn-info">Abrir</a>', url, querystring_abertura(obj))
+    abrir.short_description = "Base"
+
+    def save_model(self, request, obj, form, change):
+        obj.querystring = limpar_querystring(obj.querystring)
+        if not change:
+            obj.criado_por = request.user
+        if 'querystring' in form.changed_data:
+            obj.calculado_em = None  # recalculada na próxima abertura
+        super().save_model(request, obj, form, change)
+
 # FIM DO ARQUIVO ADMIN.PY V6.0
 
 @admin.register(PromotorApresentacao)
@@ -1895,6 +2033,10 @@ class PromotorApresentacaoAdmin(admin.ModelAdmin):
 
     def foto_rosto_thumb(self, obj):
         if obj.foto_rosto:
-             return format_html('<img src="{}" width="40" height="40" style="border-radius:50%;" />', obj.foto_rosto.url)
+             return format_html(
+                 '<img src="{}" srcset="{}" sizes="40px" width="40" height="40" loading="lazy" style="border-radius:50%; object-fit:cover;" />',
+                 url_miniatura(obj.miniaturas, 'foto_rosto', 'p', obj.foto_rosto),
+                 srcset(obj.miniaturas, 'foto_rosto'),
+             )
         return "-"
     foto_rosto_thumb.short_description = "Foto"
@@ -7,4 +7,8 @@ class CoreConfig(AppConfig):
     
     # Essa linha é a MÁGICA que conserta o erro no PythonAnywhere
     # Ela diz: "O caminho real deste app é EXATAMENTE onde este arquivo está"
-    path = os.path.dirname(os.path.abspath(__file__))
\ No newline at end of file
+    path = os.path.dirname(os.path.abspath(__file__))
+
+    def ready(self):
+        # Registra os signals (índices/caches derivados)
+        from . import signals  # noqa: F401
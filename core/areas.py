@@ -0,0 +1,74 @@
+"""
+Áreas de atuação normalizadas (AreaAtuacao, UserProfile.areas).
+
+O cadastro continua gravando o texto UserProfile.areas_atuacao
+("recepcao, degustacao, outros, Outros: ..."); o post_save sincroniza a
+relação M2M a partir dele com a mesma regra do matching
+(core.matching.parse_areas). Os filtros do admin consultam a tabela de
+ligação (índice em (perfil, área)) em vez de LIKE sem âncora sobre o texto.
+"""
+
+import re
+
+from django.db.models import Exists, OuterRef, Q
+
+from .matching import parse_areas
+from .models import AreaAtuacao, UserProfile
+from .texto import normalizar
+
+
+def sincronizar_areas(perfil) -> None:
+    """Alinha perfil.areas ao texto areas_atuacao."""
+    slugs = parse_areas(perfil.areas_atuacao)
+    ids = list(AreaAtuacao.objects.filter(slug__in=slugs).values_list('pk', flat=True)) if slugs else []
+    perfil.areas.set(ids)
+
+
+def slugs_por_termo(termo: str) -> set[str]:
+    """Áreas cujo código ou alguma palavra do rótulo começa com ``termo``.
+
+    "garçom" -> garcom; "garconete" -> garcom; "recep" -> recepcao.
+    """
+    termo = normalizar(termo)
+    if not termo:
+        return set()
+    out = set()
+    for slug, rotulo in UserProfile.AREAS_ATUACAO_CHOICES:
+        palavras = normalizar(slug.replace('_', ' ')).split() + normalizar(rotulo).split()
+        if normalizar(slug).startswith(termo) or any(p.startswith(termo) for p in palavras):
+            out.add(slug)
+    return out
+
+
+def filtro_areas(slugs) -> Exists:
+    """Condição "tem alguma das áreas" (uma busca indexada na tabela M2M)."""
+    return Exists(
+        UserProfile.areas.through.objects.filter(
+            userprofile=OuterRef('pk'),
+            areaatuacao__slug__in=list(slugs),
+        )
+    )
+
+
+def filtro_areas_texto(texto: str | None) -> Q:
+    """Filtro do campo livre do modal ("garçom, modelo, recepcao").
+
+    Cada termo que corresponde a uma área vira busca na M2M; termos sem
+    área conhecida (ex.: algo descrito em "Outros: ...") caem no texto.
+    """
+    slugs = set()
+    livres = []
+    for termo in (t.strip() for t in re.split(r'[,;|]+', texto or '')):
+        if not termo:
+            continue
+        achados = slugs_por_termo(termo)
+        if achados:
+            slugs |= achados
+        else:
+            livres.append(termo)
+    condicao = Q()
+    if slugs:
+        condicao |= Q(filtro_areas(slugs))
+    for termo in livres:
+        condicao |= Q(areas_atuacao__icontains=termo)
+    return condicao
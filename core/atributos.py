@@ -0,0 +1,157 @@
+"""
+Atributos enumerados do promotor codificados em bits.
+
+Cada dimensão (gênero, etnia, olhos, tipo e comprimento de cabelo) ocupa
+uma faixa fixa de LARGURA bits; cada opção do choice é um bit dentro da
+faixa. O perfil guarda um único inteiro (UserProfile.atributos_bits) e o
+job guarda, por dimensão, a máscara dos valores aceitos (0 = sem exigência).
+"O perfil atende à dimensão" vira ``perfil & mascara != 0``:
+
+- perfis_compativeis(job): um SELECT com um AND bit a bit por dimensão;
+- jobs_compativeis(bits): laço de ANDs sobre as máscaras das vagas abertas,
+  guardadas em memória por processo e validadas a cada leitura contra
+  (total de jobs, maior Job.atualizado_em), uma consulta sobre índices:
+  qualquer save ou exclusão de job, em qualquer processo, troca a versão.
+
+Novas opções devem ser acrescentadas ao final do choice (a posição define
+o bit); depois de reordenar um choice, rode ``manage.py recalcular_atributos``.
+"""
+
+import threading
+
+from django.db.models import Count, F, Max
+from django.utils import timezone
+
+from .models import Job, UserProfile
+
+
+LARGURA = 12
+
+# (campo do perfil, campo de valores aceitos do job, campo de máscara do job, choices)
+DIMENSOES = (
+    ('genero', 'generos_aceitos', 'generos_bits', UserProfile.GENERO_CHOICES),
+    ('etnia', 'etnias_aceitas', 'etnias_bits', UserProfile.ETNIA_CHOICES),
+    ('olhos', 'olhos_aceitos', 'olhos_bits', UserProfile.OLHOS_CHOICES),
+    ('cabelo_tipo', 'cabelo_tipos_aceitos', 'cabelo_tipos_bits', UserProfile.CABELO_TIPO_CHOICES),
+    ('cabelo_comprimento', 'cabelo_comprimentos_aceitos', 'cabelo_comprimentos_bits', UserProfile.CABELO_TAM_CHOICES),
+)
+CAMPOS_MASCARA_JOB = tuple(campo_bits for _p, _j, campo_bits, _c in DIMENSOES)
+
+# campo do perfil -> {valor: bit}
+BITS = {}
+for _indice, (_campo, _aceitos, _bits, _choices) in enumerate(DIMENSOES):
+    assert len(_choices) <= LARGURA, f'{_campo}: mais opções que a faixa de {LARGURA} bits'
+    BITS[_campo] = {valor: 1 << (_indice * LARGURA + i) for i, (valor, _rotulo) in enumerate(_choices)}
+
+# Bit acima das faixas usadas: exigido, mas nenhum perfil o tem
+SEM_VALOR_VALIDO = 1 << (len(DIMENSOES) * LARGURA)
+
+_lock = threading.Lock()
+_mascaras: tuple | None = None   # (versão, máscaras)
+
+
+def _csv(raw: str | None) -> set[str]:
+    return {p.strip() for p in (raw or '').replace('\n', ',').split(',') if p and p.strip()}
+
+
+def mascara_perfil(perfil) -> int:
+    bits = 0
+    for campo, _aceitos, _campo_bits, _choices in DIMENSOES:
+        bits |= BITS[campo].get(getattr(perfil, campo, None) or '', 0)
+    return bits
+
+
+def mascara_aceitos(campo: str, valores) -> int:
+    """Máscara dos valores aceitos de uma dimensão; 0 quando não é exigida.
+
+    Um requisito só com valores fora dos choices (legado) continua exigido
+    e não casa com nenhum perfil (SEM_VALOR_VALIDO).
+    """
+    mascara = 0
+    for valor in valores:
+        mascara |= BITS[campo].get(valor, 0)
+    return mascara if (mascara or not valores) else SEM_VALOR_VALIDO
+
+
+def mascaras_job(job) -> dict[str, int]:
+    """{campo de máscara do job: máscara aceita} para as cinco dimensões."""
+    return {
+        campo_bits: mascara_aceitos(campo, _csv(getattr(job, aceitos, None)))
+        for campo, aceitos, campo_bits, _choices in DIMENSOES
+    }
+
+
+def perfis_compativeis(job, queryset=None):
+    """Perfis aprovados que atendem a todas as dimensões exigidas pelo job."""
+    qs = queryset if queryset is not None else UserProfile.objects.filter(status='aprovado')
+    for campo_bits in CAMPOS_MASCARA_JOB:
+        mascara = getattr(job, campo_bits, 0) or 0
+        if not mascara:
+            continue
+        anotacao = f'_{campo_bits}_ok'
+        qs = qs.alias(**{anotacao: F('atributos_bits').bitand(mascara)}).filter(**{f'{anotacao}__gt': 0})
+    return qs
+
+
+def _versao_jobs() -> tuple:
+    versao = Job.objects.aggregate(total=Count('id'), ultimo=Max('atualizado_em'))
+    return versao['total'], versao['ultimo']
+
+
+def mascaras_jobs_abertos() -> tuple:
+    """((job_id, (máscara por dimensão, ...)), ...) das vagas abertas (em memória)."""
+    global _mascaras
+    versao = _versao_jobs()
+    atual = _mascaras
+    if atual is not None and atual[0] == versao:
+        return atual[1]
+    with _lock:
+        if _mascaras is None or _mascaras[0] != versao:
+            mascaras = tuple(
+                (linha[0], tuple(linha[1:]))
+                for linha in Job.objects.filter(status='aberto').order_by('pk').values_list('pk', *CAMPOS_MASCARA_JOB)
+            )
+            _mascaras = (versao, mascaras)
+        return _mascaras[1]
+
+
+def invalidar_mascaras_jobs() -> None:
+    global _mascaras
+    _mascaras = None
+
+
+def jobs_compativeis(bits: int) -> list[int]:
+    """Ids das vagas abertas cujas exigências de atributos o perfil atende."""
+    return [
+        job_id
+        for job_id, mascaras in mascaras_jobs_abertos()
+        if all(bits & m for m in mascaras if m)
+    ]
+
+
+def recalcular(corrigir: bool = True, lote: int = 1000) -> tuple[int, int]:
+    """Recalcula as máscaras de perfis e jobs. Retorna (perfis, jobs) divergentes."""
+    campos_perfil = ['id', 'atributos_bits'] + [campo for campo, _a, _b, _c in DIMENSOES]
+    perfis = []
+    for perfil in UserProfile.objects.only(*campos_perfil).iterator(chunk_size=lote):
+        bits = mascara_perfil(perfil)
+        if bits != perfil.atributos_bits:
+            perfil.atributos_bits = bits
+            perfis.append(perfil)
+
+    campos_job = ['id', 'atualizado_em', *CAMPOS_MASCARA_JOB] + [aceitos for _p, aceitos, _b, _c in DIMENSOES]
+    jobs = []
+    for job in Job.objects.only(*campos_job).iterator(chunk_size=lote):
+        mascaras = mascaras_job(job)
+        if any(getattr(job, campo) != valor for campo, valor in mascaras.items()):
+            for campo, valor in mascaras.items():
+                setattr(job, campo, valor)
+            job.atualizado_em = timezone.now()
+            jobs.append(job)
+
+    if corrigir:
+        UserProfile.objects.bulk_update(perfis, ['atributos_bits'], batch_size=lote)
+        Job.objects.bulk_update(jobs, [*CAMPOS_MASCARA_JOB, 'atualizado_em'], batch_size=lote)
+        if jobs:
+            invalidar_mascaras_jobs()
+    return len(perfis), len(jobs)
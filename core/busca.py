@@ -0,0 +1,106 @@
+"""
+Busca textual de promotores (seletor do admin / api_search_promoters).
+
+Usa a coluna desnormalizada UserProfile.busca (nome sem acentos, em
+minúsculas) e a tabela PalavraBusca (uma linha por palavra dela): cada
+palavra digitada precisa ser prefixo de alguma palavra do nome ("juli sou"
+acha "Júlia de Souza"). Os dois são faixas (>= termo, < termo + '~') sobre
+índices b-tree, em qualquer banco; a coluna inteira só serve à relevância.
+
+A paginação é por chave (keyset): o cursor guarda os valores da ordenação
+da última linha entregue e a página seguinte filtra "depois dela", sem
+OFFSET. O cursor é opaco para o cliente e amarrado à ordenação em uso.
+"""
+
+import base64
+import binascii
+import json
+
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from .models import PalavraBusca
+from .texto import normalizar
+
+
+def _prefixo_q(campo: str, prefixo: str) -> Q:
+    # A coluna só tem [0-9a-z ]: '~' é maior que qualquer caractere possível
+    return Q(**{f'{campo}__gte': prefixo, f'{campo}__lt': prefixo + '~'})
+
+
+def sincronizar_palavras(perfil) -> None:
+    """Alinha PalavraBusca às palavras de perfil.busca."""
+    palavras = set(perfil.busca.split())
+    atuais = set(PalavraBusca.objects.filter(perfil=perfil).values_list('palavra', flat=True))
+    if atuais - palavras:
+        PalavraBusca.objects.filter(perfil=perfil, palavra__in=atuais - palavras).delete()
+    if palavras - atuais:
+        PalavraBusca.objects.bulk_create(
+            [PalavraBusca(perfil=perfil, palavra=p) for p in sorted(palavras - atuais)],
+            ignore_conflicts=True,
+        )
+
+
+def _palavra_q(prefixo: str) -> Q:
+    """Perfis com alguma palavra começando por ``prefixo`` (índice de PalavraBusca)."""
+    return Q(pk__in=PalavraBusca.objects.filter(_prefixo_q('palavra', prefixo)).values('perfil_id'))
+
+
+def filtrar_por_termo(queryset, termo: str | None):
+    """Filtra por nome (prefixo de palavras) ou CPF e anota ``relevancia``.
+
+    relevancia: 0 = nome começa com o termo, 1 = primeira palavra casa,
+    2 = demais. Ordenar por ('relevancia', 'nome_completo').
+    """
+    termo = (termo or '').strip()
+    if not termo:
+        return queryset.annotate(relevancia=Value(0, output_field=IntegerField()))
+
+    tokens = normalizar(termo).split()
+    condicao = Q()
+    for token in tokens:
+        condicao &= _palavra_q(token)
+    if not tokens:
+        condicao = Q(cpf__icontains=termo)
+    elif any(ch.isdigit() for ch in termo):
+        condicao |= Q(cpf__icontains=termo)
+
+    ranking = [When(_prefixo_q('busca', ' '.join(tokens)), then=Value(0))] if tokens else []
+    if len(tokens) > 1:
+        ranking.append(When(_prefixo_q('busca', tokens[0]), then=Value(1)))
+    return queryset.filter(condicao).annotate(
+        relevancia=Case(*ranking, default=Value(2), output_field=IntegerField())
+    )
+
+
+def codificar_cursor(ordem, valores) -> str:
+    bruto = json.dumps([list(ordem), list(valores)], separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor: str, ordem) -> list | None:
+    """Valores do cursor para ``ordem``; None se inválido ou de outra ordenação."""
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        campos, valores = json.loads(bruto)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+    if campos != list(ordem) or not isinstance(valores, list) or len(valores) != len(ordem):
+        return None
+    return valores
+
+
+def apos_cursor(queryset, ordem, valores):
+    """Linhas estritamente depois de ``valores`` na ordem ``ordem``.
+
+    (a, b, c) > (va, vb, vc) vira a > va OR (a = va AND b > vb) OR ...;
+    campos com "-" (decrescentes) usam < no lugar de >. A última coluna da
+    ordem deve ser única (id).
+    """
+    condicao = Q()
+    iguais = {}
+    for campo, valor in zip(ordem, valores):
+        nome = campo.lstrip('-')
+        operador = 'lt' if campo.startswith('-') else 'gt'
+        condicao |= Q(**iguais, **{f'{nome}__{operador}': valor})
+        iguais[nome] = valor
+    return queryset.filter(condicao)
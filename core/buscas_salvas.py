@@ -0,0 +1,224 @@
+"""
+Buscas salvas da Base de Promotores (BuscaSalva).
+
+A querystring do admin (modal, abas, busca) é avaliada pela mesma pilha de
+filtros da listagem (ChangeList do UserProfileAdmin) e o resultado fica
+materializado em ResultadoBuscaSalva. Abrir a busca (?busca=<id>) vira um
+``pk__in`` com subconsulta nessa tabela (sem um parâmetro SQL por id):
+
+- post_save de UserProfile -> atualizar_perfil: confere só aquele perfil
+  contra as buscas cujos parâmetros leem algum dos campos alterados
+  (filter(pk=...).exists()) e inclui/remove a linha;
+- post_delete de UserProfile -> as linhas saem em cascata e
+  recontar_totais acerta BuscaSalva.total;
+- coordenadas gravadas por UPDATE (fila de geocoding) -> atualizar_perfil
+  só com latitude/longitude; o backfill em lote e o centro de um job usam
+  invalidar_por_campos / invalidar_por_job;
+- ações em massa via queryset.update -> invalidar_todas (recalcula ao abrir).
+
+O resultado também é recalculado por inteiro quando foi calculado em outro
+dia, porque os filtros de idade mudam com a data.
+"""
+
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+
+from .models import BuscaSalva, ResultadoBuscaSalva, UserProfile
+
+
+# Paginação e a própria seleção de busca não fazem parte do filtro
+PARAMS_IGNORADOS = ('p', 'busca', '_changelist_filters')
+# Levados para a URL ao abrir a busca (aba e ordenação)
+PARAMS_ABERTURA = ('status__exact', 'o', 'ordem')
+
+# Campos do perfil lidos por cada parâmetro do modal/listagem. Os demais
+# parâmetros são lookups do admin (status__exact, genero__in...): vale o
+# campo antes do "__"; um parâmetro desconhecido conta como "lê tudo".
+CAMPOS_POR_PARAMETRO = {
+    'q': ('nome_completo', 'cpf', 'whatsapp'),
+    'cidade': ('cidade',),
+    'estado': ('estado',),
+    'bairro': ('bairro',),
+    'areas_atuacao': ('areas_atuacao',),
+    'area_atuacao': ('areas_atuacao',),
+    'manequim': ('manequim',),
+    'calcado': ('calcado',),
+    'sapato_min': ('calcado',),
+    'sapato_max': ('calcado',),
+    'altura_min': ('altura',),
+    'altura_max': ('altura',),
+    'peso_min': ('peso',),
+    'peso_max': ('peso',),
+    'idade_min': ('data_nascimento',),
+    'idade_max': ('data_nascimento',),
+    'job': ('latitude', 'longitude'),
+    'raio_km': ('latitude', 'longitude'),
+    'nota_min': ('nota_media',),
+    'jobs_min': ('total_jobs_aprovados',),
+    'o': (),
+    'ordem': (),
+}
+CAMPOS_COORDENADAS = frozenset({'latitude', 'longitude'})
+LOTE = 2000
+
+
+def limpar_querystring(querystring: str) -> str:
+    params = QueryDict((querystring or '').lstrip('?'), mutable=True)
+    for nome in PARAMS_IGNORADOS:
+        params.pop(nome, None)
+    params.setdefault('status__exact', 'aprovado')
+    return params.urlencode()
+
+
+def querystring_abertura(busca: BuscaSalva) -> str:
+    salvos = QueryDict(busca.querystring)
+    params = QueryDict(mutable=True)
+    params['busca'] = str(busca.pk)
+    for nome in PARAMS_ABERTURA:
+        if salvos.get(nome):
+            params[nome] = salvos[nome]
+    return params.urlencode()
+
+
+def campos_da_busca(querystring: str) -> set[str] | None:
+    """Campos do perfil que decidem se ele entra na busca (None = todos)."""
+    nomes = {campo.name for campo in UserProfile._meta.concrete_fields}
+    campos = set()
+    for parametro in QueryDict(querystring):
+        if parametro in CAMPOS_POR_PARAMETRO:
+            campos.update(CAMPOS_POR_PARAMETRO[parametro])
+            continue
+        campo = parametro.split('__', 1)[0]
+        if campo not in nomes:
+            return None
+        campos.add(campo)
+    return campos
+
+
+def _le_algum(busca: BuscaSalva, campos) -> bool:
+    lidos = campos_da_busca(busca.querystring)
+    return lidos is None or bool(lidos & set(campos))
+
+
+def queryset_listagem(params, usuario=None):
+    """Perfis da listagem do admin para ``params`` (querystring ou QueryDict).
+
+    Mesma pilha de filtros da Base de Promotores (ChangeList do
+    UserProfileAdmin): busca, abas, list_filter e os parâmetros do modal.
+    """
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = '/admin/core/userprofile/'
+    request.GET = QueryDict(params) if isinstance(params, str) else params
+    request.user = usuario or AnonymousUser()
+    model_admin = admin.site._registry[UserProfile]
+    try:
+        return model_admin.queryset_filtrado(request).order_by()
+    except IncorrectLookupParameters:
+        return UserProfile.objects.none()
+
+
+def _queryset(busca: BuscaSalva):
+    """Perfis que atendem à busca, pela mesma pilha de filtros da listagem."""
+    return queryset_listagem(busca.querystring, busca.criado_por)
+
+
+def recalcular(busca: BuscaSalva) -> None:
+    ids = sorted(_queryset(busca).values_list('pk', flat=True))
+    agora = timezone.now()
+    with transaction.atomic():
+        ResultadoBuscaSalva.objects.filter(busca_id=busca.pk).delete()
+        ResultadoBuscaSalva.objects.bulk_create(
+            [ResultadoBuscaSalva(busca_id=busca.pk, perfil_id=perfil_id) for perfil_id in ids],
+            batch_size=LOTE,
+        )
+        BuscaSalva.objects.filter(pk=busca.pk).update(total=len(ids), calculado_em=agora)
+    busca.total = len(ids)
+    busca.calculado_em = agora
+
+
+def _desatualizada(busca: BuscaSalva) -> bool:
+    return busca.calculado_em is None or timezone.localdate(busca.calculado_em) != timezone.localdate()
+
+
+def resultado(busca: BuscaSalva):
+    """Subconsulta com os ids da busca (recalcula se estiver desatualizada)."""
+    if _desatualizada(busca):
+        recalcular(busca)
+    return ResultadoBuscaSalva.objects.filter(busca_id=busca.pk).values('perfil_id')
+
+
+def _ajustar(busca_id: int, perfil_id: int, presente: bool) -> None:
+    with transaction.atomic():
+        busca = BuscaSalva.objects.select_for_update().filter(pk=busca_id, calculado_em__isnull=False).first()
+        if busca is None:
+            return
+        linha = ResultadoBuscaSalva.objects.filter(busca_id=busca_id, perfil_id=perfil_id)
+        if presente:
+            if linha.exists():
+                return
+            ResultadoBuscaSalva.objects.create(busca_id=busca_id, perfil_id=perfil_id)
+            delta = 1
+        else:
+            if not linha.delete()[0]:
+                return
+            delta = -1
+        BuscaSalva.objects.filter(pk=busca_id).update(total=F('total') + delta)
+
+
+def atualizar_perfil(perfil_id: int, campos=None) -> None:
+    """Inclui/remove o perfil das buscas materializadas conforme ele atende ou não.
+
+    ``campos``: campos do perfil que mudaram (None = qualquer um, ex.: perfil
+    novo); buscas que não leem nenhum deles ficam como estão.
+    """
+    for busca in BuscaSalva.objects.filter(calculado_em__isnull=False).select_related('criado_por'):
+        if _desatualizada(busca):
+            continue
+        if campos is not None and not _le_algum(busca, campos):
+            continue
+        presente = _queryset(busca).filter(pk=perfil_id).exists()
+        _ajustar(busca.pk, perfil_id, presente)
+
+
+def recontar_totais() -> None:
+    """BuscaSalva.total a partir das linhas (perfis excluídos saem em cascata)."""
+    contagem = (
+        ResultadoBuscaSalva.objects.filter(busca=OuterRef('pk'))
+        .order_by().values('busca').annotate(n=Count('pk')).values('n')
+    )
+    BuscaSalva.objects.filter(calculado_em__isnull=False).update(total=Coalesce(Subquery(contagem), 0))
+
+
+def invalidar_todas() -> None:
+    BuscaSalva.objects.update(calculado_em=None)
+
+
+def invalidar_por_campos(campos) -> None:
+    """Recalcula ao abrir as buscas que leem algum de ``campos`` (gravações em lote)."""
+    ids = [
+        busca.pk
+        for busca in BuscaSalva.objects.filter(calculado_em__isnull=False).only('id', 'querystring')
+        if _le_algum(busca, campos)
+    ]
+    if ids:
+        BuscaSalva.objects.filter(pk__in=ids).update(calculado_em=None)
+
+
+def invalidar_por_job(job_id: int) -> None:
+    """Recalcula ao abrir as buscas por raio centradas no job (coordenadas mudaram)."""
+    ids = [
+        busca.pk
+        for busca in BuscaSalva.objects.filter(
+            calculado_em__isnull=False, querystring__contains=f'job={job_id}'
+        ).only('id', 'querystring')
+        if QueryDict(busca.querystring).get('job') == str(job_id)
+    ]
+    if ids:
+        BuscaSalva.objects.filter(pk__in=ids).update(calculado_em=None)
@@ -0,0 +1,119 @@
+"""
+Candidatos compatíveis para um Job (matching reverso, usado no JobAdmin).
+
+Cada promotor aprovado recebe uma pontuação de 0 a 1 combinando:
+
+- requisitos do job atendidos (core.matching, mesma regra do mural);
+- distância até o local do job (quando os dois têm coordenadas);
+- nota média das avaliações;
+- quantidade de jobs aprovados.
+
+Nota e jobs vêm das colunas desnormalizadas do perfil (core.reputacao).
+
+Os N melhores saem de um heap de tamanho N (heapq.nlargest) enquanto a base
+é lida em streaming: só os N perfis do topo ficam em memória e nada é
+ordenado por inteiro.
+"""
+
+import heapq
+from dataclasses import dataclass
+
+from .atributos import perfis_compativeis
+from .compatibilidade import CAMPOS_PERFIL
+from .geo import filtrar_por_raio, haversine_km
+from .matching import compilar_job, compilar_perfil
+from .miniaturas import url_miniatura
+from .models import UserProfile
+
+
+PESOS = {
+    'requisitos': 0.5,
+    'distancia': 0.2,
+    'nota': 0.2,
+    'jobs': 0.1,
+}
+DISTANCIA_REFERENCIA_KM = 50.0  # a partir daqui a distância não soma pontos
+JOBS_REFERENCIA = 10            # a partir daqui a experiência não soma pontos
+LOTE = 2000
+
+
+@dataclass(frozen=True, slots=True)
+class Candidato:
+    perfil_id: int
+    nome: str
+    cidade: str
+    estado: str
+    foto: str
+    pontuacao: float
+    requisitos_atendidos: int
+    requisitos_total: int
+    distancia_km: float | None
+    nota_media: float
+    total_jobs: int
+
+
+def pontuar(passed, total, distancia_km, nota, jobs) -> float:
+    requisitos = passed / total if total else 1.0
+    distancia = 0.0
+    if distancia_km is not None:
+        distancia = 1.0 - min(distancia_km, DISTANCIA_REFERENCIA_KM) / DISTANCIA_REFERENCIA_KM
+    return (
+        PESOS['requisitos'] * requisitos
+        + PESOS['distancia'] * distancia
+        + PESOS['nota'] * (nota or 0) / 5
+        + PESOS['jobs'] * min(jobs or 0, JOBS_REFERENCIA) / JOBS_REFERENCIA
+    )
+
+
+def ranquear_candidatos(job, limite: int = 50, raio_km: float | None = None, so_compativeis: bool = False) -> list[Candidato]:
+    """Os ``limite`` promotores aprovados mais bem pontuados para o job.
+
+    raio_km: restringe ao raio do local do job (se o job tiver coordenadas).
+    so_compativeis: só quem atende às exigências de gênero/etnia/olhos/cabelo.
+    """
+    requisitos = compilar_job(job)
+    tem_local = job.latitude is not None and job.longitude is not None
+    job_lat = float(job.latitude) if tem_local else None
+    job_lon = float(job.longitude) if tem_local else None
+
+    qs = UserProfile.objects.filter(status='aprovado')
+    if so_compativeis:
+        qs = perfis_compativeis(job, qs)
+    if raio_km and tem_local:
+        qs = filtrar_por_raio(qs, job_lat, job_lon, raio_km)
+    campos = (
+        *CAMPOS_PERFIL, 'nome_completo', 'cidade', 'estado', 'foto_rosto', 'miniaturas', 'latitude', 'longitude',
+        'nota_media', 'total_jobs_aprovados',
+    )
+    perfis = qs.only(*campos).order_by().iterator(chunk_size=LOTE)
+
+    def avaliados():
+        for perfil in perfis:
+            passed, total = requisitos.avaliar(compilar_perfil(perfil))
+            distancia = None
+            if tem_local and perfil.latitude is not None and perfil.longitude is not None:
+                distancia = haversine_km(job_lat, job_lon, perfil.latitude, perfil.longitude)
+            nota = perfil.nota_media
+            n_jobs = perfil.total_jobs_aprovados
+            pontuacao = pontuar(passed, total, distancia, nota, n_jobs)
+            # Empate: mais requisitos atendidos, depois o id menor (estável)
+            yield (pontuacao, passed, -perfil.pk), (perfil, passed, total, distancia, nota, n_jobs)
+
+    melhores = heapq.nlargest(max(1, limite), avaliados(), key=lambda item: item[0])
+
+    return [
+        Candidato(
+            perfil_id=perfil.pk,
+            nome=perfil.nome_completo,
+            cidade=perfil.cidade or '',
+            estado=perfil.estado or '',
+            foto=url_miniatura(perfil.miniaturas, 'foto_rosto', 'p', perfil.foto_rosto) or '',
+            pontuacao=round(chave[0], 3),
+            requisitos_atendidos=passed,
+            requisitos_total=total,
+            distancia_km=round(distancia, 1) if distancia is not None else None,
+            nota_media=round(nota, 1),
+            total_jobs=n_jobs,
+        )
+        for chave, (perfil, passed, total, distancia, nota, n_jobs) in melhores
+    ]
@@ -0,0 +1,153 @@
+"""
+Índice persistido de compatibilidade Job x Promotor (CompatibilidadeJob).
+
+- reindexar_job: recalcula um job contra todos os promotores aprovados.
+- reindexar_perfil: recalcula um promotor contra todas as vagas abertas.
+- processar_pendentes: usado por ``manage.py compatibilidade_worker``; o
+  save() de Job/UserProfile só marca ``compatibilidade_pendente`` quando
+  muda um campo que o cálculo lê (CAMPOS_*_REINDEXACAO).
+- fits_para_perfil: leitura do mural (uma consulta) com preenchimento
+  das linhas que faltarem (ex.: aprovação em massa via queryset.update).
+  Job ou perfil ainda marcado é avaliado na hora, sem ler o índice.
+"""
+
+import logging
+from collections import Counter
+
+from .matching import compilar_job, compilar_perfil, fit_dict, fit_status, score_jobs
+from .models import CompatibilidadeJob, Job, UserProfile
+
+
+logger = logging.getLogger(__name__)
+
+# Campos realmente usados pelo cálculo (evita carregar o perfil/job inteiro)
+CAMPOS_PERFIL = (
+    'id', 'areas_atuacao', 'experiencia', 'genero', 'etnia', 'olhos',
+    'cabelo_tipo', 'cabelo_comprimento', 'nivel_ingles',
+)
+CAMPOS_JOB = (
+    'id', 'tipo_servico', 'requer_experiencia', 'generos_aceitos', 'etnias_aceitas',
+    'olhos_aceitos', 'cabelo_tipos_aceitos', 'cabelo_comprimentos_aceitos', 'nivel_ingles_min',
+)
+# Mudança em algum destes campos marca o objeto para reindexação
+CAMPOS_PERFIL_REINDEXACAO = (*CAMPOS_PERFIL[1:], 'status')
+CAMPOS_JOB_REINDEXACAO = (*CAMPOS_JOB[1:], 'status')
+
+BATCH_SIZE = 1000
+
+
+def _linha(job_id, perfil_id, requisitos, perfil_match) -> CompatibilidadeJob:
+    passed, total = requisitos.avaliar(perfil_match)
+    return CompatibilidadeJob(
+        job_id=job_id,
+        perfil_id=perfil_id,
+        requisitos_atendidos=passed,
+        requisitos_total=total,
+        status=fit_status(passed, total),
+    )
+
+
+def _gravar(linhas: list[CompatibilidadeJob]) -> None:
+    if not linhas:
+        return
+    CompatibilidadeJob.objects.bulk_create(
+        linhas,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['perfil', 'job'],
+        update_fields=['requisitos_atendidos', 'requisitos_total', 'status', 'atualizado_em'],
+    )
+
+
+def reindexar_job(job: Job) -> None:
+    if job.status != 'aberto':
+        CompatibilidadeJob.objects.filter(job_id=job.pk).delete()
+        return
+
+    requisitos = compilar_job(job)
+    perfis = UserProfile.objects.filter(status='aprovado').only(*CAMPOS_PERFIL).iterator(chunk_size=BATCH_SIZE)
+    linhas = []
+    for perfil in perfis:
+        linhas.append(_linha(job.pk, perfil.pk, requisitos, compilar_perfil(perfil)))
+        if len(linhas) >= BATCH_SIZE:
+            _gravar(linhas)
+            linhas = []
+    _gravar(linhas)
+
+
+def reindexar_perfil(perfil: UserProfile) -> None:
+    if perfil.status != 'aprovado':
+        CompatibilidadeJob.objects.filter(perfil_id=perfil.pk).delete()
+        return
+
+    perfil_match = compilar_perfil(perfil)
+    jobs = Job.objects.filter(status='aberto').only(*CAMPOS_JOB)
+    _gravar([_linha(job.pk, perfil.pk, compilar_job(job), perfil_match) for job in jobs])
+
+
+def processar_pendentes(limite: int | None = None) -> Counter:
+    """Reindexa os jobs e perfis marcados e tira a marca. Retorna a contagem."""
+    contagem = Counter()
+    for modelo, campos, reindexar in (
+        (Job, CAMPOS_JOB, reindexar_job),
+        (UserProfile, CAMPOS_PERFIL, reindexar_perfil),
+    ):
+        ids = modelo.objects.filter(compatibilidade_pendente=True).order_by('pk').values_list('pk', flat=True)
+        for pk in list(ids[:limite] if limite else ids):
+            # Desmarca antes de ler: um save concorrente volta a marcar
+            if not modelo.objects.filter(pk=pk, compatibilidade_pendente=True).update(compatibilidade_pendente=False):
+                continue
+            instancia = modelo.objects.filter(pk=pk).only(*campos, 'status').first()
+            if instancia is None:
+                continue
+            try:
+                reindexar(instancia)
+                contagem[modelo._meta.model_name] += 1
+            except Exception:
+                logger.exception('Falha ao reindexar compatibilidade de %s %s', modelo._meta.model_name, pk)
+                modelo.objects.filter(pk=pk).update(compatibilidade_pendente=True)
+                contagem['falhou'] += 1
+    return contagem
+
+
+def fits_para_perfil(perfil: UserProfile, jobs) -> dict[int, dict]:
+    """Mapa job_id -> fit (status/message/passed/total) para o mural."""
+    jobs_por_id = {job.pk: job for job in jobs}
+    if not jobs_por_id:
+        return {}
+
+    # Marcados ainda não foram reindexados: o índice pode estar velho
+    indexados = [] if perfil.compatibilidade_pendente else [
+        job_id for job_id, job in jobs_por_id.items() if not job.compatibilidade_pendente
+    ]
+    fits = {}
+    rows = CompatibilidadeJob.objects.filter(
+        perfil_id=perfil.pk, job_id__in=indexados
+    ).values_list('job_id', 'requisitos_atendidos', 'requisitos_total', 'status') if indexados else ()
+    for job_id, passed, total, status in rows:
+        fits[job_id] = fit_dict(passed, total, status)
+
+    faltantes = [job for job_id, job in jobs_por_id.items() if job_id not in fits]
+    novos = score_jobs(perfil, faltantes) if faltantes else {}
+    fits.update(novos)
+    # Grava só as faltantes de verdade (as marcadas ficam para o worker)
+    novos = {job_id: fit for job_id, fit in novos.items() if job_id in indexados}
+    if novos:
+        linhas = [
+            CompatibilidadeJob(
+                job_id=job_id,
+                perfil_id=perfil.pk,
+                requisitos_atendidos=fit['passed'],
+                requisitos_total=fit['total'],
+                status=fit['status'],
+            )
+            for job_id, fit in novos.items()
+        ]
+        try:
+            CompatibilidadeJob.objects.bulk_create(linhas, ignore_conflicts=True)
+        except Exception:
+            # O mural já tem os valores calculados; a falha fica no log e as
+            # linhas são recalculadas na próxima visita
+            logger.exception('Falha ao gravar compatibilidade do perfil %s', perfil.pk)
+
+    return fits
@@ -0,0 +1,127 @@
+"""
+Contadores demográficos incrementais (ContadorDemografico).
+
+Cada promotor contribui com +1 em uma linha por dimensão preenchida, na
+chave (dimensão, valor, status). As escritas acontecem na mesma transação
+da alteração do perfil:
+
+- UserProfile.save -> atualizar_contadores_perfil (antes x depois)
+- post_delete de UserProfile (inclui exclusões em massa e em cascata)
+- ações em massa que usam queryset.update -> update_com_contadores
+
+reconciliar() recalcula tudo a partir da base, informa a diferença e
+regrava a tabela.
+"""
+
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import ContadorDemografico, UserProfile
+
+
+# dimensão -> campo do UserProfile ('total' conta todo promotor)
+DIMENSOES = {
+    'genero': 'genero',
+    'etnia': 'etnia',
+    'camiseta': 'tamanho_camiseta',
+    'calcado': 'calcado',
+    'nascimento': 'data_nascimento',
+}
+CAMPOS = ('status',) + tuple(DIMENSOES.values())
+
+
+def _valor(valor) -> str:
+    if valor is None:
+        return ''
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    return str(valor).strip()[:50]
+
+
+def chaves(valores: dict) -> list[tuple[str, str, str]]:
+    """Chaves (dimensão, valor, status) de um perfil; ``valores`` tem CAMPOS."""
+    status = valores.get('status') or ''
+    out = [('total', '', status)]
+    for dimensao, campo in DIMENSOES.items():
+        valor = _valor(valores.get(campo))
+        if valor:
+            out.append((dimensao, valor, status))
+    return out
+
+
+def _valores(perfil) -> dict:
+    return {campo: getattr(perfil, campo) for campo in CAMPOS}
+
+
+def aplicar_deltas(deltas: Counter) -> None:
+    for (dimensao, valor, status), delta in deltas.items():
+        if not delta:
+            continue
+        filtro = {'dimensao': dimensao, 'valor': valor, 'status': status}
+        if ContadorDemografico.objects.filter(**filtro).update(total=F('total') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                ContadorDemografico.objects.create(total=delta, **filtro)
+        except IntegrityError:
+            # Criada em paralelo: aplica sobre a linha existente
+            ContadorDemografico.objects.filter(**filtro).update(total=F('total') + delta)
+
+
+def atualizar_contadores_perfil(antigo, novo) -> None:
+    deltas = Counter()
+    if antigo is not None:
+        deltas.subtract(chaves(_valores(antigo)))
+    if novo is not None:
+        deltas.update(chaves(_valores(novo)))
+    aplicar_deltas(deltas)
+
+
+def _contagem_agrupada(queryset) -> Counter:
+    """Soma das chaves de todos os perfis do queryset (uma consulta agrupada)."""
+    contagem = Counter()
+    for linha in queryset.values(*CAMPOS).annotate(n=Count('id')).order_by():
+        for chave in chaves(linha):
+            contagem[chave] += linha['n']
+    return contagem
+
+
+def update_com_contadores(queryset, **campos) -> int:
+    """queryset.update(**campos) mantendo os contadores (sem signals)."""
+    with transaction.atomic():
+        ids = list(queryset.values_list('pk', flat=True))
+        alvo = UserProfile.objects.filter(pk__in=ids)
+        antes = _contagem_agrupada(alvo)
+        atualizados = alvo.update(**campos)
+        depois = _contagem_agrupada(alvo)
+        deltas = Counter(depois)
+        deltas.subtract(antes)
+        aplicar_deltas(deltas)
+    return atualizados
+
+
+def reconciliar(corrigir: bool = True) -> dict:
+    """Recalcula os contadores. Retorna {chave: (armazenado, real)} das divergências."""
+    with transaction.atomic():
+        real = _contagem_agrupada(UserProfile.objects.all())
+        armazenado = {
+            (c.dimensao, c.valor, c.status): c.total
+            for c in ContadorDemografico.objects.all()
+        }
+        divergencias = {
+            chave: (armazenado.get(chave, 0), real.get(chave, 0))
+            for chave in set(real) | set(armazenado)
+            if armazenado.get(chave, 0) != real.get(chave, 0)
+        }
+        if corrigir and divergencias:
+            ContadorDemografico.objects.all().delete()
+            ContadorDemografico.objects.bulk_create(
+                [
+                    ContadorDemografico(dimensao=d, valor=v, status=s, total=n)
+                    for (d, v, s), n in real.items() if n
+                ],
+                batch_size=1000,
+            )
+    return divergencias
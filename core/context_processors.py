@@ -1,33 +1,23 @@
-from .models import ConfiguracaoSite
+from django.utils.functional import SimpleLazyObject
 
-def site_config(request):
-    # Disponibiliza a configuração do site para todos os templates (HTML)
-    config = ConfiguracaoSite.load()
-    contatos_qs = getattr(config, 'contatos', None)
-    contatos = list(contatos_qs.all()) if contatos_qs is not None else []
+from .site_config import obter_site_config
 
-    contatos_por_tipo = {
-        'email': [],
-        'telefone': [],
-        'instagram': [],
-        'facebook': [],
-    }
-    for c in contatos:
-        if c.tipo in contatos_por_tipo:
-            contatos_por_tipo[c.tipo].append(c)
 
-    # Atalhos comuns para hero/footer
-    email_principal = contatos_por_tipo['email'][0] if contatos_por_tipo['email'] else None
-    whatsapp_principal = None
-    for c in contatos_por_tipo['telefone']:
-        if (c.telefone_tipo or '').strip() in {'whatsapp', 'ambos'}:
-            whatsapp_principal = c
-            break
+def site_config(request):
+    # Disponibiliza a configuração do site para todos os templates (HTML).
+    # Tudo é preguiçoso: páginas que não usam config_site/contatos não consultam nada,
+    # e a leitura vem do cache em processo (core.site_config).
+    def site():
+        atual = getattr(request, '_site_config', None)
+        if atual is None:
+            atual = request._site_config = obter_site_config()
+        return atual
 
     return {
-        'config_site': config,
-        'contatos_site': contatos,
-        'contatos_por_tipo': contatos_por_tipo,
-        'contato_email_principal': email_principal,
-        'contato_whatsapp_principal': whatsapp_principal,
-    }
\ No newline at end of file
+        'config_site': SimpleLazyObject(lambda: site().config),
+        'contatos_site': SimpleLazyObject(lambda: site().contatos.todos),
+        'contatos_por_tipo': SimpleLazyObject(lambda: site().contatos.por_tipo),
+        # Atalhos comuns para hero/footer
+        'contato_email_principal': SimpleLazyObject(lambda: site().contatos.email_principal),
+        'contato_whatsapp_principal': SimpleLazyObject(lambda: site().contatos.whatsapp_principal),
+    }
@@ -0,0 +1,139 @@
+"""
+KPIs do dashboard do admin (templatetag get_kpis).
+
+calcular_snapshot lê os contadores incrementais (ContadorDemografico, ver
+core.contadores) em vez de agrupar a base de promotores: uma leitura das
+dimensões categóricas e uma soma por intervalo de datas de nascimento para
+as faixas etárias, mais duas contagens (vagas abertas e candidaturas do
+dia). O resultado fica no cache por DASHBOARD_CACHE_TTL segundos e é
+invalidado pelos signals de UserProfile/Job/Candidatura. O cache padrão é o
+de banco (settings.CACHES), compartilhado pelos processos: a invalidação
+feita pelo worker que salvou vale para todos.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from .idade import intervalo_nascimento
+from .models import Candidatura, ContadorDemografico, Job
+
+
+CACHE_KEY = 'core:dashboard_snapshot'
+CACHE_TTL = getattr(settings, 'DASHBOARD_CACHE_TTL', 60)
+
+# (rótulo, idade mínima, idade máxima inclusive | None)
+FAIXAS_IDADE = (
+    ('18-24', 18, 24),
+    ('25-34', 25, 34),
+    ('35-44', 35, 44),
+    ('45+', 45, None),
+)
+ORDEM_CAMISETA = {'PP': 0, 'P': 1, 'M': 2, 'G': 3, 'GG': 4, 'XG': 5}
+CORES_STATUS = (
+    ('APROVADO', '#2ecc71'),
+    ('PENDENTE', '#f1c40f'),
+    ('REPROVADO', '#e74c3c'),
+)
+
+
+def _somas_faixas_idade(hoje: date) -> dict:
+    """Sum condicional por faixa sobre os contadores de data de nascimento (ISO)."""
+    somas = {}
+    for rotulo, idade_min, idade_max in FAIXAS_IDADE:
+        depois_de, ate = intervalo_nascimento(idade_min, idade_max, hoje)
+        filtro = Q(valor__lte=ate.isoformat())
+        if depois_de is not None:
+            filtro &= Q(valor__gt=depois_de.isoformat())
+        somas[rotulo] = Sum('total', filter=filtro)
+    return somas
+
+
+def _chart(contagem: dict, chave=None) -> dict:
+    itens = sorted(contagem.items(), key=chave) if chave else list(contagem.items())
+    return {
+        'labels': [str(k) for k, _v in itens],
+        'data': [v for _k, v in itens],
+    }
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    kpi: dict
+    status: dict
+    demografia: dict
+    gerado_em: object = field(default=None, compare=False)
+
+    def as_dict(self) -> dict:
+        return {'kpi': self.kpi, 'status': self.status, 'demografia': self.demografia}
+
+
+def calcular_snapshot() -> DashboardSnapshot:
+    agora = timezone.now()
+    hoje = timezone.localdate(agora)
+
+    linhas = (
+        ContadorDemografico.objects
+        .exclude(dimensao='nascimento')
+        .filter(total__gt=0)
+        .values_list('dimensao', 'valor', 'status', 'total')
+    )
+
+    total = 0
+    status = {}
+    por_dimensao = {'genero': {}, 'etnia': {}, 'camiseta': {}, 'calcado': {}}
+    for dimensao, valor, status_perfil, n in linhas:
+        if dimensao == 'total':
+            total += n
+            rotulo_status = status_perfil.upper() if status_perfil else 'INDEFINIDO'
+            status[rotulo_status] = status.get(rotulo_status, 0) + n
+        elif dimensao in por_dimensao:
+            destino = por_dimensao[dimensao]
+            destino[valor] = destino.get(valor, 0) + n
+
+    somas_idade = ContadorDemografico.objects.filter(dimensao='nascimento').aggregate(**_somas_faixas_idade(hoje))
+    idade = {rotulo: somas_idade[rotulo] or 0 for rotulo, _min, _max in FAIXAS_IDADE}
+
+    labels_status = sorted(status)
+    colors_status = []
+    for label in labels_status:
+        cor = next((c for nome, c in CORES_STATUS if nome in label), '#95a5a6')
+        colors_status.append(cor)
+
+    return DashboardSnapshot(
+        kpi={
+            'total': total,
+            'pendentes': status.get('PENDENTE', 0),
+            'vagas': Job.objects.filter(status='aberto').count(),
+            'candidaturas': Candidatura.objects.filter(data_candidatura__date=hoje).count(),
+        },
+        status={
+            'labels': labels_status,
+            'data': [status[label] for label in labels_status],
+            'colors': colors_status,
+        },
+        demografia={
+            'genero': _chart(por_dimensao['genero']),
+            'camiseta': _chart(por_dimensao['camiseta'], chave=lambda kv: ORDEM_CAMISETA.get(kv[0], 99)),
+            'calcado': _chart(por_dimensao['calcado'], chave=lambda kv: kv[0]),
+            'etnia': _chart(por_dimensao['etnia']),
+            'idade': _chart(idade),
+        },
+        gerado_em=agora,
+    )
+
+
+def obter_snapshot() -> DashboardSnapshot:
+    snapshot = cache.get(CACHE_KEY)
+    if snapshot is None:
+        snapshot = calcular_snapshot()
+        cache.set(CACHE_KEY, snapshot, CACHE_TTL)
+    return snapshot
+
+
+def invalidar_snapshot() -> None:
+    cache.delete(CACHE_KEY)
@@ -0,0 +1,135 @@
+"""
+Facetas do filtro de promotores (modais do admin / api_facetas_promotores).
+
+Para o estado atual do filtro, conta quantos promotores ficariam em cada
+valor de cada faceta. A contagem de uma faceta ignora a seleção dela mesma
+(com "Feminino" marcado, as demais opções de gênero continuam mostrando
+quantos existem), mas respeita as outras.
+
+As facetas de valores fechados (choices e UF) saem de uma consulta agrupada
+por essas colunas sobre a base sem os filtros delas (a cidade escolhida
+entra direto no SQL); o cruzamento é feito em Python sobre as combinações
+retornadas, cujo número é limitado pela cardinalidade dessas facetas. A
+cidade é texto livre: tem uma consulta própria, com os demais filtros no
+SQL e LIMIT nas grafias mais comuns.
+"""
+
+from django.db.models import Count, Q
+
+from .models import UserProfile
+from .texto import normalizar
+
+
+# campo -> choices (None = texto livre)
+FACETAS = {
+    'genero': UserProfile.GENERO_CHOICES,
+    'etnia': UserProfile.ETNIA_CHOICES,
+    'olhos': UserProfile.OLHOS_CHOICES,
+    'cabelo_tipo': UserProfile.CABELO_TIPO_CHOICES,
+    'cabelo_comprimento': UserProfile.CABELO_TAM_CHOICES,
+    'estado': None,
+    'cidade': None,
+}
+MAX_VALORES_TEXTO = 30
+# Grafias de cidade lidas do banco antes de juntar as equivalentes
+MAX_GRAFIAS_CIDADE = MAX_VALORES_TEXTO * 4
+
+
+def selecionados(params) -> dict:
+    """{campo: valor} das facetas presentes em ``params`` (request.GET)."""
+    out = {}
+    for campo in FACETAS:
+        valor = (params.get(campo) or '').strip()
+        if valor:
+            out[campo] = valor
+    return out
+
+
+def filtro_faceta(campo: str, valor: str) -> Q:
+    if campo == 'cidade':
+        return Q(cidade__icontains=valor)
+    if campo == 'estado':
+        return Q(estado__iexact=valor)
+    return Q(**{campo: valor})
+
+
+def filtrar_facetas(queryset, selecao: dict):
+    for campo, valor in selecao.items():
+        queryset = queryset.filter(filtro_faceta(campo, valor))
+    return queryset
+
+
+def _casa(campo: str, valor_linha, selecionado: str) -> bool:
+    """Espelho em Python de filtro_faceta, aplicado às linhas agrupadas."""
+    if valor_linha is None:
+        return False
+    if campo == 'cidade':
+        return selecionado.casefold() in valor_linha.casefold()
+    if campo == 'estado':
+        return valor_linha.casefold() == selecionado.casefold()
+    return valor_linha == selecionado
+
+
+def _chave_texto(campo: str, valor: str) -> str:
+    return valor.strip().upper() if campo == 'estado' else normalizar(valor)
+
+
+def contar_facetas(queryset, selecao: dict) -> dict:
+    """{campo: [{'valor', 'rotulo', 'total'}]} para a base ``queryset``.
+
+    ``queryset`` deve trazer os demais filtros (status, termo, raio...) mas
+    não os de faceta. Facetas com choices listam todas as opções, inclusive
+    as zeradas; as de texto livre trazem as MAX_VALORES_TEXTO mais comuns.
+    """
+    agrupadas = [campo for campo in FACETAS if campo != 'cidade']
+    base = queryset.order_by()
+    linhas = list(
+        filtrar_facetas(base, {c: v for c, v in selecao.items() if c == 'cidade'})
+        .values(*agrupadas).annotate(n=Count('id'))
+    )
+    cidades = list(
+        filtrar_facetas(base, {c: v for c, v in selecao.items() if c != 'cidade'})
+        .filter(cidade__gt='')
+        .values('cidade').annotate(n=Count('id')).order_by('-n', 'cidade')[:MAX_GRAFIAS_CIDADE]
+    )
+
+    resultado = {}
+    for campo, choices in FACETAS.items():
+        # A seleção de cidade já está no SQL de ``linhas``; ``cidades`` já vem
+        # com as demais seleções aplicadas
+        if campo == 'cidade':
+            fonte, outras = cidades, {}
+        else:
+            fonte = linhas
+            outras = {c: v for c, v in selecao.items() if c not in (campo, 'cidade')}
+        contagem = {}
+        rotulos = {}
+        for linha in fonte:
+            valor = linha[campo]
+            if not valor or not all(_casa(c, linha[c], v) for c, v in outras.items()):
+                continue
+            if choices is None:
+                chave = _chave_texto(campo, valor)
+                if not chave:
+                    continue
+                grafias = rotulos.setdefault(chave, {})
+                grafia = chave if campo == 'estado' else valor.strip()
+                grafias[grafia] = grafias.get(grafia, 0) + linha['n']
+            else:
+                chave = valor
+            contagem[chave] = contagem.get(chave, 0) + linha['n']
+
+        if choices is not None:
+            resultado[campo] = [
+                {'valor': valor, 'rotulo': rotulo, 'total': contagem.get(valor, 0)}
+                for valor, rotulo in choices
+            ]
+        else:
+            mais_comuns = sorted(contagem.items(), key=lambda kv: (-kv[1], kv[0]))[:MAX_VALORES_TEXTO]
+            resultado[campo] = []
+            for chave, total in mais_comuns:
+                # Grafia mais usada; no empate, a que tem maiúsculas ("São Paulo")
+                grafias = rotulos[chave]
+                rotulo = max(grafias, key=lambda g: (grafias[g], g != g.lower(), g))
+                resultado[campo].append({'valor': rotulo, 'rotulo': rotulo, 'total': total})
+    return resultado
@@ -0,0 +1,188 @@
+"""
+Distâncias (great-circle / haversine) entre promotores e trabalhos.
+
+distancias_km calcula todas as distâncias de uma origem para uma lista de
+coordenadas de uma vez só: usa NumPy quando estiver instalado e cai para
+Python puro caso contrário. bounding_box devolve o retângulo lat/lon que
+contém o raio pedido, para pré-filtrar no banco antes de carregar as linhas.
+"""
+
+import math
+
+from django.db.models import FloatField, Q, Value
+from django.db.models.functions import Cast
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional
+    np = None
+
+
+RAIO_TERRA_KM = 6371.0
+KM_POR_GRAU_LAT = 111.32
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> float:
+    p1 = math.radians(float(lat1))
+    p2 = math.radians(float(lat2))
+    dp = math.radians(float(lat2) - float(lat1))
+    dl = math.radians(float(lon2) - float(lon1))
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return RAIO_TERRA_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def bounding_box(lat, lon, raio_km) -> tuple[float, float, float, float]:
+    """(lat_min, lat_max, lon_min, lon_max) que contém o círculo de raio_km."""
+    lat = float(lat)
+    lon = float(lon)
+    raio_km = max(0.0, float(raio_km))
+    dlat = raio_km / KM_POR_GRAU_LAT
+    cos_lat = math.cos(math.radians(lat))
+    if cos_lat < 1e-6 or lat + dlat >= 90 or lat - dlat <= -90:
+        dlon = 180.0
+    else:
+        dlon = min(180.0, raio_km / (KM_POR_GRAU_LAT * cos_lat))
+    return (lat - dlat, lat + dlat, lon - dlon, lon + dlon)
+
+
+def filtro_bounding_box(lat, lon, raio_km, campo_lat='latitude', campo_lon='longitude') -> dict:
+    """kwargs de filtro do ORM para o bounding box."""
+    lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, raio_km)
+    return {
+        f'{campo_lat}__gte': lat_min,
+        f'{campo_lat}__lte': lat_max,
+        f'{campo_lon}__gte': lon_min,
+        f'{campo_lon}__lte': lon_max,
+    }
+
+
+def distancias_km(lat, lon, coords) -> list[float | None]:
+    """Distância de (lat, lon) para cada (lat, lon) de coords.
+
+    Itens sem coordenada (None em qualquer posição) retornam None.
+    """
+    coords = list(coords)
+    if lat is None or lon is None:
+        return [None] * len(coords)
+
+    validos = [i for i, c in enumerate(coords) if c is not None and c[0] is not None and c[1] is not None]
+    out: list[float | None] = [None] * len(coords)
+    if not validos:
+        return out
+
+    lat0 = math.radians(float(lat))
+    lon0 = math.radians(float(lon))
+
+    if np is not None:
+        arr = np.radians(np.array([(float(coords[i][0]), float(coords[i][1])) for i in validos], dtype=float))
+        dp = arr[:, 0] - lat0
+        dl = arr[:, 1] - lon0
+        a = np.sin(dp / 2) ** 2 + math.cos(lat0) * np.cos(arr[:, 0]) * np.sin(dl / 2) ** 2
+        dist = RAIO_TERRA_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        for i, d in zip(validos, dist.tolist()):
+            out[i] = d
+        return out
+
+    cos_lat0 = math.cos(lat0)
+    for i in validos:
+        p2 = math.radians(float(coords[i][0]))
+        dp = p2 - lat0
+        dl = math.radians(float(coords[i][1])) - lon0
+        a = math.sin(dp / 2) ** 2 + cos_lat0 * math.cos(p2) * math.sin(dl / 2) ** 2
+        out[i] = RAIO_TERRA_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return out
+
+
+# ------------------------------------------------------------------------------
+# GEOHASH (índice espacial em coluna texto comum)
+# ------------------------------------------------------------------------------
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISAO = 9          # ~5 m, precisão gravada no perfil
+GEOHASH_MAX_CELULAS = 16      # limite de faixas (OR) por busca
+
+
+def geohash_encode(lat, lon, precisao: int = GEOHASH_PRECISAO) -> str:
+    lat = float(lat)
+    lon = float(lon)
+    lat_int = [-90.0, 90.0]
+    lon_int = [-180.0, 180.0]
+    out = []
+    bits = 0
+    bit = 0
+    par = True
+    while len(out) < precisao:
+        intervalo, valor = (lon_int, lon) if par else (lat_int, lat)
+        meio = (intervalo[0] + intervalo[1]) / 2
+        if valor >= meio:
+            bits = (bits << 1) | 1
+            intervalo[0] = meio
+        else:
+            bits = bits << 1
+            intervalo[1] = meio
+        par = not par
+        bit += 1
+        if bit == 5:
+            out.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit = 0
+    return ''.join(out)
+
+
+def _geohash_celula_graus(precisao: int) -> tuple[float, float]:
+    """(altura em graus de latitude, largura em graus de longitude) da célula."""
+    total_bits = 5 * precisao
+    bits_lon = (total_bits + 1) // 2
+    bits_lat = total_bits // 2
+    return 180.0 / (2 ** bits_lat), 360.0 / (2 ** bits_lon)
+
+
+def geohash_cobertura(lat, lon, raio_km) -> list[str]:
+    """Prefixos geohash cujas células cobrem o círculo (via bounding box).
+
+    Escolhe a maior precisão que cubra o raio com até GEOHASH_MAX_CELULAS
+    células, para que a busca vire poucas faixas de índice.
+    """
+    lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, raio_km)
+    lat_min, lat_max = max(lat_min, -90.0), min(lat_max, 90.0)
+    lon_min, lon_max = max(lon_min, -180.0), min(lon_max, 180.0)
+
+    for precisao in range(GEOHASH_PRECISAO, 0, -1):
+        alt, larg = _geohash_celula_graus(precisao)
+        n_lat = int((lat_max - lat_min) / alt) + 2
+        n_lon = int((lon_max - lon_min) / larg) + 2
+        if n_lat * n_lon > GEOHASH_MAX_CELULAS and precisao > 1:
+            continue
+        lats = [min(lat_min + i * alt, lat_max) for i in range(n_lat)]
+        lons = [min(lon_min + j * larg, lon_max) for j in range(n_lon)]
+        return sorted({geohash_encode(la, lo, precisao) for la in lats for lo in lons})
+    return []
+
+
+def filtrar_por_raio(queryset, lat, lon, raio_km, campo_lat='latitude', campo_lon='longitude', campo_geohash='geohash'):
+    """Restringe o queryset ao raio e anota/ordena por distância.
+
+    1) faixas de geohash (índice) -> 2) bounding box -> 3) distância
+    equiretangular ao quadrado calculada no banco (``distancia_km2``),
+    suficiente para corte e ordenação em raios de cidade/estado.
+    """
+    lat0 = float(lat)
+    lon0 = float(lon)
+    raio_km = float(raio_km)
+
+    faixas = Q()
+    for prefixo in geohash_cobertura(lat0, lon0, raio_km):
+        faixas |= Q(**{f'{campo_geohash}__gte': prefixo, f'{campo_geohash}__lt': prefixo + '~'})
+
+    ky = KM_POR_GRAU_LAT
+    kx = KM_POR_GRAU_LAT * math.cos(math.radians(lat0))
+    dy = (Cast(campo_lat, FloatField()) - Value(lat0)) * Value(ky)
+    dx = (Cast(campo_lon, FloatField()) - Value(lon0)) * Value(kx)
+
+    return (
+        queryset
+        .filter(faixas)
+        .filter(**filtro_bounding_box(lat0, lon0, raio_km, campo_lat, campo_lon))
+        .annotate(distancia_km2=dy * dy + dx * dx)
+        .filter(distancia_km2__lte=raio_km * raio_km)
+        .order_by('distancia_km2')
+    )
@@ -0,0 +1,381 @@
+"""
+Fila de geocoding (GeocodificacaoPendente) e o worker que a drena.
+
+- enfileirar: chamado no post_save de UserProfile/Job; agenda o objeto
+  quando há endereço e faltam coordenadas. Endereço inalterado não volta
+  para a fila (evita reconsultar a cada save um endereço que já falhou).
+- processar_pendentes: usado por ``manage.py geocode_worker``; consulta o
+  geocodificador respeitando 1 req/s e grava coordenadas, "sem resultado"
+  ou o erro com backoff exponencial.
+- geocodificar: toda consulta passa antes pelo GeocodeCache (endereço
+  normalizado e, como fallback, centroide do CEP); só vai ao serviço
+  externo em caso de miss ou entrada expirada.
+
+O geocodificador é qualquer callable ``endereco -> (lat, lon) | None`` que
+levanta exceção em falhas transitórias. GeocodificadorStub permite rodar
+tudo offline (settings.GEOCODIFICADOR = 'stub' ou --geocoder=stub).
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .buscas_salvas import CAMPOS_COORDENADAS, atualizar_perfil as atualizar_buscas_salvas, invalidar_por_job
+from .geo import geohash_encode
+from .models import GeocodeCache, GeocodificacaoPendente, Job, UserProfile
+from .texto import normalizar
+
+
+logger = logging.getLogger(__name__)
+
+INTERVALO_MINIMO_S = 1.0          # política de uso do Nominatim: 1 requisição/s
+MAX_TENTATIVAS = 8
+BACKOFF_BASE_S = 60
+BACKOFF_MAX_S = 24 * 3600
+CACHE_TTL_DIAS = getattr(settings, 'GEOCODE_CACHE_TTL_DIAS', 180)
+CACHE_TTL_NEGATIVO_DIAS = getattr(settings, 'GEOCODE_CACHE_TTL_NEGATIVO_DIAS', 30)
+
+MODELOS = {
+    'userprofile': UserProfile,
+    'job': Job,
+}
+
+
+class GeocodificadorNominatim:
+    externo = True
+
+    def __init__(self, user_agent='casting-certo', timeout=5):
+        from geopy.geocoders import Nominatim
+
+        self._geolocator = Nominatim(user_agent=user_agent)
+        self.timeout = timeout
+
+    def __call__(self, endereco):
+        location = self._geolocator.geocode(endereco, timeout=self.timeout)
+        if not location:
+            return None
+        return round(float(location.latitude), 6), round(float(location.longitude), 6)
+
+
+class GeocodificadorStub:
+    """Geocodificador offline para testes/desenvolvimento.
+
+    ``resultados`` mapeia endereço -> (lat, lon), None ou uma exceção a ser
+    levantada. Endereços fora do mapa recebem coordenadas falsas, mas
+    determinísticas (derivadas do texto, dentro do Brasil), para que rodar
+    a fila com --geocoder=stub não marque tudo como "sem resultado".
+    """
+
+    externo = False
+
+    def __init__(self, resultados=None):
+        self.resultados = dict(resultados or {})
+        self.consultas = []
+
+    @staticmethod
+    def coordenadas_falsas(endereco: str) -> tuple[float, float]:
+        resumo = hashlib.sha1(endereco.encode('utf-8')).digest()
+        fracao_lat = int.from_bytes(resumo[:4], 'big') / 0xFFFFFFFF
+        fracao_lon = int.from_bytes(resumo[4:8], 'big') / 0xFFFFFFFF
+        return round(-30.0 + 27.0 * fracao_lat, 6), round(-60.0 + 25.0 * fracao_lon, 6)
+
+    def __call__(self, endereco):
+        self.consultas.append(endereco)
+        if endereco not in self.resultados:
+            return self.coordenadas_falsas(endereco)
+        resultado = self.resultados[endereco]
+        if isinstance(resultado, Exception):
+            raise resultado
+        return resultado
+
+
+GEOCODIFICADORES = {
+    'nominatim': GeocodificadorNominatim,
+    'stub': GeocodificadorStub,
+}
+
+
+def obter_geocodificador(nome: str | None = None):
+    nome = nome or getattr(settings, 'GEOCODIFICADOR', 'nominatim')
+    try:
+        return GEOCODIFICADORES[nome]()
+    except KeyError:
+        raise ValueError(f"Geocodificador desconhecido: {nome}") from None
+
+
+def limitador_para(geocodificador, intervalo: float) -> 'LimitadorTaxa':
+    """Limitador com ``intervalo``, nunca abaixo do mínimo contra um serviço externo."""
+    # Política do Nominatim: no máximo 1 requisição por segundo
+    minimo = INTERVALO_MINIMO_S if getattr(geocodificador, 'externo', True) else 0.0
+    return LimitadorTaxa(max(intervalo, minimo))
+
+
+class LimitadorTaxa:
+    """Intervalo mínimo entre chamadas, compartilhável entre threads."""
+
+    def __init__(self, intervalo: float = INTERVALO_MINIMO_S):
+        self.intervalo = intervalo
+        self._lock = threading.Lock()
+        self._proxima = 0.0
+
+    def aguardar(self) -> None:
+        # Reserva o próximo horário livre sob o lock e dorme fora dele
+        with self._lock:
+            slot = max(time.monotonic(), self._proxima)
+            self._proxima = slot + self.intervalo
+        espera = slot - time.monotonic()
+        if espera > 0:
+            time.sleep(espera)
+
+
+# ------------------------------------------------------------------------------
+# CACHE (GeocodeCache)
+# ------------------------------------------------------------------------------
+def normalizar_endereco(texto: str | None) -> str:
+    return normalizar(texto)
+
+
+def normalizar_cep(cep: str | None) -> str:
+    digitos = re.sub(r'\D+', '', cep or '')
+    return digitos if len(digitos) == 8 else ''
+
+
+def _chave_endereco(normalizado: str) -> str:
+    return 'end:' + hashlib.sha1(normalizado.encode('utf-8')).hexdigest()
+
+
+def _chave_cep(cep: str) -> str:
+    return 'cep:' + cep
+
+
+def _ler_cache(chave: str) -> tuple[bool, tuple[float, float] | None]:
+    """(achou, coords). Entradas negativas retornam (True, None)."""
+    agora = timezone.now()
+    entrada = (
+        GeocodeCache.objects
+        .filter(chave=chave, expira_em__gt=agora)
+        .values_list('latitude', 'longitude')
+        .first()
+    )
+    if entrada is None:
+        return False, None
+    GeocodeCache.objects.filter(chave=chave).update(acertos=F('acertos') + 1, ultimo_acerto_em=agora)
+    lat, lon = entrada
+    if lat is None or lon is None:
+        return True, None
+    return True, (float(lat), float(lon))
+
+
+def _gravar_cache(chave: str, tipo: str, descricao: str, coords, amostras: int = 1, externa: bool = True) -> None:
+    agora = timezone.now()
+    ttl = CACHE_TTL_DIAS if coords is not None else CACHE_TTL_NEGATIVO_DIAS
+    campos = {
+        'tipo': tipo,
+        'descricao': descricao[:500],
+        'latitude': Decimal(str(round(coords[0], 6))) if coords is not None else None,
+        'longitude': Decimal(str(round(coords[1], 6))) if coords is not None else None,
+        'amostras': amostras,
+        'consultado_em': agora,
+        'expira_em': agora + timedelta(days=ttl),
+    }
+    extra = {'consultas': F('consultas') + 1} if externa else {}
+    if GeocodeCache.objects.filter(chave=chave).update(**campos, **extra):
+        return
+    try:
+        with transaction.atomic():
+            GeocodeCache.objects.create(chave=chave, consultas=int(externa), **campos)
+    except IntegrityError:
+        # Outra thread/processo criou a mesma chave: mantém a dela
+        pass
+
+
+def _somar_ao_centroide(cep: str, coords: tuple[float, float]) -> None:
+    """Inclui um ponto geocodificado na média de coordenadas do CEP."""
+    entrada = GeocodeCache.objects.filter(chave=_chave_cep(cep)).only('latitude', 'longitude', 'amostras').first()
+    if entrada is None or entrada.latitude is None or entrada.longitude is None:
+        _gravar_cache(_chave_cep(cep), 'cep', cep, coords, externa=False)
+        return
+    n = entrada.amostras or 1
+    media = (
+        (float(entrada.latitude) * n + coords[0]) / (n + 1),
+        (float(entrada.longitude) * n + coords[1]) / (n + 1),
+    )
+    _gravar_cache(_chave_cep(cep), 'cep', cep, media, amostras=n + 1, externa=False)
+
+
+def geocodificar(endereco: str, cep: str | None = None, geocodificador=None, limitador: LimitadorTaxa | None = None):
+    """Coordenadas (lat, lon) do endereço, passando pelo cache.
+
+    Ordem: cache do endereço -> consulta externa do endereço -> cache do
+    CEP -> consulta externa do CEP. Sem ``geocodificador`` consulta apenas
+    o cache. Exceções do geocodificador sobem (a fila aplica o backoff).
+    """
+    normalizado = normalizar_endereco(endereco)
+    cep = normalizar_cep(cep)
+
+    def externo(consulta):
+        if limitador is not None:
+            limitador.aguardar()
+        return geocodificador(consulta)
+
+    if normalizado:
+        achou, coords = _ler_cache(_chave_endereco(normalizado))
+        if not achou and geocodificador is not None:
+            coords = externo(endereco)
+            _gravar_cache(_chave_endereco(normalizado), 'endereco', normalizado, coords)
+            if coords is not None and cep:
+                _somar_ao_centroide(cep, coords)
+        if coords is not None:
+            return coords
+
+    if cep:
+        achou, coords = _ler_cache(_chave_cep(cep))
+        if not achou and geocodificador is not None:
+            coords = externo(f"{cep[:5]}-{cep[5:]}, Brasil")
+            _gravar_cache(_chave_cep(cep), 'cep', cep, coords)
+        return coords
+    return None
+
+
+# ------------------------------------------------------------------------------
+# FILA (GeocodificacaoPendente)
+# ------------------------------------------------------------------------------
+def _modelo_de(instancia) -> str:
+    return instancia._meta.concrete_model._meta.model_name
+
+
+def enfileirar(instancia) -> None:
+    """Agenda o geocoding de um UserProfile/Job, se necessário."""
+    modelo = _modelo_de(instancia)
+    if modelo not in MODELOS or instancia.pk is None:
+        return
+
+    fila = GeocodificacaoPendente.objects.filter(modelo=modelo, objeto_id=instancia.pk)
+    if instancia.latitude is not None and instancia.longitude is not None:
+        # Coordenadas informadas manualmente: nada a consultar
+        fila.filter(status='pendente').delete()
+        return
+
+    endereco = instancia.endereco_geocodificacao()[:500]
+    if not endereco:
+        return
+    cep = normalizar_cep(instancia.cep)
+
+    # Endereço (ou CEP) já conhecido: resolve na hora, sem passar pela fila
+    coords = geocodificar(endereco, cep)
+    if coords is not None:
+        gravar_coordenadas(modelo, instancia.pk, coords[0], coords[1])
+        fila.filter(status='pendente').delete()
+        return
+
+    item = fila.first()
+    if item is None:
+        GeocodificacaoPendente.objects.get_or_create(
+            modelo=modelo,
+            objeto_id=instancia.pk,
+            defaults={'endereco': endereco, 'cep': cep},
+        )
+        return
+
+    if item.endereco != endereco or item.cep != cep or item.status == 'ok':
+        # Endereço novo (ou coordenadas apagadas): recomeça do zero
+        item.endereco = endereco
+        item.cep = cep
+        item.status = 'pendente'
+        item.tentativas = 0
+        item.proxima_tentativa = timezone.now()
+        item.ultimo_erro = ''
+        item.save()
+
+
+def backoff(tentativas: int) -> timedelta:
+    return timedelta(seconds=min(BACKOFF_BASE_S * 2 ** max(tentativas - 1, 0), BACKOFF_MAX_S))
+
+
+def gravar_coordenadas(modelo: str, objeto_id: int, lat, lon) -> int:
+    """Grava lat/lon sem passar pelo save() (não reenfileira nem dispara e-mails).
+
+    Só preenche objetos ainda sem coordenadas: edição manual prevalece. As
+    buscas salvas por raio são atualizadas aqui, já que não há post_save.
+    """
+    Modelo = MODELOS[modelo]
+    lat = Decimal(str(round(float(lat), 6)))
+    lon = Decimal(str(round(float(lon), 6)))
+    campos = {'latitude': lat, 'longitude': lon}
+    if Modelo is UserProfile:
+        campos['geohash'] = geohash_encode(lat, lon)
+    else:
+        campos['geocodificado_em'] = timezone.now()
+    gravados = (
+        Modelo.objects
+        .filter(Q(latitude__isnull=True) | Q(longitude__isnull=True), pk=objeto_id)
+        .update(**campos)
+    )
+    if gravados:
+        coordenadas_alteradas(modelo, [objeto_id])
+    return gravados
+
+
+def coordenadas_alteradas(modelo: str, ids) -> None:
+    """Avisa as buscas salvas (o UPDATE não dispara o post_save)."""
+    try:
+        if modelo == 'userprofile':
+            for objeto_id in ids:
+                atualizar_buscas_salvas(objeto_id, CAMPOS_COORDENADAS)
+        else:
+            for objeto_id in ids:
+                invalidar_por_job(objeto_id)
+    except Exception:
+        logger.exception('Falha ao atualizar buscas salvas após geocoding (%s %s)', modelo, list(ids))
+
+
+def processar_item(item: GeocodificacaoPendente, geocodificador, limitador: LimitadorTaxa | None = None) -> str:
+    """Consulta um item da fila e grava o resultado. Retorna o desfecho."""
+    try:
+        coords = geocodificar(item.endereco, item.cep, geocodificador, limitador)
+    except Exception as exc:
+        item.tentativas += 1
+        item.ultimo_erro = f"{type(exc).__name__}: {exc}"[:2000]
+        if item.tentativas >= MAX_TENTATIVAS:
+            item.status = 'falhou'
+        else:
+            item.proxima_tentativa = timezone.now() + backoff(item.tentativas)
+        item.save(update_fields=['tentativas', 'ultimo_erro', 'status', 'proxima_tentativa', 'atualizado_em'])
+        return 'falhou' if item.status == 'falhou' else 'erro'
+
+    item.tentativas += 1
+    item.ultimo_erro = ''
+    if coords is None:
+        item.status = 'sem_resultado'
+    else:
+        gravar_coordenadas(item.modelo, item.objeto_id, coords[0], coords[1])
+        item.status = 'ok'
+    item.save(update_fields=['tentativas', 'ultimo_erro', 'status', 'atualizado_em'])
+    return item.status
+
+
+def processar_pendentes(geocodificador, limitador: LimitadorTaxa | None = None, limite: int | None = None) -> Counter:
+    """Drena os itens vencidos da fila; só consultas externas passam pelo limitador."""
+    limitador = limitador or LimitadorTaxa()
+    qs = (
+        GeocodificacaoPendente.objects
+        .filter(status='pendente', proxima_tentativa__lte=timezone.now())
+        .order_by('proxima_tentativa', 'id')
+    )
+    if limite:
+        qs = qs[:limite]
+
+    contagem = Counter()
+    for item in list(qs):
+        contagem[processar_item(item, geocodificador, limitador)] += 1
+    return contagem
@@ -0,0 +1,71 @@
+"""
+Idade a partir da data de nascimento, em Python e no banco.
+
+Filtrar por idade é filtrar por intervalo de data_nascimento ("ter pelo
+menos N anos hoje" = nascido até hoje menos N anos), o que usa o índice
+(status, data_nascimento) e não calcula idade por linha:
+
+- idade(nascimento): idade exata em anos (quem nasceu em 29/02 faz
+  aniversário em 01/03 nos anos não bissextos);
+- nascidos_ate(anos): data de nascimento mais recente com ``anos`` completos;
+- filtro_idade(min, max): Q sobre data_nascimento;
+- expressao_idade(): idade calculada no SQL, para annotate/order_by/values.
+"""
+
+from datetime import date
+
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+
+
+def _hoje(hoje: date | None) -> date:
+    return hoje or timezone.localdate()
+
+
+def idade(nascimento: date | None, hoje: date | None = None) -> int | None:
+    if not nascimento:
+        return None
+    hoje = _hoje(hoje)
+    anos = hoje.year - nascimento.year - ((hoje.month, hoje.day) < (nascimento.month, nascimento.day))
+    return max(0, anos)
+
+
+def nascidos_ate(anos: int, hoje: date | None = None) -> date:
+    """Quem nasceu até esta data tem pelo menos ``anos`` anos ``hoje``."""
+    hoje = _hoje(hoje)
+    try:
+        return hoje.replace(year=hoje.year - anos)
+    except ValueError:  # hoje é 29/02 e o ano de destino não é bissexto
+        return hoje.replace(year=hoje.year - anos, day=28)
+
+
+def intervalo_nascimento(idade_min: int | None = None, idade_max: int | None = None,
+                         hoje: date | None = None) -> tuple[date | None, date | None]:
+    """(nascido depois de, nascido até) para idade_min <= idade <= idade_max."""
+    depois_de = nascidos_ate(idade_max + 1, hoje) if idade_max is not None else None
+    ate = nascidos_ate(idade_min, hoje) if idade_min is not None else None
+    return depois_de, ate
+
+
+def filtro_idade(idade_min: int | None = None, idade_max: int | None = None,
+                 hoje: date | None = None, campo: str = 'data_nascimento') -> Q:
+    depois_de, ate = intervalo_nascimento(idade_min, idade_max, hoje)
+    condicao = Q()
+    if ate is not None:
+        condicao &= Q(**{f'{campo}__lte': ate})
+    if depois_de is not None:
+        condicao &= Q(**{f'{campo}__gt': depois_de})
+    return condicao
+
+
+def expressao_idade(campo: str = 'data_nascimento', hoje: date | None = None):
+    """Idade em anos calculada no banco (NULL sem data de nascimento)."""
+    hoje = _hoje(hoje)
+    ainda_nao_fez = Q(**{f'{campo}__month__gt': hoje.month}) | Q(
+        **{f'{campo}__month': hoje.month, f'{campo}__day__gt': hoje.day}
+    )
+    return (
+        Value(hoje.year) - ExtractYear(F(campo))
+        - Case(When(ainda_nao_fez, then=Value(1)), default=Value(0), output_field=IntegerField())
+    )
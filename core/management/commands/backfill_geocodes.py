@@ -0,0 +1,158 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from core.buscas_salvas import CAMPOS_COORDENADAS, invalidar_por_campos as invalidar_buscas_por_campos
+from core.geo import geohash_encode
+from core.geocoding import (
+    GEOCODIFICADORES,
+    INTERVALO_MINIMO_S,
+    MODELOS,
+    coordenadas_alteradas,
+    geocodificar,
+    limitador_para,
+    normalizar_cep,
+    normalizar_endereco,
+    obter_geocodificador,
+)
+from core.models import GeocodificacaoPendente
+
+
+CAMPOS_ENDERECO = {
+    'userprofile': ('endereco', 'numero', 'bairro', 'cidade', 'estado', 'cep'),
+    'job': ('endereco', 'local', 'numero', 'bairro', 'cidade', 'estado', 'cep'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Preenche latitude/longitude dos registros sem coordenadas. '
+        'Pode ser interrompido e rodado de novo: o que já foi resolvido sai do filtro '
+        'e endereços sem resultado ficam no GeocodeCache.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=sorted(MODELOS), required=True)
+        parser.add_argument('--batch', type=int, default=500, help='Registros por lote (leitura e bulk_update).')
+        parser.add_argument('--workers', type=int, default=2, help='Threads de consulta (o limite de taxa é global).')
+        parser.add_argument('--intervalo', type=float, default=INTERVALO_MINIMO_S, help='Intervalo mínimo entre consultas externas (s).')
+        parser.add_argument('--geocoder', choices=sorted(GEOCODIFICADORES), default=None, help='Padrão: settings.GEOCODIFICADOR.')
+        parser.add_argument('--desde-id', type=int, default=0, help='Retoma a partir deste id (exclusivo).')
+
+    def handle(self, *args, **opts):
+        modelo = opts['model']
+        Modelo = MODELOS[modelo]
+        batch = max(1, opts['batch'])
+        try:
+            geocodificador = obter_geocodificador(opts['geocoder'])
+        except Exception as exc:
+            raise CommandError(f'Não foi possível iniciar o geocodificador: {exc}')
+        limitador = limitador_para(geocodificador, opts['intervalo'])
+
+        qs = (
+            Modelo.objects
+            .filter(Q(latitude__isnull=True) | Q(longitude__isnull=True))
+            .only('id', 'latitude', 'longitude', *CAMPOS_ENDERECO[modelo])
+            .order_by('pk')
+        )
+        total = qs.filter(pk__gt=opts['desde_id']).count()
+        self.stdout.write(f'{total} registro(s) de {modelo} sem coordenadas.')
+
+        workers = max(1, opts['workers'])
+        if connection.vendor == 'sqlite' and workers > 1:
+            # SQLite aceita um escritor por vez: threads gravando o GeocodeCache
+            # em paralelo esbarram em "database is locked"
+            self.stdout.write('SQLite: usando 1 worker.')
+            workers = 1
+
+        def resolver(endereco, cep):
+            try:
+                return geocodificar(endereco, cep, geocodificador, limitador)
+            finally:
+                # Cada thread abre a própria conexão (cache); não deixa aberta
+                connection.close()
+
+        campos = ['latitude', 'longitude', 'geohash' if modelo == 'userprofile' else 'geocodificado_em']
+        resolvidos = {}  # (endereço normalizado, cep) -> coords | None, para todo o run
+        contagem = Counter()
+        ultimo_id = opts['desde_id']
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                # Lote lido por inteiro (keyset): nenhum cursor fica aberto
+                # enquanto as threads gravam o cache e o lote é atualizado
+                lote = list(qs.filter(pk__gt=ultimo_id)[:batch])
+                if not lote:
+                    break
+                ultimo_id = lote[-1].pk
+
+                # Agrupa endereços idênticos: uma consulta por endereço distinto
+                grupos = {}
+                for obj in lote:
+                    endereco = obj.endereco_geocodificacao()[:500]
+                    if not endereco:
+                        contagem['sem_endereco'] += 1
+                        continue
+                    cep = normalizar_cep(obj.cep)
+                    chave = (normalizar_endereco(endereco), cep)
+                    grupos.setdefault(chave, (endereco, cep, []))[2].append(obj)
+
+                futuros = {
+                    chave: pool.submit(resolver, endereco, cep)
+                    for chave, (endereco, cep, _objs) in grupos.items()
+                    if chave not in resolvidos
+                }
+                for chave, futuro in futuros.items():
+                    try:
+                        resolvidos[chave] = futuro.result()
+                    except Exception as exc:
+                        # Falha transitória: não memoriza, fica para a próxima execução
+                        contagem['erro'] += len(grupos[chave][2])
+                        self.stderr.write(f'Erro em "{grupos[chave][0]}": {exc}')
+
+                atualizados = []
+                agora = timezone.now()
+                for chave, (_endereco, _cep, objs) in grupos.items():
+                    if chave not in resolvidos:
+                        continue
+                    coords = resolvidos[chave]
+                    if coords is None:
+                        contagem['sem_resultado'] += len(objs)
+                        continue
+                    lat, lon = round(coords[0], 6), round(coords[1], 6)
+                    for obj in objs:
+                        obj.latitude = lat
+                        obj.longitude = lon
+                        if modelo == 'userprofile':
+                            obj.geohash = geohash_encode(lat, lon)
+                        else:
+                            obj.geocodificado_em = agora
+                        atualizados.append(obj)
+
+                if atualizados:
+                    Modelo.objects.bulk_update(atualizados, campos, batch_size=batch)
+                    GeocodificacaoPendente.objects.filter(
+                        modelo=modelo, objeto_id__in=[o.pk for o in atualizados], status='pendente'
+                    ).update(status='ok', atualizado_em=agora)
+                    # bulk_update não dispara signals: buscas salvas por raio
+                    if modelo == 'userprofile':
+                        invalidar_buscas_por_campos(CAMPOS_COORDENADAS)
+                    else:
+                        coordenadas_alteradas(modelo, [o.pk for o in atualizados])
+                contagem['ok'] += len(atualizados)
+                contagem['processados'] += len(lote)
+
+                self.stdout.write(
+                    f"{contagem['processados']}/{total} | ok: {contagem['ok']} | "
+                    f"sem resultado: {contagem['sem_resultado']} | erros: {contagem['erro']} | "
+                    f"último id: {lote[-1].pk}"
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Concluído: {contagem['ok']} geocodificado(s), {contagem['sem_resultado']} sem resultado, "
+            f"{contagem['erro']} erro(s), {contagem['sem_endereco']} sem endereço."
+        ))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.compatibilidade import processar_pendentes
+
+
+class Command(BaseCommand):
+    help = 'Recalcula o índice de compatibilidade dos jobs/perfis alterados (compatibilidade_pendente).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Processa o que estiver pendente e sai.')
+        parser.add_argument('--limite', type=int, default=20, help='Máximo de jobs e de perfis por rodada.')
+        parser.add_argument('--espera', type=float, default=10.0, help='Segundos entre rodadas quando a fila estiver vazia.')
+
+    def handle(self, *args, **opts):
+        while True:
+            contagem = processar_pendentes(limite=opts['limite'])
+            if contagem:
+                resumo = ', '.join(f'{k}: {v}' for k, v in sorted(contagem.items()))
+                self.stdout.write(f'Compatibilidade: {resumo}')
+            if opts['once']:
+                break
+            # Só falhas (remarcadas) também esperam: evita laço quente
+            if not contagem or set(contagem) == {'falhou'}:
+                try:
+                    time.sleep(opts['espera'])
+                except KeyboardInterrupt:
+                    break
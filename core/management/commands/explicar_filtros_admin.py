@@ -0,0 +1,116 @@
+import re
+import sys
+import time
+from urllib.parse import unquote
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import QueryDict
+from django.test import RequestFactory
+
+from core.models import UserProfile
+
+
+CAMINHO = '/admin/core/userprofile/'
+# Linha de access log (nginx/gunicorn) ou querystring pura ("?genero=..." / "genero=...")
+_URL_RE = re.compile(re.escape(CAMINHO) + r'\?(\S*)')
+
+
+def _querystrings(linhas):
+    for linha in linhas:
+        linha = linha.strip()
+        if not linha or linha.startswith('#'):
+            continue
+        achado = _URL_RE.search(linha)
+        if achado:
+            yield achado.group(1).strip('"')
+        elif '=' in linha and ' ' not in linha:
+            yield linha.lstrip('?')
+
+
+def _ms(inicio) -> float:
+    return (time.perf_counter() - inicio) * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Reexecuta querystrings reais da Base de Promotores (access log ou uma por linha) '
+        'pelo UserProfileAdmin e mostra o EXPLAIN e o tempo de cada uma, para validar os índices.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help="Arquivo com as URLs/querystrings ('-' lê da entrada padrão).")
+        parser.add_argument('--usuario', help='Usuário do admin usado nas requisições (padrão: primeiro superusuário).')
+        parser.add_argument('--repeticoes', type=int, default=3, help='Execuções por consulta; vale o menor tempo.')
+        parser.add_argument('--limite', type=int, default=0, help='Processa só as N primeiras consultas distintas.')
+        parser.add_argument('--sem-plano', action='store_true', help='Só os tempos, sem imprimir o EXPLAIN.')
+
+    def handle(self, *args, **opts):
+        if opts['arquivo'] == '-':
+            linhas = sys.stdin.readlines()
+        else:
+            try:
+                with open(opts['arquivo'], encoding='utf-8', errors='replace') as f:
+                    linhas = f.readlines()
+            except OSError as e:
+                raise CommandError(f'Não foi possível ler {opts["arquivo"]}: {e}')
+
+        consultas = list(dict.fromkeys(_querystrings(linhas)))
+        if opts['limite']:
+            consultas = consultas[:opts['limite']]
+        if not consultas:
+            raise CommandError('Nenhuma querystring da Base de Promotores encontrada.')
+
+        usuario = (
+            User.objects.filter(username=opts['usuario']).first() if opts['usuario']
+            else User.objects.filter(is_superuser=True, is_active=True).order_by('pk').first()
+        )
+        if usuario is None:
+            raise CommandError('Usuário do admin não encontrado (use --usuario).')
+
+        model_admin = admin.site._registry[UserProfile]
+        fabrica = RequestFactory()
+        repeticoes = max(1, opts['repeticoes'])
+        resumo = []
+
+        for querystring in consultas:
+            params = QueryDict(querystring, mutable=True)
+            # Mesmo padrão do changelist_view (legado ?status= e aba APROVADOS)
+            if 'status' in params and 'status__exact' not in params:
+                params['status__exact'] = params.pop('status')[-1]
+            params.setdefault('status__exact', 'aprovado')
+
+            request = fabrica.get(CAMINHO, params)
+            request.user = usuario
+            try:
+                changelist = model_admin.get_changelist_instance(request)
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'{unquote(querystring)}: {e}'))
+                continue
+
+            qs = changelist.queryset
+            pagina = qs[:model_admin.list_per_page]
+            tempos_total, tempos_pagina = [], []
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                total = qs.count()
+                tempos_total.append(_ms(inicio))
+                inicio = time.perf_counter()
+                list(pagina.values_list('pk', flat=True))
+                tempos_pagina.append(_ms(inicio))
+
+            contagem_ms, pagina_ms = min(tempos_total), min(tempos_pagina)
+            resumo.append((contagem_ms + pagina_ms, params.urlencode()))
+            self.stdout.write(self.style.MIGRATE_HEADING(params.urlencode()))
+            self.stdout.write(f'  {total} linha(s) | count {contagem_ms:.1f} ms | 1ª página {pagina_ms:.1f} ms')
+            if not opts['sem_plano']:
+                opcoes = {'analyze': True} if connection.vendor == 'postgresql' else {}
+                for linha in pagina.explain(**opcoes).splitlines():
+                    self.stdout.write(f'    {linha}')
+
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(f'{len(resumo)} consulta(s) reexecutada(s). Mais lentas:'))
+        for tempo, querystring in sorted(resumo, reverse=True)[:10]:
+            self.stdout.write(f'  {tempo:8.1f} ms  {querystring}')
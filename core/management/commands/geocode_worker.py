@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.geocoding import GEOCODIFICADORES, INTERVALO_MINIMO_S, limitador_para, obter_geocodificador, processar_pendentes
+
+
+class Command(BaseCommand):
+    help = 'Processa a fila de geocodificação (GeocodificacaoPendente) respeitando o limite do Nominatim.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Processa o que estiver vencido e sai.')
+        parser.add_argument('--limite', type=int, default=100, help='Máximo de itens por rodada.')
+        parser.add_argument('--espera', type=float, default=30.0, help='Segundos entre rodadas quando a fila estiver vazia.')
+        parser.add_argument('--intervalo', type=float, default=INTERVALO_MINIMO_S, help='Intervalo mínimo entre consultas (s).')
+        parser.add_argument('--geocoder', choices=sorted(GEOCODIFICADORES), default=None, help='Padrão: settings.GEOCODIFICADOR.')
+
+    def handle(self, *args, **opts):
+        try:
+            geocodificador = obter_geocodificador(opts['geocoder'])
+        except Exception as exc:
+            raise CommandError(f'Não foi possível iniciar o geocodificador: {exc}')
+
+        limitador = limitador_para(geocodificador, opts['intervalo'])
+        while True:
+            contagem = processar_pendentes(geocodificador, limitador, limite=opts['limite'])
+            if contagem:
+                resumo = ', '.join(f'{k}: {v}' for k, v in sorted(contagem.items()))
+                self.stdout.write(f'Geocodificação: {resumo}')
+            if opts['once']:
+                break
+            if not contagem:
+                try:
+                    time.sleep(opts['espera'])
+                except KeyboardInterrupt:
+                    break
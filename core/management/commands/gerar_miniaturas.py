@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core.miniaturas import atualizar_miniaturas
+from core.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera as miniaturas WebP (p/m/g) das fotos de rosto e corpo dos promotores que '
+        'ainda não as têm (ou de todos, com --refazer).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--refazer', action='store_true', help='Regera também as miniaturas já existentes.')
+        parser.add_argument('--batch', type=int, default=200, help='Perfis lidos por lote.')
+
+    def handle(self, *args, **opts):
+        com_foto = (Q(foto_rosto__isnull=False) & ~Q(foto_rosto='')) | (Q(foto_corpo__isnull=False) & ~Q(foto_corpo=''))
+        perfis = UserProfile.objects.filter(com_foto).only('id', 'foto_rosto', 'foto_corpo', 'miniaturas')
+        geradas = falhas = 0
+        for perfil in perfis.iterator(chunk_size=opts['batch']):
+            try:
+                if atualizar_miniaturas(perfil, refazer=opts['refazer']):
+                    geradas += 1
+            except Exception as e:
+                falhas += 1
+                self.stderr.write(f'Perfil {perfil.pk}: {e}')
+        self.stdout.write(self.style.SUCCESS(f'{geradas} perfil(is) com miniaturas geradas; {falhas} falha(s).'))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.miniaturas import processar_pendentes
+
+
+class Command(BaseCommand):
+    help = 'Gera as miniaturas WebP das fotos enviadas/trocadas (UserProfile.miniaturas_pendentes).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Processa o que estiver pendente e sai.')
+        parser.add_argument('--limite', type=int, default=50, help='Máximo de perfis por rodada.')
+        parser.add_argument('--espera', type=float, default=10.0, help='Segundos entre rodadas quando a fila estiver vazia.')
+
+    def handle(self, *args, **opts):
+        while True:
+            contagem = processar_pendentes(limite=opts['limite'])
+            if contagem:
+                resumo = ', '.join(f'{k}: {v}' for k, v in sorted(contagem.items()))
+                self.stdout.write(f'Miniaturas: {resumo}')
+            if opts['once']:
+                break
+            if not contagem:
+                try:
+                    time.sleep(opts['espera'])
+                except KeyboardInterrupt:
+                    break
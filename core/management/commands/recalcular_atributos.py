@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core.atributos import recalcular
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula as máscaras de atributos (UserProfile.atributos_bits e as máscaras de '
+        'requisitos dos jobs). Necessário depois de reordenar opções dos choices.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Só informa quantos registros divergem.')
+
+    def handle(self, *args, **opts):
+        perfis, jobs = recalcular(corrigir=not opts['dry_run'])
+        if not perfis and not jobs:
+            self.stdout.write(self.style.SUCCESS('Máscaras consistentes com a base.'))
+            return
+        resumo = f'{perfis} perfil(is) e {jobs} job(s) com máscara divergente'
+        if opts['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{resumo} (nada foi alterado).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{resumo}: corrigido(s).'))
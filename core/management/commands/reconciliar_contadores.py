@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from core.contadores import reconciliar
+from core.dashboard import invalidar_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os contadores demográficos a partir da base e informa as divergências.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Só informa as divergências, sem regravar.')
+
+    def handle(self, *args, **opts):
+        divergencias = reconciliar(corrigir=not opts['dry_run'])
+        if not divergencias:
+            self.stdout.write(self.style.SUCCESS('Contadores consistentes com a base.'))
+            return
+
+        for (dimensao, valor, status), (armazenado, real) in sorted(divergencias.items()):
+            self.stdout.write(f'{dimensao}={valor or "-"} [{status or "-"}]: armazenado {armazenado}, real {real} ({real - armazenado:+d})')
+
+        if opts['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(divergencias)} divergência(s) encontrada(s) (nada foi alterado).'))
+        else:
+            invalidar_snapshot()
+            self.stdout.write(self.style.SUCCESS(f'{len(divergencias)} divergência(s) corrigida(s).'))
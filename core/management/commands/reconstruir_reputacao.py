@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core.reputacao import reconstruir
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula a reputação desnormalizada dos promotores (nota média, total de '
+        'avaliações e de jobs aprovados) a partir de Avaliacao e Candidatura.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Só informa quantos perfis divergem.')
+
+    def handle(self, *args, **opts):
+        divergentes = reconstruir(corrigir=not opts['dry_run'])
+        if not divergentes:
+            self.stdout.write(self.style.SUCCESS('Reputação consistente com a base.'))
+            return
+        resumo = f'{divergentes} perfil(is) com reputação divergente'
+        if opts['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{resumo} (nada foi alterado).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{resumo}: corrigido(s).'))
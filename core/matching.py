@@ -0,0 +1,184 @@
+"""
+Compatibilidade entre os requisitos de um Job e o perfil do promotor.
+
+Os requisitos de cada job são "compilados" uma única vez (Requisitos) e
+ficam em cache pelo conteúdo dos campos de requisito; o perfil também é
+normalizado uma vez por requisição (PerfilMatch). A avaliação é um único
+passe sobre os requisitos exigidos.
+
+Usado pelo mural de vagas (lista_vagas / detalhe_vaga) e pelo índice
+persistido de compatibilidade (core.compatibilidade).
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .atributos import mascara_aceitos, mascara_perfil
+from .models import UserProfile
+
+
+AREAS_VALIDAS = frozenset(k for (k, _lbl) in UserProfile.AREAS_ATUACAO_CHOICES)
+AREAS_LABEL_TO_VALUE = {str(lbl).casefold(): val for val, lbl in UserProfile.AREAS_ATUACAO_CHOICES}
+IDIOMA_RANK = {'basico': 1, 'intermediario': 2, 'fluente': 3}
+_OUTROS_RE = re.compile(r'\boutros\s*:', flags=re.IGNORECASE)
+
+# (campo do job com valores aceitos, campo correspondente do perfil)
+CAMPOS_ACEITOS = (
+    ('generos_aceitos', 'genero'),
+    ('etnias_aceitas', 'etnia'),
+    ('olhos_aceitos', 'olhos'),
+    ('cabelo_tipos_aceitos', 'cabelo_tipo'),
+    ('cabelo_comprimentos_aceitos', 'cabelo_comprimento'),
+)
+
+FIT_MESSAGES = {
+    'livre': 'Sem exigências obrigatórias — seu perfil pode se candidatar.',
+    'good': 'Seu perfil atende aos requisitos.',
+    'almost': 'Seu perfil atende a quase todos requisitos.',
+    'bad': 'Seu perfil não atende aos requisitos.',
+}
+
+
+def parse_csv_set(raw: str | None) -> set[str]:
+    raw = (raw or '').strip()
+    if not raw:
+        return set()
+    return {p.strip() for p in raw.replace('\n', ',').split(',') if p and p.strip()}
+
+
+def parse_areas(raw: str | None) -> set[str]:
+    """Códigos de área de um texto salvo (UserProfile.areas_atuacao / Job.tipo_servico).
+
+    Aceita códigos e rótulos legados ("Recepção"), separados por vírgula,
+    ponto e vírgula ou barra vertical. O texto livre de "Outros: ..." e
+    termos desconhecidos são ignorados. Regra única do matching e da
+    relação UserProfile.areas (core.areas).
+    """
+    raw = (raw or '').strip()
+    if not raw:
+        return set()
+    raw = _OUTROS_RE.split(raw, 1)[0]
+    out = set()
+    for part in (p.strip() for p in re.split(r'[,;|]+', raw)):
+        if not part:
+            continue
+        if part in AREAS_VALIDAS:
+            out.add(part)
+            continue
+        mapped = AREAS_LABEL_TO_VALUE.get(part.casefold())
+        if mapped:
+            out.add(mapped)
+    return out
+
+
+def idioma_rank(val: str | None) -> int:
+    return IDIOMA_RANK.get(val or '', 0)
+
+
+@dataclass(frozen=True, slots=True)
+class PerfilMatch:
+    """Atributos do promotor já normalizados para a comparação."""
+    areas: frozenset
+    tem_experiencia: bool
+    atributos: int  # gênero/etnia/olhos/cabelo em bits (core.atributos)
+    ingles: int
+
+
+@dataclass(frozen=True, slots=True)
+class Requisitos:
+    """Requisitos de um job, já parseados. Só guarda o que é exigido."""
+    areas: frozenset
+    requer_experiencia: bool
+    aceitos: tuple  # ((campo_perfil, frozenset(valores)), ...), para exibição
+    mascaras: tuple  # máscara de bits de cada dimensão de ``aceitos``
+    ingles_min: int | None
+    total: int
+
+    def avaliar(self, perfil: PerfilMatch) -> tuple[int, int]:
+        """Retorna (requisitos atendidos, total de requisitos exigidos)."""
+        passed = 0
+        if self.areas and not self.areas.isdisjoint(perfil.areas):
+            passed += 1
+        if self.requer_experiencia and perfil.tem_experiencia:
+            passed += 1
+        for mascara in self.mascaras:
+            if perfil.atributos & mascara:
+                passed += 1
+        if self.ingles_min is not None and perfil.ingles >= self.ingles_min:
+            passed += 1
+        return passed, self.total
+
+
+@lru_cache(maxsize=4096)
+def _compilar(tipo_servico, requer_experiencia, nivel_ingles_min, *aceitos_raw) -> Requisitos:
+    areas = frozenset(parse_areas(tipo_servico))
+    aceitos = tuple(
+        (campo_perfil, frozenset(valores))
+        for (_campo_job, campo_perfil), valores in zip(CAMPOS_ACEITOS, map(parse_csv_set, aceitos_raw))
+        if valores
+    )
+    ingles_min = idioma_rank(nivel_ingles_min) if nivel_ingles_min else None
+    total = int(bool(areas)) + int(bool(requer_experiencia)) + len(aceitos) + int(bool(nivel_ingles_min))
+    return Requisitos(
+        areas=areas,
+        requer_experiencia=bool(requer_experiencia),
+        aceitos=aceitos,
+        mascaras=tuple(mascara_aceitos(campo, valores) for campo, valores in aceitos),
+        ingles_min=ingles_min,
+        total=total,
+    )
+
+
+def compilar_job(job) -> Requisitos:
+    # O cache é indexado pelo conteúdo dos campos de requisito: um job editado
+    # gera uma chave nova, e jobs com os mesmos requisitos compartilham a entrada.
+    return _compilar(
+        job.tipo_servico or '',
+        bool(getattr(job, 'requer_experiencia', False)),
+        job.nivel_ingles_min or '',
+        *[(getattr(job, campo_job, '') or '') for campo_job, _campo_perfil in CAMPOS_ACEITOS],
+    )
+
+
+def compilar_perfil(perfil) -> PerfilMatch:
+    return PerfilMatch(
+        areas=frozenset(parse_areas(perfil.areas_atuacao)),
+        tem_experiencia=(perfil.experiencia or '') != 'sem_experiencia',
+        atributos=mascara_perfil(perfil),
+        ingles=idioma_rank(perfil.nivel_ingles),
+    )
+
+
+def fit_status(passed: int, total: int) -> str:
+    if total == 0 or passed == total:
+        return 'good'
+    missing = total - passed
+    if missing <= 1 or (passed / total) >= 0.7:
+        return 'almost'
+    return 'bad'
+
+
+def fit_dict(passed: int, total: int, status: str | None = None) -> dict:
+    status = status or fit_status(passed, total)
+    message = FIT_MESSAGES['livre'] if total == 0 else FIT_MESSAGES[status]
+    return {
+        'status': status,
+        'message': message,
+        'passed': passed,
+        'total': total,
+    }
+
+
+def fit_counts(job, perfil) -> tuple[int, int]:
+    return compilar_job(job).avaliar(compilar_perfil(perfil))
+
+
+def score_jobs(perfil, jobs) -> dict[int, dict]:
+    """Avalia o perfil contra vários jobs de uma vez: {job.pk: fit}."""
+    alvo = perfil if isinstance(perfil, PerfilMatch) else compilar_perfil(perfil)
+    out = {}
+    for job in jobs:
+        passed, total = compilar_job(job).avaliar(alvo)
+        out[job.pk] = fit_dict(passed, total)
+    return out
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_promotorapresentacao'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompatibilidadeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('requisitos_atendidos', models.PositiveSmallIntegerField(default=0, verbose_name='Requisitos atendidos')),
+                ('requisitos_total', models.PositiveSmallIntegerField(default=0, verbose_name='Requisitos exigidos')),
+                ('status', models.CharField(choices=[('good', 'Atende'), ('almost', 'Atende quase todos'), ('bad', 'Não atende')], default='good', max_length=10, verbose_name='Compatibilidade')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='compatibilidades', to='core.job')),
+                ('perfil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='compatibilidades', to='core.userprofile')),
+            ],
+            options={
+                'verbose_name': 'Compatibilidade',
+                'verbose_name_plural': 'Compatibilidades',
+                'constraints': [models.UniqueConstraint(fields=('perfil', 'job'), name='compat_perfil_job_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:48
+
+from django.db import migrations, models
+
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+PRECISAO = 9
+
+
+def geohash_encode(lat, lon):
+    # Cópia da regra de core.geo.geohash_encode nesta data
+    lat = float(lat)
+    lon = float(lon)
+    lat_int = [-90.0, 90.0]
+    lon_int = [-180.0, 180.0]
+    out = []
+    bits = 0
+    bit = 0
+    par = True
+    while len(out) < PRECISAO:
+        intervalo, valor = (lon_int, lon) if par else (lat_int, lat)
+        meio = (intervalo[0] + intervalo[1]) / 2
+        if valor >= meio:
+            bits = (bits << 1) | 1
+            intervalo[0] = meio
+        else:
+            bits = bits << 1
+            intervalo[1] = meio
+        par = not par
+        bit += 1
+        if bit == 5:
+            out.append(BASE32[bits])
+            bits = 0
+            bit = 0
+    return ''.join(out)
+
+
+def forwards(apps, schema_editor):
+    UserProfile = apps.get_model('core', 'UserProfile')
+    qs = UserProfile.objects.filter(latitude__isnull=False, longitude__isnull=False).only('id', 'latitude', 'longitude')
+    lote = []
+    for perfil in qs.iterator(chunk_size=1000):
+        perfil.geohash = geohash_encode(perfil.latitude, perfil.longitude)
+        lote.append(perfil)
+        if len(lote) >= 1000:
+            UserProfile.objects.bulk_update(lote, ['geohash'])
+            lote = []
+    if lote:
+        UserProfile.objects.bulk_update(lote, ['geohash'])
+
+
+def backwards(apps, schema_editor):
+    # A coluna é removida junto com o campo
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0034_compatibilidadejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12, null=True, verbose_name='Geohash'),
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
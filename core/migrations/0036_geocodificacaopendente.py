@@ -0,0 +1,35 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_userprofile_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodificacaoPendente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modelo', models.CharField(choices=[('userprofile', 'Promotor'), ('job', 'Trabalho')], max_length=20, verbose_name='Modelo')),
+                ('objeto_id', models.PositiveBigIntegerField(verbose_name='ID do objeto')),
+                ('endereco', models.CharField(max_length=500, verbose_name='Endereço consultado')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('ok', 'Geocodificado'), ('sem_resultado', 'Sem resultado'), ('falhou', 'Falhou')], default='pendente', max_length=15, verbose_name='Status')),
+                ('tentativas', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('proxima_tentativa', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próxima tentativa')),
+                ('ultimo_erro', models.TextField(blank=True, default='', verbose_name='Último erro')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Geocodificação pendente',
+                'verbose_name_plural': 'Fila de geocodificação',
+                'indexes': [models.Index(fields=['status', 'proxima_tentativa'], name='geocod_fila_idx')],
+                'constraints': [models.UniqueConstraint(fields=('modelo', 'objeto_id'), name='geocod_modelo_objeto_uniq')],
+            },
+        ),
+    ]
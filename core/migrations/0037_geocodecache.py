@@ -0,0 +1,40 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:53
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_geocodificacaopendente'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chave', models.CharField(max_length=64, unique=True, verbose_name='Chave')),
+                ('tipo', models.CharField(choices=[('endereco', 'Endereço'), ('cep', 'CEP (centroide)')], max_length=10, verbose_name='Tipo')),
+                ('descricao', models.CharField(blank=True, default='', max_length=500, verbose_name='Endereço normalizado / CEP')),
+                ('latitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True, verbose_name='Latitude')),
+                ('longitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True, verbose_name='Longitude')),
+                ('amostras', models.PositiveIntegerField(default=1, verbose_name='Amostras (centroide)')),
+                ('acertos', models.PositiveIntegerField(default=0, verbose_name='Acertos (hits)')),
+                ('consultas', models.PositiveIntegerField(default=0, verbose_name='Consultas externas (misses)')),
+                ('consultado_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Consultado em')),
+                ('expira_em', models.DateTimeField(verbose_name='Expira em')),
+                ('ultimo_acerto_em', models.DateTimeField(blank=True, null=True, verbose_name='Último acerto')),
+            ],
+            options={
+                'verbose_name': 'Cache de geocodificação',
+                'verbose_name_plural': 'Cache de geocodificação',
+            },
+        ),
+        migrations.AddField(
+            model_name='geocodificacaopendente',
+            name='cep',
+            field=models.CharField(blank=True, default='', max_length=9, verbose_name='CEP'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.9 on 2026-10-18 15:58
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+DIMENSOES = {
+    'genero': 'genero',
+    'etnia': 'etnia',
+    'camiseta': 'tamanho_camiseta',
+    'calcado': 'calcado',
+    'nascimento': 'data_nascimento',
+}
+
+
+def forwards(apps, schema_editor):
+    # Carga inicial (mesma regra de core.contadores.chaves)
+    UserProfile = apps.get_model('core', 'UserProfile')
+    ContadorDemografico = apps.get_model('core', 'ContadorDemografico')
+
+    contagem = Counter()
+    campos = ('status',) + tuple(DIMENSOES.values())
+    for linha in UserProfile.objects.values(*campos).annotate(n=Count('id')).order_by():
+        status = linha['status'] or ''
+        contagem[('total', '', status)] += linha['n']
+        for dimensao, campo in DIMENSOES.items():
+            valor = linha[campo]
+            if valor is None:
+                continue
+            valor = valor.isoformat() if hasattr(valor, 'isoformat') else str(valor).strip()[:50]
+            if valor:
+                contagem[(dimensao, valor, status)] += linha['n']
+
+    ContadorDemografico.objects.bulk_create(
+        [ContadorDemografico(dimensao=d, valor=v, status=s, total=n) for (d, v, s), n in contagem.items()],
+        batch_size=1000,
+    )
+
+
+def backwards(apps, schema_editor):
+    # A tabela é removida junto com o modelo
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0037_geocodecache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorDemografico',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimensao', models.CharField(max_length=20, verbose_name='Dimensão')),
+                ('valor', models.CharField(blank=True, default='', max_length=50, verbose_name='Valor')),
+                ('status', models.CharField(max_length=20, verbose_name='Status do promotor')),
+                ('total', models.IntegerField(default=0, verbose_name='Total')),
+            ],
+            options={
+                'verbose_name': 'Contador demográfico',
+                'verbose_name_plural': 'Contadores demográficos',
+                'constraints': [models.UniqueConstraint(fields=('dimensao', 'valor', 'status'), name='contador_dim_valor_status_uniq')],
+            },
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
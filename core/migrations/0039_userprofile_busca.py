@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:04
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+def normalizar(texto):
+    # Cópia da regra de core.texto.normalizar nesta data
+    texto = unicodedata.normalize('NFKD', texto or '')
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).casefold()
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', texto).split())
+
+
+def preencher_busca(apps, schema_editor):
+    UserProfile = apps.get_model('core', 'UserProfile')
+    lote = []
+    for perfil in UserProfile.objects.only('id', 'nome_completo').iterator(chunk_size=1000):
+        perfil.busca = normalizar(perfil.nome_completo)
+        lote.append(perfil)
+        if len(lote) >= 1000:
+            UserProfile.objects.bulk_update(lote, ['busca'])
+            lote = []
+    if lote:
+        UserProfile.objects.bulk_update(lote, ['busca'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0038_contadordemografico'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='busca',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=120, verbose_name='Busca'),
+        ),
+        migrations.RunPython(preencher_busca, migrations.RunPython.noop),
+    ]
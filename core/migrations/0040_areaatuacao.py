@@ -0,0 +1,107 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:11
+
+import re
+
+from django.db import migrations, models
+
+
+# Cópia de UserProfile.AREAS_ATUACAO_CHOICES no momento da migração
+AREAS = [
+    ('recepcao', 'Recepção'),
+    ('degustacao', 'Degustação'),
+    ('bartender', 'Bartender'),
+    ('garcom', 'Garçom/Garçonete'),
+    ('modelo', 'Modelo'),
+    ('seguranca', 'Segurança'),
+    ('mascote', 'Mascote'),
+    ('controle_acesso', 'Controle de Acesso'),
+    ('limpeza', 'Limpeza'),
+    ('dj', 'DJ'),
+    ('fotografo', 'Fotógrafo'),
+    ('apresentador', 'Apresentador/Locutor'),
+    ('outros', 'Outros (Descrever abaixo)'),
+]
+
+
+def _slugs(raw):
+    # Mesma regra de core.areas.slugs_do_texto
+    raw = (raw or '').strip()
+    if not raw:
+        return set()
+    validos = {slug for slug, _nome in AREAS}
+    por_rotulo = {nome.casefold(): slug for slug, nome in AREAS}
+    out = set()
+    match = re.search(r'\boutros\s*:\s*', raw, flags=re.IGNORECASE)
+    if match:
+        if raw[match.end():].strip():
+            out.add('outros')
+        raw = raw[:match.start()]
+    for part in (p.strip() for p in re.split(r'[,;|]+', raw)):
+        if not part:
+            continue
+        out.add(part if part in validos else por_rotulo.get(part.casefold(), 'outros'))
+    return out
+
+
+def forwards(apps, schema_editor):
+    AreaAtuacao = apps.get_model('core', 'AreaAtuacao')
+    UserProfile = apps.get_model('core', 'UserProfile')
+    Job = apps.get_model('core', 'Job')
+
+    AreaAtuacao.objects.bulk_create(
+        [AreaAtuacao(slug=slug, nome=nome, ordem=i) for i, (slug, nome) in enumerate(AREAS)]
+    )
+    ids = dict(AreaAtuacao.objects.values_list('slug', 'id'))
+
+    for Modelo, campo, fk in ((UserProfile, 'areas_atuacao', 'userprofile_id'), (Job, 'tipo_servico', 'job_id')):
+        Through = Modelo.areas.through
+        lote = []
+        linhas = Modelo.objects.exclude(**{f'{campo}__isnull': True}).exclude(**{campo: ''}).values_list('id', campo)
+        for pk, texto in linhas.iterator(chunk_size=2000):
+            for slug in _slugs(texto):
+                lote.append(Through(**{fk: pk, 'areaatuacao_id': ids[slug]}))
+            if len(lote) >= 2000:
+                Through.objects.bulk_create(lote)
+                lote = []
+        if lote:
+            Through.objects.bulk_create(lote)
+
+
+def backwards(apps, schema_editor):
+    # As tabelas são removidas junto com o modelo/campos
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0039_userprofile_busca'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AreaAtuacao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=30, unique=True, verbose_name='Código')),
+                ('nome', models.CharField(max_length=60, verbose_name='Nome')),
+                ('ordem', models.PositiveSmallIntegerField(default=0, verbose_name='Ordem')),
+            ],
+            options={
+                'verbose_name': 'Área de atuação',
+                'verbose_name_plural': 'Áreas de atuação',
+                'ordering': ['ordem', 'nome'],
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='areas',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='jobs', to='core.areaatuacao', verbose_name='Tipos de serviço (normalizado)'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='areas',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='promotores', to='core.areaatuacao', verbose_name='Áreas de atuação (normalizado)'),
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
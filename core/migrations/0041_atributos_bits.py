@@ -0,0 +1,96 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:15
+
+from django.db import migrations, models
+
+
+# Cópia das regras de core.atributos no momento da migração
+LARGURA = 12
+DIMENSOES = (
+    ('genero', 'generos_aceitos', 'generos_bits',
+     ['feminino', 'masculino', 'nao_binario', 'outros', 'prefiro_nao_dizer']),
+    ('etnia', 'etnias_aceitas', 'etnias_bits',
+     ['branca', 'preta', 'parda', 'amarela', 'indigena', 'outra']),
+    ('olhos', 'olhos_aceitos', 'olhos_bits',
+     ['castanho_escuro', 'castanho_claro', 'azul', 'verde', 'mel', 'preto', 'heterocromia']),
+    ('cabelo_tipo', 'cabelo_tipos_aceitos', 'cabelo_tipos_bits',
+     ['liso', 'ondulado', 'cacheado', 'crespo', 'black_power', 'dread', 'trancas']),
+    ('cabelo_comprimento', 'cabelo_comprimentos_aceitos', 'cabelo_comprimentos_bits',
+     ['curto', 'medio', 'longo', 'careca']),
+)
+BITS = {
+    campo: {valor: 1 << (indice * LARGURA + i) for i, valor in enumerate(valores)}
+    for indice, (campo, _aceitos, _bits, valores) in enumerate(DIMENSOES)
+}
+SEM_VALOR_VALIDO = 1 << (len(DIMENSOES) * LARGURA)
+
+
+def forwards(apps, schema_editor):
+    UserProfile = apps.get_model('core', 'UserProfile')
+    Job = apps.get_model('core', 'Job')
+
+    # Perfis: um UPDATE por combinação distinta dos cinco atributos
+    campos = [campo for campo, _a, _b, _v in DIMENSOES]
+    for combinacao in UserProfile.objects.values_list(*campos).distinct().order_by():
+        bits = 0
+        filtro = {}
+        for campo, valor in zip(campos, combinacao):
+            bits |= BITS[campo].get(valor or '', 0)
+            filtro[campo if valor is not None else f'{campo}__isnull'] = valor if valor is not None else True
+        if bits:
+            UserProfile.objects.filter(**filtro).update(atributos_bits=bits)
+
+    for job in Job.objects.all().iterator():
+        atualizar = {}
+        for campo, aceitos, campo_bits, _valores in DIMENSOES:
+            valores = {p.strip() for p in (getattr(job, aceitos) or '').replace('\n', ',').split(',') if p.strip()}
+            mascara = 0
+            for valor in valores:
+                mascara |= BITS[campo].get(valor, 0)
+            atualizar[campo_bits] = mascara if (mascara or not valores) else SEM_VALOR_VALIDO
+        Job.objects.filter(pk=job.pk).update(**atualizar)
+
+
+def backwards(apps, schema_editor):
+    # As colunas são removidas pelas operações de campo
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0040_areaatuacao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='cabelo_comprimentos_bits',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Comprimentos de cabelo aceitos (bits)'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='cabelo_tipos_bits',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Tipos de cabelo aceitos (bits)'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='etnias_bits',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Etnias aceitas (bits)'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='generos_bits',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Gêneros aceitos (bits)'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='olhos_bits',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Olhos aceitos (bits)'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='atributos_bits',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, verbose_name='Atributos (bits)'),
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:19
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+def forwards(apps, schema_editor):
+    UserProfile = apps.get_model('core', 'UserProfile')
+    Avaliacao = apps.get_model('core', 'Avaliacao')
+    Candidatura = apps.get_model('core', 'Candidatura')
+
+    notas = Avaliacao.objects.values('promotor').annotate(soma=Sum('nota'), total=Count('id'), media=Avg('nota')).order_by()
+    for linha in notas.iterator():
+        UserProfile.objects.filter(pk=linha['promotor']).update(
+            soma_notas=linha['soma'], total_avaliacoes=linha['total'], nota_media=float(linha['media']),
+        )
+
+    jobs = Candidatura.objects.filter(status='aprovado').values('modelo').annotate(total=Count('id')).order_by()
+    for linha in jobs.iterator():
+        UserProfile.objects.filter(pk=linha['modelo']).update(total_jobs_aprovados=linha['total'])
+
+
+def backwards(apps, schema_editor):
+    # As colunas são removidas pelas operações de campo
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0041_atributos_bits'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='nota_media',
+            field=models.FloatField(db_index=True, default=0, editable=False, verbose_name='Nota média'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='soma_notas',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Soma das notas'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='total_avaliacoes',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Avaliações'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='total_jobs_aprovados',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Jobs aprovados'),
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0042_reputacao_desnormalizada'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['status', '-nota_media', '-total_avaliacoes'], name='perfil_status_nota_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['status', '-total_jobs_aprovados', '-nota_media'], name='perfil_status_jobs_idx'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:23
+
+from django.db import migrations, models
+import re
+from decimal import Decimal
+
+
+# Cópia de core.texto.numero no momento da migração
+_NUMERO_RE = re.compile(r'\d+(?:[.,]\d+)?')
+
+
+def _numero(texto, maximo=99):
+    achado = _NUMERO_RE.search(str(texto or ''))
+    if not achado:
+        return None
+    valor = Decimal(achado.group().replace(',', '.'))
+    return valor if valor <= maximo else None
+
+
+def forwards(apps, schema_editor):
+    UserProfile = apps.get_model('core', 'UserProfile')
+    # Um UPDATE por texto distinto (poucos valores de calçado/manequim)
+    for calcado in UserProfile.objects.exclude(calcado__isnull=True).values_list('calcado', flat=True).distinct().order_by():
+        valor = _numero(calcado)
+        if valor is not None:
+            UserProfile.objects.filter(calcado=calcado).update(calcado_num=valor)
+    for manequim in UserProfile.objects.exclude(manequim__isnull=True).values_list('manequim', flat=True).distinct().order_by():
+        valor = _numero(manequim)
+        if valor is not None:
+            UserProfile.objects.filter(manequim=manequim).update(manequim_num=int(valor))
+
+
+def backwards(apps, schema_editor):
+    # As colunas são removidas pelas operações de campo
+    return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0043_indices_reputacao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='calcado_num',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=4, null=True, verbose_name='Calçado (número)'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='manequim_num',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Manequim (número)'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['status', 'altura'], name='perfil_status_altura_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['status', 'peso'], name='perfil_status_peso_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['status', 'calcado_num'], name='perfil_status_calcado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['status', 'manequim_num'], name='perfil_status_manequim_idx'),
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0044_medidas_numericas'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['status', 'genero'], name='perfil_status_genero_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['status', 'data_nascimento'], name='perfil_status_nasc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['status', 'estado', 'cidade'], name='perfil_status_local_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['status', 'criado_em'], name='perfil_status_criado_idx'),
+        ),
+    ]
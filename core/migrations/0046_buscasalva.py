@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0045_indices_filtros_admin'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BuscaSalva',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=80, verbose_name='Nome')),
+                ('querystring', models.TextField(verbose_name='Filtros (querystring)')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('resultado_ids', models.JSONField(blank=True, editable=False, null=True, verbose_name='Resultado (ids)')),
+                ('total', models.PositiveIntegerField(default=0, editable=False, verbose_name='Promotores')),
+                ('calculado_em', models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Calculado em')),
+                ('criado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='buscas_salvas', to=settings.AUTH_USER_MODEL, verbose_name='Criado por')),
+            ],
+            options={
+                'verbose_name': 'Busca salva',
+                'verbose_name_plural': 'Buscas salvas',
+                'ordering': ('nome', 'id'),
+            },
+        ),
+    ]
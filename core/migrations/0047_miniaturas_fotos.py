@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0046_buscasalva'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='miniaturas',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Miniaturas'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def preencher_palavras(apps, schema_editor):
+    UserProfile = apps.get_model('core', 'UserProfile')
+    PalavraBusca = apps.get_model('core', 'PalavraBusca')
+    lote = []
+    for perfil_id, busca in UserProfile.objects.values_list('id', 'busca').iterator(chunk_size=1000):
+        lote.extend(PalavraBusca(perfil_id=perfil_id, palavra=p) for p in set((busca or '').split()))
+        if len(lote) >= 1000:
+            PalavraBusca.objects.bulk_create(lote, ignore_conflicts=True)
+            lote = []
+    if lote:
+        PalavraBusca.objects.bulk_create(lote, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0048_configuracao_site_atualizado_em'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PalavraBusca',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('palavra', models.CharField(max_length=120)),
+                ('perfil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='palavras_busca', to='core.userprofile')),
+            ],
+            options={
+                'verbose_name': 'Palavra de busca',
+                'verbose_name_plural': 'Palavras de busca',
+                'indexes': [models.Index(fields=['palavra', 'perfil'], name='palavra_busca_palavra_idx')],
+                'constraints': [models.UniqueConstraint(fields=('perfil', 'palavra'), name='palavra_busca_perfil_palavra_uniq')],
+            },
+        ),
+        migrations.RunPython(preencher_palavras, migrations.RunPython.noop),
+    ]
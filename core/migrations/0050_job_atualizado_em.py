@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0049_palavrabusca'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='atualizado_em',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Atualizado em'),
+        ),
+    ]
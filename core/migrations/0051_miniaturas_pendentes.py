@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:49
+
+from django.db import migrations, models
+
+
+def marcar_pendentes(apps, schema_editor):
+    # Fotos sem as versões geradas (ou geradas de outro upload) entram na fila
+    UserProfile = apps.get_model('core', 'UserProfile')
+    ids = []
+    for perfil in UserProfile.objects.only('id', 'foto_rosto', 'foto_corpo', 'miniaturas').iterator(chunk_size=1000):
+        miniaturas = perfil.miniaturas or {}
+        for campo in ('foto_rosto', 'foto_corpo'):
+            nome = getattr(perfil, campo).name or ''
+            if nome != ((miniaturas.get(campo) or {}).get('origem') or ''):
+                ids.append(perfil.pk)
+                break
+    for inicio in range(0, len(ids), 500):
+        UserProfile.objects.filter(pk__in=ids[inicio:inicio + 500]).update(miniaturas_pendentes=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0050_job_atualizado_em'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='miniaturas_pendentes',
+            field=models.BooleanField(db_index=True, default=False, editable=False, verbose_name='Miniaturas pendentes'),
+        ),
+        migrations.RunPython(marcar_pendentes, migrations.RunPython.noop),
+    ]
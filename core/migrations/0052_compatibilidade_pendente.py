@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-18 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0051_miniaturas_pendentes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='compatibilidade_pendente',
+            field=models.BooleanField(db_index=True, default=False, editable=False, verbose_name='Compatibilidade pendente'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='compatibilidade_pendente',
+            field=models.BooleanField(db_index=True, default=False, editable=False, verbose_name='Compatibilidade pendente'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.9 on 2026-10-18 17:20
+
+import re
+from collections import defaultdict
+
+from django.db import migrations
+
+
+def _slugs(raw, validos, por_rotulo):
+    # Cópia de core.matching.parse_areas nesta data: termos desconhecidos e
+    # o texto de "Outros: ..." não viram área
+    raw = (raw or '').strip()
+    if not raw:
+        return set()
+    raw = re.split(r'\boutros\s*:', raw, maxsplit=1, flags=re.IGNORECASE)[0]
+    out = set()
+    for part in (p.strip() for p in re.split(r'[,;|]+', raw)):
+        if not part:
+            continue
+        slug = part if part in validos else por_rotulo.get(part.casefold())
+        if slug:
+            out.add(slug)
+    return out
+
+
+def ressincronizar_perfis(apps, schema_editor):
+    AreaAtuacao = apps.get_model('core', 'AreaAtuacao')
+    UserProfile = apps.get_model('core', 'UserProfile')
+    Through = UserProfile.areas.through
+
+    ids = dict(AreaAtuacao.objects.values_list('slug', 'id'))
+    por_rotulo = {nome.casefold(): slug for slug, nome in AreaAtuacao.objects.values_list('slug', 'nome')}
+    atuais = defaultdict(set)
+    for perfil_id, area_id in Through.objects.values_list('userprofile_id', 'areaatuacao_id').iterator(chunk_size=2000):
+        atuais[perfil_id].add(area_id)
+
+    remover = []
+    criar = []
+    for perfil_id, texto in UserProfile.objects.values_list('id', 'areas_atuacao').iterator(chunk_size=2000):
+        desejadas = {ids[slug] for slug in _slugs(texto, ids, por_rotulo) if slug in ids}
+        existentes = atuais.get(perfil_id, set())
+        remover.extend((perfil_id, area_id) for area_id in existentes - desejadas)
+        criar.extend(Through(userprofile_id=perfil_id, areaatuacao_id=area_id) for area_id in desejadas - existentes)
+
+    for perfil_id, area_id in remover:
+        Through.objects.filter(userprofile_id=perfil_id, areaatuacao_id=area_id).delete()
+    Through.objects.bulk_create(criar, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0052_compatibilidade_pendente'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='job',
+            name='areas',
+        ),
+        migrations.RunPython(ressincronizar_perfis, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.9 on 2026-10-18 17:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copiar_resultados(apps, schema_editor):
+    # resultado_ids (lista JSON) -> linhas; ids de perfis já excluídos ficam de fora
+    BuscaSalva = apps.get_model('core', 'BuscaSalva')
+    ResultadoBuscaSalva = apps.get_model('core', 'ResultadoBuscaSalva')
+    UserProfile = apps.get_model('core', 'UserProfile')
+    for busca in BuscaSalva.objects.all():
+        if busca.resultado_ids is None:
+            BuscaSalva.objects.filter(pk=busca.pk).update(calculado_em=None)
+            continue
+        ids = set(busca.resultado_ids)
+        existentes = []
+        lista = sorted(ids)
+        for inicio in range(0, len(lista), 500):
+            existentes += UserProfile.objects.filter(pk__in=lista[inicio:inicio + 500]).values_list('pk', flat=True)
+        ResultadoBuscaSalva.objects.bulk_create(
+            [ResultadoBuscaSalva(busca_id=busca.pk, perfil_id=perfil_id) for perfil_id in existentes],
+            batch_size=2000,
+        )
+        BuscaSalva.objects.filter(pk=busca.pk).update(total=len(existentes))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0053_job_sem_areas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultadoBuscaSalva',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('busca', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resultados', to='core.buscasalva')),
+                ('perfil', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.userprofile')),
+            ],
+            options={
+                'verbose_name': 'Resultado de busca salva',
+                'verbose_name_plural': 'Resultados de buscas salvas',
+                'constraints': [models.UniqueConstraint(fields=('busca', 'perfil'), name='resultado_busca_perfil_uniq')],
+            },
+        ),
+        migrations.RunPython(copiar_resultados, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='buscasalva',
+            name='resultado_ids',
+        ),
+    ]
@@ -0,0 +1,147 @@
+"""
+Miniaturas WebP das fotos do promotor (foto_rosto / foto_corpo).
+
+Cada foto ganha três versões WebP com o maior lado limitado a
+TAMANHOS[...] px, gravadas no mesmo storage do campo. As chaves ficam em
+UserProfile.miniaturas junto com o nome do upload de origem; uma foto nova
+(origem diferente) gera versões novas e apaga as antigas.
+
+A geração não roda na requisição do upload: o save() marca
+UserProfile.miniaturas_pendentes e ``manage.py miniaturas_worker`` drena a
+fila (processar_pendentes). Falhas vão para o log; `manage.py
+gerar_miniaturas` refaz o que faltar na base inteira.
+
+Listagens usam url_miniatura/srcset e o navegador escolhe a versão pelo
+tamanho exibido; sem miniatura (ainda não gerada ou falha), cai na foto
+original.
+"""
+
+import hashlib
+import logging
+from collections import Counter
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db.models import Q
+from PIL import Image, ImageOps
+
+from .models import UserProfile
+
+
+logger = logging.getLogger(__name__)
+
+CAMPOS = ('foto_rosto', 'foto_corpo')
+# sigla -> maior lado em px
+TAMANHOS = {'p': 96, 'm': 400, 'g': 1080}
+QUALIDADE_WEBP = 80
+PASTA = 'modelos/miniaturas'
+
+
+def _chave(perfil_id: int, campo: str, origem: str, tamanho: str) -> str:
+    resumo = hashlib.sha1(origem.encode()).hexdigest()[:10]
+    return f'{PASTA}/{campo}/{perfil_id}_{resumo}_{tamanho}.webp'
+
+
+def _gerar(arquivo, perfil_id: int, campo: str) -> dict:
+    storage = arquivo.storage
+    with arquivo.open('rb') as f:
+        imagem = ImageOps.exif_transpose(Image.open(f))
+        imagem.load()
+    if imagem.mode not in ('RGB', 'RGBA'):
+        imagem = imagem.convert('RGBA' if 'transparency' in imagem.info else 'RGB')
+
+    versoes = {'origem': arquivo.name}
+    for tamanho, lado in TAMANHOS.items():
+        copia = imagem.copy()
+        copia.thumbnail((lado, lado), Image.Resampling.LANCZOS)
+        saida = BytesIO()
+        copia.save(saida, format='WEBP', quality=QUALIDADE_WEBP, method=4)
+        versoes[tamanho] = storage.save(_chave(perfil_id, campo, arquivo.name, tamanho), ContentFile(saida.getvalue()))
+    return versoes
+
+
+def _apagar(storage, versoes: dict) -> None:
+    for tamanho in TAMANHOS:
+        chave = versoes.get(tamanho)
+        if not chave:
+            continue
+        try:
+            storage.delete(chave)
+        except Exception:
+            pass
+
+
+def atualizar_miniaturas(perfil, refazer: bool = False) -> bool:
+    """Gera as versões que faltam (ou todas, com refazer). Retorna se mudou algo."""
+    atuais = dict(perfil.miniaturas or {})
+    novas = {}
+    for campo in CAMPOS:
+        arquivo = getattr(perfil, campo)
+        anteriores = atuais.get(campo) or {}
+        if not arquivo:
+            if anteriores:
+                _apagar(arquivo.storage, anteriores)
+            continue
+        if not refazer and anteriores.get('origem') == arquivo.name and all(anteriores.get(t) for t in TAMANHOS):
+            novas[campo] = anteriores
+            continue
+        novas[campo] = _gerar(arquivo, perfil.pk, campo)
+        if anteriores:
+            _apagar(arquivo.storage, {t: c for t, c in anteriores.items() if c != novas[campo].get(t)})
+
+    if novas == atuais:
+        return False
+    perfil.miniaturas = novas
+    UserProfile.objects.filter(pk=perfil.pk).update(miniaturas=novas)
+    return True
+
+
+def processar_pendentes(limite: int | None = None) -> Counter:
+    """Gera as miniaturas dos perfis marcados e tira a marca. Retorna a contagem."""
+    qs = (
+        UserProfile.objects
+        .filter(miniaturas_pendentes=True)
+        .only('id', *CAMPOS, 'miniaturas')
+        .order_by('pk')
+    )
+    if limite:
+        qs = qs[:limite]
+
+    contagem = Counter()
+    for perfil in list(qs):
+        try:
+            atualizar_miniaturas(perfil)
+            contagem['ok'] += 1
+        except Exception:
+            # Sem retentativa automática: a listagem usa a foto original e
+            # `gerar_miniaturas` refaz o que faltar
+            logger.exception('Falha ao gerar miniaturas do perfil %s', perfil.pk)
+            contagem['falhou'] += 1
+        # Só desmarca se a foto não mudou enquanto processava
+        mesmas_fotos = Q()
+        for campo in CAMPOS:
+            nome = getattr(perfil, campo).name
+            mesmas_fotos &= Q(**{campo: nome}) if nome else Q(**{f'{campo}__isnull': True}) | Q(**{campo: ''})
+        UserProfile.objects.filter(mesmas_fotos, pk=perfil.pk, miniaturas_pendentes=True).update(miniaturas_pendentes=False)
+    return contagem
+
+
+def url_miniatura(miniaturas: dict | None, campo: str, tamanho: str, arquivo=None) -> str | None:
+    """URL da versão ``tamanho`` (p/m/g); sem ela, a URL da foto original."""
+    storage = UserProfile._meta.get_field(campo).storage
+    versoes = (miniaturas or {}).get(campo) or {}
+    if versoes.get(tamanho):
+        return storage.url(versoes[tamanho])
+    nome = getattr(arquivo, 'name', arquivo)
+    return storage.url(nome) if nome else None
+
+
+def srcset(miniaturas: dict | None, campo: str) -> str:
+    """Atributo srcset ("url 96w, url 400w, url 1080w"); vazio sem miniaturas."""
+    storage = UserProfile._meta.get_field(campo).storage
+    versoes = (miniaturas or {}).get(campo) or {}
+    return ', '.join(
+        f'{storage.url(versoes[tamanho])} {lado}w'
+        for tamanho, lado in TAMANHOS.items()
+        if versoes.get(tamanho)
+    )
@@ -1,14 +1,16 @@
 import uuid
 import re
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.core.mail import send_mail
 from django.conf import settings
-from django.db.models import Avg
 from django.utils import timezone
 from datetime import timedelta
 
+from .geo import geohash_encode
+from .texto import normalizar, numero
+
 
 class CpfBanido(models.Model):
     cpf = models.CharField(max_length=14, unique=True, verbose_name="CPF (banido)")
@@ -257,6 +259,28 @@ class OrcamentoItem(models.Model):
             self.total = Decimal('0.00')
         super().save(*args, **kwargs)
 
+
+class AreaAtuacao(models.Model):
+    """Área de atuação / tipo de serviço (uma linha por opção do cadastro).
+
+    Espelha UserProfile.AREAS_ATUACAO_CHOICES. O texto areas_atuacao
+    continua sendo o que os formulários gravam; a relação UserProfile.areas
+    é mantida a partir dele (core.areas) e é o que os filtros consultam.
+    Vagas comparam Job.tipo_servico direto no matching (core.matching).
+    """
+    slug = models.SlugField(max_length=30, unique=True, verbose_name="Código")
+    nome = models.CharField(max_length=60, verbose_name="Nome")
+    ordem = models.PositiveSmallIntegerField(default=0, verbose_name="Ordem")
+
+    class Meta:
+        verbose_name = "Área de atuação"
+        verbose_name_plural = "Áreas de atuação"
+        ordering = ['ordem', 'nome']
+
+    def __str__(self):
+        return self.nome
+
+
 # ==============================================================================
 # 1. PERFIL DO PROMOTOR (BASE DE TALENTOS)
 # ==============================================================================
@@ -275,6 +299,8 @@ class UserProfile(models.Model):
 
     # --- 1. DADOS DE ACESSO E DOCUMENTOS ---
     nome_completo = models.CharField(max_length=100, verbose_name="Nome Completo")
+    # Nome sem acentos/pontuação, em minúsculas (busca do seletor de promotores). Mantido no save().
+    busca = models.CharField(max_length=120, blank=True, default='', db_index=True, editable=False, verbose_name="Busca")
     
     instagram = models.CharField(
         max_length=50, blank=True, null=True, 
@@ -346,6 +372,8 @@ class UserProfile(models.Model):
     # Coordenadas (para distância até trabalhos). Preenchimento best-effort via geocoding.
     latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Latitude")
     longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Longitude")
+    # Geohash das coordenadas (índice espacial para busca por raio). Mantido no save().
+    geohash = models.CharField(max_length=12, blank=True, null=True, db_index=True, editable=False, verbose_name="Geohash")
     
     # --- 5. MEDIDAS E APARÊNCIA ---
     altura = models.DecimalField(max_digits=3, decimal_places=2, help_text="Ex: 1.70", null=True, blank=True, verbose_name="Altura (m)")
@@ -353,6 +381,9 @@ class UserProfile(models.Model):
     
     manequim = models.CharField(max_length=10, blank=True, null=True, verbose_name="Manequim")
     calcado = models.CharField(max_length=10, blank=True, null=True, verbose_name="Calçado")
+    # Cópias numéricas (preenchidas no save) para filtros por faixa indexados
+    manequim_num = models.PositiveSmallIntegerField(blank=True, null=True, editable=False, verbose_name="Manequim (número)")
+    calcado_num = models.DecimalField(max_digits=4, decimal_places=1, blank=True, null=True, editable=False, verbose_name="Calçado (número)")
     
     TAMANHO_CAMISETA = [('PP','PP'), ('P','P'), ('M','M'), ('G','G'), ('GG','GG'), ('XG','XG')]
     tamanho_camiseta = models.CharField(max_length=5, choices=TAMANHO_CAMISETA, blank=True, null=True, verbose_name="Tamanho de Camiseta")
@@ -386,6 +417,15 @@ class UserProfile(models.Model):
         ('careca', 'Careca/Raspado'),
     ]
     cabelo_comprimento = models.CharField(max_length=20, choices=CABELO_TAM_CHOICES, blank=True, null=True, verbose_name="Comprimento do Cabelo")
+    # Gênero/etnia/olhos/cabelo em bits (core.atributos), para casar com os requisitos dos jobs
+    atributos_bits = models.BigIntegerField(default=0, db_index=True, editable=False, verbose_name="Atributos (bits)")
+
+    # Reputação desnormalizada (core.reputacao): atualizada com F() pelas
+    # gravações de Avaliacao/Candidatura; `manage.py reconstruir_reputacao` recalcula
+    nota_media = models.FloatField(default=0, db_index=True, editable=False, verbose_name="Nota média")
+    soma_notas = models.PositiveIntegerField(default=0, editable=False, verbose_name="Soma das notas")
+    total_avaliacoes = models.PositiveIntegerField(default=0, editable=False, verbose_name="Avaliações")
+    total_jobs_aprovados = models.PositiveIntegerField(default=0, db_index=True, editable=False, verbose_name="Jobs aprovados")
 
     # --- 6. PROFISSIONAL ---
     EXPERIENCIA_CHOICES = [
@@ -413,6 +453,13 @@ class UserProfile(models.Model):
     ]
 
     areas_atuacao = models.TextField(blank=True, null=True, verbose_name="Áreas de Interesse")
+    areas = models.ManyToManyField(
+        AreaAtuacao,
+        blank=True,
+        editable=False,
+        related_name='promotores',
+        verbose_name="Áreas de atuação (normalizado)",
+    )
     
     DISPONIBILIDADE_CHOICES = [
         ('total', 'Todos os dias (Incluindo Finais de Semana)'),
@@ -437,6 +484,13 @@ class UserProfile(models.Model):
     # --- 8. FOTOS & STATUS CRM ---
     foto_rosto = models.ImageField(upload_to='modelos/rosto/', blank=True, null=True, verbose_name="Foto de Rosto")
     foto_corpo = models.ImageField(upload_to='modelos/corpo/', blank=True, null=True, verbose_name="Foto de Corpo")
+    # Versões WebP reduzidas das fotos (core.miniaturas), geradas após o upload:
+    # {"foto_rosto": {"origem": <nome do upload>, "p": <chave>, "m": ..., "g": ...}, ...}
+    miniaturas = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Miniaturas")
+    # Foto nova/removida aguardando `manage.py miniaturas_worker` (marcado no save())
+    miniaturas_pendentes = models.BooleanField(default=False, db_index=True, editable=False, verbose_name="Miniaturas pendentes")
+    # Requisitos/status mudaram: CompatibilidadeJob aguarda `manage.py compatibilidade_worker`
+    compatibilidade_pendente = models.BooleanField(default=False, db_index=True, editable=False, verbose_name="Compatibilidade pendente")
 
     STATUS_CHOICES = [
         ('pendente', '🟡 Pendente (Em Análise)'),
@@ -469,20 +523,42 @@ class UserProfile(models.Model):
     class Meta:
         verbose_name = "Promotor / Talento"
         verbose_name_plural = "📂 Base de Promotores"
+        indexes = [
+            # A Base de Promotores sempre filtra por status (changelist_view força
+            # status__exact); `manage.py explicar_filtros_admin` confere os planos
+            models.Index(fields=['status', 'genero'], name='perfil_status_genero_idx'),
+            models.Index(fields=['status', 'data_nascimento'], name='perfil_status_nasc_idx'),
+            models.Index(fields=['status', 'estado', 'cidade'], name='perfil_status_local_idx'),
+            models.Index(fields=['status', 'criado_em'], name='perfil_status_criado_idx'),
+            # "Melhor avaliados" / "mais trabalhos" dentro da aba de status
+            models.Index(fields=['status', '-nota_media', '-total_avaliacoes'], name='perfil_status_nota_idx'),
+            models.Index(fields=['status', '-total_jobs_aprovados', '-nota_media'], name='perfil_status_jobs_idx'),
+            # Faixas físicas do modal (altura/peso/calçado/manequim)
+            models.Index(fields=['status', 'altura'], name='perfil_status_altura_idx'),
+            models.Index(fields=['status', 'peso'], name='perfil_status_peso_idx'),
+            models.Index(fields=['status', 'calcado_num'], name='perfil_status_calcado_idx'),
+            models.Index(fields=['status', 'manequim_num'], name='perfil_status_manequim_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nome_completo} ({self.get_status_display()})"
 
     # --- MÉTODOS AUXILIARES ---
-    def nota_media(self):
-        media = self.avaliacoes.aggregate(Avg('nota'))['nota__avg']
-        return round(media, 1) if media else 0
-
-    def total_jobs(self):
-        return self.candidatura_set.filter(status='aprovado').count()
+    def endereco_geocodificacao(self) -> str:
+        parts = [
+            (self.endereco or '').strip(),
+            (self.numero or '').strip(),
+            (self.bairro or '').strip(),
+            (self.cidade or '').strip(),
+            (self.estado or '').strip(),
+            (self.cep or '').strip(),
+        ]
+        parts = [p for p in parts if p]
+        return ', '.join(parts + ['Brasil']) if parts else ''
 
     # --- AUTOMAÇÃO DE E-MAIL AO SALVAR ---
     def save(self, *args, **kwargs):
+        antigo = None
         if self.pk:
             try:
                 antigo = UserProfile.objects.get(pk=self.pk)
@@ -494,31 +570,79 @@ class UserProfile(models.Model):
                     )
             except Exception: pass
 
-        # Geocoding (best-effort): tenta preencher lat/lng quando estiverem vazios.
-        # Mantém silencioso para não quebrar o fluxo caso o serviço externo falhe.
-        if (self.latitude is None or self.longitude is None) and any([self.endereco, self.bairro, self.cidade, self.estado, self.cep]):
-            try:
-                from geopy.geocoders import Nominatim
-
-                parts = [
-                    (self.endereco or '').strip(),
-                    (self.numero or '').strip(),
-                    (self.bairro or '').strip(),
-                    (self.cidade or '').strip(),
-                    (self.estado or '').strip(),
-                    (self.cep or '').strip(),
-                    'Brasil',
-                ]
-                query = ', '.join([p for p in parts if p])
-                if query:
-                    geolocator = Nominatim(user_agent='casting-certo')
-                    location = geolocator.geocode(query, timeout=5)
-                    if location:
-                        self.latitude = round(float(location.latitude), 6)
-                        self.longitude = round(float(location.longitude), 6)
-            except Exception:
-                pass
-        super().save(*args, **kwargs)
+        # Reputação e miniaturas só mudam por UPDATE (F() / geração em segundo
+        # plano): não regrava valores que esta instância tenha lido antes
+        if antigo is not None:
+            from .reputacao import CAMPOS
+            for campo in (*CAMPOS, 'miniaturas', 'miniaturas_pendentes', 'compatibilidade_pendente'):
+                setattr(self, campo, getattr(antigo, campo))
+
+        # Índice de compatibilidade: só quando muda algo que o cálculo lê
+        from .compatibilidade import CAMPOS_PERFIL_REINDEXACAO
+        if antigo is None or any(getattr(antigo, c) != getattr(self, c) for c in CAMPOS_PERFIL_REINDEXACAO):
+            self.compatibilidade_pendente = True
+
+        # Foto enviada, trocada ou removida: miniaturas ficam para o worker
+        if antigo is None:
+            fotos_alteradas = bool(self.foto_rosto or self.foto_corpo)
+        else:
+            fotos_alteradas = any(
+                (getattr(antigo, campo).name or '') != (getattr(self, campo).name or '')
+                for campo in ('foto_rosto', 'foto_corpo')
+            )
+        if fotos_alteradas:
+            self.miniaturas_pendentes = True
+
+        self.busca = normalizar(self.nome_completo)
+        manequim = numero(self.manequim, maximo=99)
+        self.manequim_num = int(manequim) if manequim is not None else None
+        self.calcado_num = numero(self.calcado, maximo=99)
+
+        from .atributos import mascara_perfil
+        self.atributos_bits = mascara_perfil(self)
+
+        # Geocoding: feito fora da requisição pela fila (GeocodificacaoPendente,
+        # enfileirada no post_save e drenada por `manage.py geocode_worker`).
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geohash_encode(self.latitude, self.longitude)
+        else:
+            self.geohash = None
+
+        # Campos alterados neste save, para os signals (None = perfil novo)
+        self._campos_alterados = None if antigo is None else {
+            campo.name for campo in self._meta.concrete_fields
+            if getattr(antigo, campo.attname) != getattr(self, campo.attname)
+        }
+
+        # Contadores demográficos do dashboard: atualizados na mesma transação
+        from .contadores import atualizar_contadores_perfil
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            atualizar_contadores_perfil(antigo, self)
+
+class PalavraBusca(models.Model):
+    """Uma linha por palavra de UserProfile.busca (nome normalizado).
+
+    "Alguma palavra do nome começa com X" vira uma faixa sobre o índice de
+    ``palavra`` em qualquer banco, sem LIKE '%...%'. Mantida no post_save
+    do perfil (core.busca.sincronizar_palavras).
+    """
+    perfil = models.ForeignKey(UserProfile, related_name='palavras_busca', on_delete=models.CASCADE)
+    palavra = models.CharField(max_length=120)
+
+    class Meta:
+        verbose_name = "Palavra de busca"
+        verbose_name_plural = "Palavras de busca"
+        constraints = [
+            models.UniqueConstraint(fields=['perfil', 'palavra'], name='palavra_busca_perfil_palavra_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['palavra', 'perfil'], name='palavra_busca_palavra_idx'),
+        ]
+
+    def __str__(self):
+        return self.palavra
+
 
 # ==============================================================================
 # 2. OUTROS MODELOS DO SISTEMA
@@ -530,6 +654,15 @@ class Avaliacao(models.Model):
     comentario = models.TextField()
     data = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        antiga = None
+        if self.pk:
+            antiga = Avaliacao.objects.filter(pk=self.pk).values('promotor_id', 'nota').first()
+        from .reputacao import avaliacao_alterada
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            avaliacao_alterada(antiga, {'promotor_id': self.promotor_id, 'nota': self.nota})
+
 class Pergunta(models.Model):
     texto = models.CharField(max_length=200)
     ativa = models.BooleanField(default=True)
@@ -581,6 +714,13 @@ class Job(models.Model):
     cabelo_comprimentos_aceitos = models.TextField(blank=True, null=True, verbose_name="Comprimento do cabelo (aceitos)")
     nivel_ingles_min = models.CharField(max_length=15, blank=True, null=True, choices=UserProfile.NIVEL_IDIOMA, verbose_name="Inglês mínimo")
 
+    # Máscaras dos valores aceitos acima (core.atributos); 0 = sem exigência
+    generos_bits = models.BigIntegerField(default=0, editable=False, verbose_name="Gêneros aceitos (bits)")
+    etnias_bits = models.BigIntegerField(default=0, editable=False, verbose_name="Etnias aceitas (bits)")
+    olhos_bits = models.BigIntegerField(default=0, editable=False, verbose_name="Olhos aceitos (bits)")
+    cabelo_tipos_bits = models.BigIntegerField(default=0, editable=False, verbose_name="Tipos de cabelo aceitos (bits)")
+    cabelo_comprimentos_bits = models.BigIntegerField(default=0, editable=False, verbose_name="Comprimentos de cabelo aceitos (bits)")
+
     # Competências (tags)
     competencias = models.TextField(blank=True, null=True, verbose_name="Competências")
 
@@ -590,7 +730,11 @@ class Job(models.Model):
     geocodificado_em = models.DateTimeField(blank=True, null=True, verbose_name="Geocodificado em")
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='aberto')
+    # Requisitos/status mudaram: CompatibilidadeJob aguarda `manage.py compatibilidade_worker`
+    compatibilidade_pendente = models.BooleanField(default=False, db_index=True, editable=False, verbose_name="Compatibilidade pendente")
     criado_em = models.DateTimeField(auto_now_add=True)
+    # Versão das máscaras das vagas abertas em memória (core.atributos)
+    atualizado_em = models.DateTimeField(auto_now=True, db_index=True, verbose_name="Atualizado em")
 
     class Meta:
         verbose_name = "Trabalho"
@@ -599,6 +743,20 @@ class Job(models.Model):
     def __str__(self):
         return self.titulo
 
+    def save(self, *args, **kwargs):
+        from .atributos import mascaras_job
+        for campo, mascara in mascaras_job(self).items():
+            setattr(self, campo, mascara)
+
+        # Índice de compatibilidade: só quando muda algo que o cálculo lê
+        from .compatibilidade import CAMPOS_JOB_REINDEXACAO
+        antigo = Job.objects.filter(pk=self.pk).values('compatibilidade_pendente', *CAMPOS_JOB_REINDEXACAO).first() if self.pk else None
+        if antigo is None or any(antigo[c] != getattr(self, c) for c in CAMPOS_JOB_REINDEXACAO):
+            self.compatibilidade_pendente = True
+        else:
+            self.compatibilidade_pendente = antigo['compatibilidade_pendente']
+        super().save(*args, **kwargs)
+
     def endereco_formatado(self) -> str:
         parts = [
             (self.endereco or '').strip(),
@@ -610,33 +768,17 @@ class Job(models.Model):
         s = ', '.join([p for p in parts if p])
         return s or (self.local or '').strip()
 
-    def save(self, *args, **kwargs):
-        # Geocoding (best-effort): tenta preencher lat/lng uma vez, quando estiverem vazios.
-        if (self.latitude is None or self.longitude is None) and any([self.endereco, self.bairro, self.cidade, self.estado, self.cep, self.local]):
-            try:
-                from geopy.geocoders import Nominatim
-
-                parts = [
-                    (self.endereco or '').strip() or (self.local or '').strip(),
-                    (self.numero or '').strip(),
-                    (self.bairro or '').strip(),
-                    (self.cidade or '').strip(),
-                    (self.estado or '').strip(),
-                    (self.cep or '').strip(),
-                    'Brasil',
-                ]
-                query = ', '.join([p for p in parts if p])
-                if query:
-                    geolocator = Nominatim(user_agent='casting-certo')
-                    location = geolocator.geocode(query, timeout=5)
-                    if location:
-                        self.latitude = round(float(location.latitude), 6)
-                        self.longitude = round(float(location.longitude), 6)
-                        self.geocodificado_em = timezone.now()
-            except Exception:
-                pass
-
-        super().save(*args, **kwargs)
+    def endereco_geocodificacao(self) -> str:
+        parts = [
+            (self.endereco or '').strip() or (self.local or '').strip(),
+            (self.numero or '').strip(),
+            (self.bairro or '').strip(),
+            (self.cidade or '').strip(),
+            (self.estado or '').strip(),
+            (self.cep or '').strip(),
+        ]
+        parts = [p for p in parts if p]
+        return ', '.join(parts + ['Brasil']) if parts else ''
 
 class JobDia(models.Model):
     job = models.ForeignKey(Job, related_name='dias', on_delete=models.CASCADE)
@@ -655,6 +797,147 @@ class Candidatura(models.Model):
     status = models.CharField(max_length=20, default='pendente')
     data_candidatura = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        antiga = None
+        if self.pk:
+            antiga = Candidatura.objects.filter(pk=self.pk).values('modelo_id', 'status').first()
+        from .reputacao import candidatura_alterada
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            candidatura_alterada(antiga, {'modelo_id': self.modelo_id, 'status': self.status})
+
+
+class CompatibilidadeJob(models.Model):
+    """Índice (job, promotor) com o resultado pré-calculado dos requisitos.
+
+    Mantido por `manage.py compatibilidade_worker` (jobs/perfis marcados no
+    save()) e preenchido sob demanda pelo mural de vagas quando faltar
+    alguma linha.
+    """
+    STATUS_CHOICES = [
+        ('good', 'Atende'),
+        ('almost', 'Atende quase todos'),
+        ('bad', 'Não atende'),
+    ]
+
+    job = models.ForeignKey(Job, related_name='compatibilidades', on_delete=models.CASCADE)
+    perfil = models.ForeignKey(UserProfile, related_name='compatibilidades', on_delete=models.CASCADE)
+    requisitos_atendidos = models.PositiveSmallIntegerField(default=0, verbose_name="Requisitos atendidos")
+    requisitos_total = models.PositiveSmallIntegerField(default=0, verbose_name="Requisitos exigidos")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='good', verbose_name="Compatibilidade")
+    atualizado_em = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Compatibilidade"
+        verbose_name_plural = "Compatibilidades"
+        constraints = [
+            models.UniqueConstraint(fields=['perfil', 'job'], name='compat_perfil_job_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.perfil_id} x {self.job_id}: {self.status}"
+
+
+class GeocodificacaoPendente(models.Model):
+    """Fila de geocoding (um registro por objeto com endereço sem coordenadas).
+
+    Enfileirada pelos signals de UserProfile/Job e processada por
+    ``manage.py geocode_worker`` (core.geocoding), respeitando o limite de
+    1 requisição/s do Nominatim. Falhas de rede são refeitas com backoff;
+    endereços sem resultado só voltam para a fila quando o endereço mudar.
+    """
+    MODELO_CHOICES = [
+        ('userprofile', 'Promotor'),
+        ('job', 'Trabalho'),
+    ]
+    STATUS_CHOICES = [
+        ('pendente', 'Pendente'),
+        ('ok', 'Geocodificado'),
+        ('sem_resultado', 'Sem resultado'),
+        ('falhou', 'Falhou'),
+    ]
+
+    modelo = models.CharField(max_length=20, choices=MODELO_CHOICES, verbose_name="Modelo")
+    objeto_id = models.PositiveBigIntegerField(verbose_name="ID do objeto")
+    endereco = models.CharField(max_length=500, verbose_name="Endereço consultado")
+    cep = models.CharField(max_length=9, blank=True, default='', verbose_name="CEP")
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='pendente', verbose_name="Status")
+    tentativas = models.PositiveSmallIntegerField(default=0, verbose_name="Tentativas")
+    proxima_tentativa = models.DateTimeField(default=timezone.now, verbose_name="Próxima tentativa")
+    ultimo_erro = models.TextField(blank=True, default='', verbose_name="Último erro")
+    criado_em = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+    atualizado_em = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Geocodificação pendente"
+        verbose_name_plural = "Fila de geocodificação"
+        constraints = [
+            models.UniqueConstraint(fields=['modelo', 'objeto_id'], name='geocod_modelo_objeto_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'proxima_tentativa'], name='geocod_fila_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.modelo}#{self.objeto_id}: {self.status}"
+
+
+class ContadorDemografico(models.Model):
+    """Contagem de promotores por (dimensão, valor, status).
+
+    Mantida incrementalmente (core.contadores) pelo save/delete de
+    UserProfile e pelas ações em massa do admin; reconstruída por
+    ``manage.py reconciliar_contadores``. A dimensão 'nascimento' guarda a
+    data (ISO) para que as faixas etárias sejam somadas por intervalo.
+    """
+    dimensao = models.CharField(max_length=20, verbose_name="Dimensão")
+    valor = models.CharField(max_length=50, blank=True, default='', verbose_name="Valor")
+    status = models.CharField(max_length=20, verbose_name="Status do promotor")
+    total = models.IntegerField(default=0, verbose_name="Total")
+
+    class Meta:
+        verbose_name = "Contador demográfico"
+        verbose_name_plural = "Contadores demográficos"
+        constraints = [
+            models.UniqueConstraint(fields=['dimensao', 'valor', 'status'], name='contador_dim_valor_status_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.dimensao}={self.valor} [{self.status}]: {self.total}"
+
+
+class GeocodeCache(models.Model):
+    """Cache persistente de geocoding por endereço normalizado ou por CEP.
+
+    Entradas de endereço guardam o resultado da consulta externa (inclusive
+    "sem resultado", com validade menor). Entradas de CEP guardam o centroide
+    (média) das coordenadas já vistas naquele CEP e servem de fallback.
+    """
+    TIPO_CHOICES = [
+        ('endereco', 'Endereço'),
+        ('cep', 'CEP (centroide)'),
+    ]
+
+    chave = models.CharField(max_length=64, unique=True, verbose_name="Chave")
+    tipo = models.CharField(max_length=10, choices=TIPO_CHOICES, verbose_name="Tipo")
+    descricao = models.CharField(max_length=500, blank=True, default='', verbose_name="Endereço normalizado / CEP")
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Latitude")
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True, verbose_name="Longitude")
+    amostras = models.PositiveIntegerField(default=1, verbose_name="Amostras (centroide)")
+    acertos = models.PositiveIntegerField(default=0, verbose_name="Acertos (hits)")
+    consultas = models.PositiveIntegerField(default=0, verbose_name="Consultas externas (misses)")
+    consultado_em = models.DateTimeField(default=timezone.now, verbose_name="Consultado em")
+    expira_em = models.DateTimeField(verbose_name="Expira em")
+    ultimo_acerto_em = models.DateTimeField(blank=True, null=True, verbose_name="Último acerto")
+
+    class Meta:
+        verbose_name = "Cache de geocodificação"
+        verbose_name_plural = "Cache de geocodificação"
+
+    def __str__(self):
+        return f"{self.tipo}: {self.descricao}"
+
+
 class ConfiguracaoSite(models.Model):
     titulo_site = models.CharField(max_length=100, default="Casting Certo", verbose_name="Nome do Site")
 
@@ -711,6 +994,10 @@ class ConfiguracaoSite(models.Model):
         verbose_name="Texto - Privacidade",
     )
 
+    # Também tocado quando um ContatoSite muda; serve de versão para a cópia
+    # em memória de cada processo (core.site_config)
+    atualizado_em = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
     def __str__(self):
         return "Contatos"
 
@@ -818,3 +1105,51 @@ class PromotorApresentacao(UserProfile):
         proxy = True
         verbose_name = 'Apresentação'
         verbose_name_plural = 'Apresentação'
+
+
+class BuscaSalva(models.Model):
+    """Filtro nomeado da Base de Promotores com o resultado materializado.
+
+    Os perfis que atendem à querystring ficam em ResultadoBuscaSalva; o
+    resultado é mantido pelos signals de UserProfile (core.buscas_salvas) e
+    recalculado por inteiro quando invalidado (calculado_em vazio) ou
+    calculado em outro dia (filtros de idade andam).
+    """
+    nome = models.CharField(max_length=80, verbose_name='Nome')
+    querystring = models.TextField(verbose_name='Filtros (querystring)')
+    criado_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='buscas_salvas',
+        verbose_name='Criado por',
+    )
+    criado_em = models.DateTimeField(auto_now_add=True, verbose_name='Criado em')
+    total = models.PositiveIntegerField(default=0, editable=False, verbose_name='Promotores')
+    calculado_em = models.DateTimeField(blank=True, null=True, editable=False, verbose_name='Calculado em')
+
+    class Meta:
+        verbose_name = 'Busca salva'
+        verbose_name_plural = 'Buscas salvas'
+        ordering = ('nome', 'id')
+
+    def __str__(self):
+        return self.nome
+
+
+class ResultadoBuscaSalva(models.Model):
+    """Um perfil do resultado materializado de uma BuscaSalva.
+
+    Abrir a busca (?busca=<id>) filtra a listagem por uma subconsulta nesta
+    tabela (índice único (busca, perfil)), sem lista de ids na consulta.
+    """
+    busca = models.ForeignKey(BuscaSalva, related_name='resultados', on_delete=models.CASCADE)
+    perfil = models.ForeignKey(UserProfile, related_name='+', on_delete=models.CASCADE)
+
+    class Meta:
+        verbose_name = 'Resultado de busca salva'
+        verbose_name_plural = 'Resultados de buscas salvas'
+        constraints = [
+            models.UniqueConstraint(fields=['busca', 'perfil'], name='resultado_busca_perfil_uniq'),
+        ]
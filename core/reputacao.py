@@ -0,0 +1,126 @@
+"""
+Reputação desnormalizada do promotor (nota média, avaliações, jobs).
+
+UserProfile guarda soma_notas, total_avaliacoes, nota_media e
+total_jobs_aprovados. Cada gravação de Avaliacao/Candidatura aplica a
+diferença (antes x depois) com um UPDATE usando F(), na mesma transação:
+
+- Avaliacao.save / Candidatura.save -> avaliacao_alterada / candidatura_alterada
+- post_delete de Avaliacao/Candidatura (inclui exclusões em massa e em cascata)
+
+reconstruir() recalcula tudo a partir das tabelas de origem.
+
+As colunas são indexadas (com status, ver UserProfile.Meta): ordenar por
+"melhor avaliados"/"mais trabalhos" e filtrar por nota_min/jobs_min não
+precisa de agregação nem subconsulta por linha.
+"""
+
+from collections import Counter
+
+from django.db.models import Avg, Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+
+from .models import Avaliacao, Candidatura, UserProfile
+
+
+CAMPOS = ('nota_media', 'soma_notas', 'total_avaliacoes', 'total_jobs_aprovados')
+
+# ?ordem= -> ordenação (o chamador acrescenta o desempate por id)
+ORDENS = {
+    'nota': ('-nota_media', '-total_avaliacoes'),
+    'jobs': ('-total_jobs_aprovados', '-nota_media'),
+}
+ORDEM_CHOICES = (('nota', 'Melhor avaliados'), ('jobs', 'Mais trabalhos'))
+
+
+def _numero(raw):
+    try:
+        return float(str(raw).replace(',', '.'))
+    except (TypeError, ValueError):
+        return None
+
+
+def filtrar_reputacao(queryset, params):
+    """Aplica ?nota_min= (0 a 5) e ?jobs_min= (jobs aprovados)."""
+    nota_min = _numero(params.get('nota_min'))
+    if nota_min is not None and nota_min > 0:
+        queryset = queryset.filter(nota_media__gte=nota_min)
+    jobs_min = _numero(params.get('jobs_min'))
+    if jobs_min is not None and jobs_min > 0:
+        queryset = queryset.filter(total_jobs_aprovados__gte=jobs_min)
+    return queryset
+
+
+def _aplicar(perfil_id, notas: int = 0, avaliacoes: int = 0, jobs: int = 0) -> None:
+    if not perfil_id or not (notas or avaliacoes or jobs):
+        return
+    soma = F('soma_notas') + notas
+    total = F('total_avaliacoes') + avaliacoes
+    # No UPDATE, as expressões leem os valores da linha antes da alteração
+    UserProfile.objects.filter(pk=perfil_id).update(
+        soma_notas=soma,
+        total_avaliacoes=total,
+        nota_media=Case(
+            When(total_avaliacoes__gt=-avaliacoes, then=Cast(soma, FloatField()) / total),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+        total_jobs_aprovados=F('total_jobs_aprovados') + jobs,
+    )
+
+
+def avaliacao_alterada(antiga, nova) -> None:
+    """antiga/nova: {'promotor_id', 'nota'} ou None (criação/exclusão)."""
+    if antiga and nova and antiga['promotor_id'] == nova['promotor_id']:
+        _aplicar(nova['promotor_id'], notas=nova['nota'] - antiga['nota'])
+        return
+    if antiga:
+        _aplicar(antiga['promotor_id'], notas=-antiga['nota'], avaliacoes=-1)
+    if nova:
+        _aplicar(nova['promotor_id'], notas=nova['nota'], avaliacoes=1)
+
+
+def candidatura_alterada(antiga, nova) -> None:
+    """antiga/nova: {'modelo_id', 'status'} ou None (criação/exclusão)."""
+    deltas = Counter()
+    for candidatura, sinal in ((antiga, -1), (nova, 1)):
+        if candidatura and candidatura['status'] == 'aprovado':
+            deltas[candidatura['modelo_id']] += sinal
+    for perfil_id, delta in deltas.items():
+        _aplicar(perfil_id, jobs=delta)
+
+
+def reconstruir(corrigir: bool = True, lote: int = 1000) -> int:
+    """Recalcula a reputação de todos os perfis. Retorna quantos divergiam."""
+    notas = {
+        linha['promotor']: linha
+        for linha in Avaliacao.objects.values('promotor').annotate(
+            soma=Sum('nota'), total=Count('id'), media=Avg('nota'),
+        ).order_by()
+    }
+    jobs = dict(
+        Candidatura.objects.filter(status='aprovado')
+        .values('modelo').annotate(total=Count('id')).order_by()
+        .values_list('modelo', 'total')
+    )
+
+    divergentes = []
+    for perfil in UserProfile.objects.only('id', *CAMPOS).iterator(chunk_size=lote):
+        linha = notas.get(perfil.pk) or {}
+        real = {
+            'nota_media': float(linha.get('media') or 0),
+            'soma_notas': linha.get('soma') or 0,
+            'total_avaliacoes': linha.get('total') or 0,
+            'total_jobs_aprovados': jobs.get(perfil.pk, 0),
+        }
+        if any(
+            abs(getattr(perfil, campo) - valor) > 1e-9 if campo == 'nota_media' else getattr(perfil, campo) != valor
+            for campo, valor in real.items()
+        ):
+            for campo, valor in real.items():
+                setattr(perfil, campo, valor)
+            divergentes.append(perfil)
+
+    if corrigir:
+        UserProfile.objects.bulk_update(divergentes, list(CAMPOS), batch_size=lote)
+    return len(divergentes)
@@ -0,0 +1,132 @@
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .areas import sincronizar_areas
+from .atributos import invalidar_mascaras_jobs
+from .busca import sincronizar_palavras
+from .buscas_salvas import (
+    atualizar_perfil as atualizar_buscas_salvas,
+    invalidar_por_job as invalidar_buscas_do_job,
+    recontar_totais as recontar_buscas_salvas,
+)
+from .contadores import atualizar_contadores_perfil
+from .dashboard import invalidar_snapshot
+from .geocoding import enfileirar
+from .models import Avaliacao, Candidatura, ConfiguracaoSite, ContatoSite, Job, UserProfile
+from .reputacao import CAMPOS as CAMPOS_REPUTACAO, avaliacao_alterada, candidatura_alterada
+from .site_config import invalidar_site_config
+
+
+logger = logging.getLogger(__name__)
+
+
+def _on_commit_silencioso(func, *args):
+    # Índices derivados não podem quebrar o salvamento principal (a falha
+    # fica no log). Roda na mesma requisição, logo após o commit.
+    def run():
+        try:
+            func(*args)
+        except Exception:
+            logger.exception('Falha em %s após o commit', getattr(func, '__name__', func))
+    transaction.on_commit(run)
+
+
+@receiver(post_save, sender=Job, dispatch_uid='core_job_geocodificacao')
+@receiver(post_save, sender=UserProfile, dispatch_uid='core_perfil_geocodificacao')
+def enfileirar_geocodificacao(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _on_commit_silencioso(enfileirar, instance)
+
+
+@receiver(post_save, sender=UserProfile, dispatch_uid='core_perfil_areas')
+def sincronizar_areas_m2m(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Na mesma transação do save: os filtros por área leem a M2M
+    sincronizar_areas(instance)
+
+
+@receiver(post_save, sender=UserProfile, dispatch_uid='core_perfil_palavras_busca')
+def sincronizar_palavras_busca(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Na mesma transação do save: a busca por nome lê PalavraBusca
+    sincronizar_palavras(instance)
+
+
+@receiver(post_save, sender=Job, dispatch_uid='core_job_mascaras_save')
+@receiver(post_delete, sender=Job, dispatch_uid='core_job_mascaras_delete')
+def invalidar_mascaras(sender, **kwargs):
+    _on_commit_silencioso(invalidar_mascaras_jobs)
+
+
+@receiver(post_delete, sender=UserProfile, dispatch_uid='core_perfil_contadores_delete')
+def perfil_remover_dos_contadores(sender, instance, **kwargs):
+    # Roda dentro da transação do delete (inclui exclusão em massa e em cascata)
+    atualizar_contadores_perfil(instance, None)
+
+
+@receiver(post_delete, sender=Avaliacao, dispatch_uid='core_avaliacao_reputacao_delete')
+def avaliacao_remover_da_reputacao(sender, instance, **kwargs):
+    # Mesma transação do delete (as gravações passam por Avaliacao.save)
+    avaliacao_alterada({'promotor_id': instance.promotor_id, 'nota': instance.nota}, None)
+
+
+@receiver(post_delete, sender=Candidatura, dispatch_uid='core_candidatura_reputacao_delete')
+def candidatura_remover_da_reputacao(sender, instance, **kwargs):
+    candidatura_alterada({'modelo_id': instance.modelo_id, 'status': instance.status}, None)
+
+
+@receiver(post_save, sender=UserProfile, dispatch_uid='core_perfil_buscas_salvas_save')
+def perfil_atualizar_buscas_salvas(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _on_commit_silencioso(atualizar_buscas_salvas, instance.pk, getattr(instance, '_campos_alterados', None))
+
+
+@receiver(post_delete, sender=UserProfile, dispatch_uid='core_perfil_buscas_salvas_delete')
+def perfil_remover_das_buscas_salvas(sender, instance, **kwargs):
+    # As linhas de ResultadoBuscaSalva saem em cascata; só os totais mudam
+    _on_commit_silencioso(recontar_buscas_salvas)
+
+
+@receiver(post_save, sender=Job, dispatch_uid='core_job_buscas_salvas_save')
+def job_invalidar_buscas_salvas(sender, instance, raw=False, **kwargs):
+    # Buscas por raio centradas no job (o centro pode ter mudado)
+    if raw:
+        return
+    _on_commit_silencioso(invalidar_buscas_do_job, instance.pk)
+
+
+@receiver(post_save, sender=Avaliacao, dispatch_uid='core_avaliacao_buscas_salvas_save')
+@receiver(post_delete, sender=Avaliacao, dispatch_uid='core_avaliacao_buscas_salvas_delete')
+@receiver(post_save, sender=Candidatura, dispatch_uid='core_candidatura_buscas_salvas_save')
+@receiver(post_delete, sender=Candidatura, dispatch_uid='core_candidatura_buscas_salvas_delete')
+def reputacao_atualizar_buscas_salvas(sender, instance, raw=False, **kwargs):
+    # Nota/jobs mudam por UPDATE com F() (filtros nota_min/jobs_min)
+    if raw:
+        return
+    perfil_id = instance.promotor_id if sender is Avaliacao else instance.modelo_id
+    _on_commit_silencioso(atualizar_buscas_salvas, perfil_id, set(CAMPOS_REPUTACAO))
+
+
+@receiver(post_save, sender=UserProfile, dispatch_uid='core_perfil_dashboard_save')
+@receiver(post_delete, sender=UserProfile, dispatch_uid='core_perfil_dashboard_delete')
+@receiver(post_save, sender=Job, dispatch_uid='core_job_dashboard_save')
+@receiver(post_delete, sender=Job, dispatch_uid='core_job_dashboard_delete')
+@receiver(post_save, sender=Candidatura, dispatch_uid='core_candidatura_dashboard_save')
+@receiver(post_delete, sender=Candidatura, dispatch_uid='core_candidatura_dashboard_delete')
+def invalidar_dashboard(sender, **kwargs):
+    _on_commit_silencioso(invalidar_snapshot)
+
+
+@receiver(post_save, sender=ConfiguracaoSite, dispatch_uid='core_config_site_save')
+@receiver(post_delete, sender=ConfiguracaoSite, dispatch_uid='core_config_site_delete')
+@receiver(post_save, sender=ContatoSite, dispatch_uid='core_contato_site_save')
+@receiver(post_delete, sender=ContatoSite, dispatch_uid='core_contato_site_delete')
+def invalidar_config_site(sender, **kwargs):
+    _on_commit_silencioso(invalidar_site_config)
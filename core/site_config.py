@@ -0,0 +1,113 @@
+"""
+Cache em processo da configuração do site (ConfiguracaoSite + ContatoSite).
+
+A configuração é um singleton lido em toda renderização (context processor),
+mas raramente alterada. Mantemos uma cópia por processo, validada contra
+ConfiguracaoSite.atualizado_em (uma leitura pela chave primária): todo save
+da configuração troca o valor, os signals de ContatoSite também, e cada
+processo (todos os workers, não só o que salvou) recarrega na próxima
+leitura.
+
+SiteContacts concentra a separação dos contatos por tipo e os atalhos
+(e-mail/WhatsApp principal, @ do Instagram), calculados uma vez por versão
+e usados pelo context processor e pelos PDFs do admin.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.utils import timezone
+
+from .models import ConfiguracaoSite
+
+
+TIPOS_CONTATO = ('email', 'telefone', 'instagram', 'facebook')
+
+
+def instagram_handle(url: str | None) -> str | None:
+    """'@HANDLE' a partir do link do Instagram (ou de um @handle já pronto)."""
+    u = (url or '').strip()
+    if not u:
+        return None
+    u = u.replace('https://', '').replace('http://', '')
+    if 'instagram.com' in u:
+        parts = [p for p in u.split('/') if p]
+        if parts:
+            last = parts[-1]
+            if last.lower() in {'instagram.com', 'www.instagram.com'} and len(parts) >= 2:
+                last = parts[-2]
+            last = last.split('?')[0].strip('@')
+            return f"@{last.upper()}" if last else None
+    # se já vier como @handle
+    if u.startswith('@'):
+        return u.upper()
+    return None
+
+
+@dataclass(frozen=True)
+class SiteContacts:
+    todos: tuple
+    por_tipo: dict          # tipo -> tuple(ContatoSite), para os tipos de TIPOS_CONTATO
+    email_principal: object
+    whatsapp_principal: object
+    instagram_handle: str | None
+
+    @classmethod
+    def montar(cls, config, contatos) -> 'SiteContacts':
+        por_tipo = {tipo: [] for tipo in TIPOS_CONTATO}
+        for c in contatos:
+            if c.tipo in por_tipo:
+                por_tipo[c.tipo].append(c)
+
+        whatsapp = None
+        for c in por_tipo['telefone']:
+            if (c.telefone_tipo or '').strip() in {'whatsapp', 'ambos'}:
+                whatsapp = c
+                break
+
+        return cls(
+            todos=tuple(contatos),
+            por_tipo={tipo: tuple(lista) for tipo, lista in por_tipo.items()},
+            email_principal=por_tipo['email'][0] if por_tipo['email'] else None,
+            whatsapp_principal=whatsapp,
+            instagram_handle=instagram_handle(getattr(config, 'instagram_link', None)),
+        )
+
+
+@dataclass(frozen=True)
+class SiteConfig:
+    versao: datetime | None
+    config: ConfiguracaoSite
+    contatos: SiteContacts
+
+
+_lock = threading.Lock()
+_atual: SiteConfig | None = None
+
+
+def _versao_atual() -> datetime | None:
+    return ConfiguracaoSite.objects.filter(pk=1).values_list('atualizado_em', flat=True).first()
+
+
+def _carregar() -> SiteConfig:
+    config = ConfiguracaoSite.load()
+    return SiteConfig(versao=config.atualizado_em, config=config, contatos=SiteContacts.montar(config, list(config.contatos.all())))
+
+
+def obter_site_config() -> SiteConfig:
+    global _atual
+    versao = _versao_atual()
+    atual = _atual
+    if atual is not None and atual.versao == versao:
+        return atual
+    with _lock:
+        if _atual is None or _atual.versao != versao:
+            _atual = _carregar()
+        return _atual
+
+
+def invalidar_site_config() -> None:
+    global _atual
+    ConfiguracaoSite.objects.filter(pk=1).update(atualizado_em=timezone.now())
+    _atual = None
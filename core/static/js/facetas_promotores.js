@@ -0,0 +1,78 @@
+/*
+ * Contagens por faceta nos modais de filtro de promotores.
+ *
+ * OCFacetas.ligar(form, url, extras) consulta api_facetas_promotores com os
+ * campos do formulário (+ extras, ex.: termo de busca) a cada alteração e
+ * escreve "Feminino (1.240)" nas opções dos selects, desabilitando as
+ * zeradas. Campos de texto (cidade/UF) ganham sugestões via <datalist>.
+ */
+(function () {
+    function formatar(n) {
+        return Number(n).toLocaleString('pt-BR');
+    }
+
+    function aplicar(form, facetas) {
+        Object.keys(facetas).forEach(function (campo) {
+            var el = form.querySelector('[name="' + campo + '"]');
+            if (!el) return;
+            var itens = facetas[campo];
+
+            if (el.tagName === 'SELECT') {
+                var totais = {};
+                itens.forEach(function (i) { totais[i.valor] = i.total; });
+                Array.from(el.options).forEach(function (opt) {
+                    if (!opt.value) return;
+                    if (!opt.dataset.rotulo) opt.dataset.rotulo = opt.text;
+                    var total = totais[opt.value] || 0;
+                    opt.text = opt.dataset.rotulo + ' (' + formatar(total) + ')';
+                    opt.disabled = total === 0 && opt.value !== el.value;
+                });
+                return;
+            }
+
+            var id = 'facetas-' + campo;
+            var lista = document.getElementById(id);
+            if (!lista) {
+                lista = document.createElement('datalist');
+                lista.id = id;
+                form.appendChild(lista);
+                el.setAttribute('list', id);
+            }
+            lista.innerHTML = '';
+            itens.forEach(function (i) {
+                var opt = document.createElement('option');
+                opt.value = i.valor;
+                opt.label = i.rotulo + ' (' + formatar(i.total) + ')';
+                lista.appendChild(opt);
+            });
+        });
+    }
+
+    window.OCFacetas = {
+        ligar: function (form, url, extras) {
+            if (!form || !url) return function () {};
+            var timer = null;
+
+            function atualizar() {
+                var params = new URLSearchParams(new FormData(form));
+                var valores = typeof extras === 'function' ? extras() : (extras || {});
+                Object.keys(valores).forEach(function (k) {
+                    if (valores[k]) params.set(k, valores[k]);
+                });
+                fetch(url + '?' + params.toString(), { credentials: 'same-origin' })
+                    .then(function (r) { return r.ok ? r.json() : null; })
+                    .then(function (data) { if (data && data.facetas) aplicar(form, data.facetas); })
+                    .catch(function () { /* contagens são só auxílio visual */ });
+            }
+
+            form.addEventListener('change', atualizar);
+            form.addEventListener('input', function (e) {
+                if (e.target.tagName !== 'INPUT') return;
+                clearTimeout(timer);
+                timer = setTimeout(atualizar, 400);
+            });
+            atualizar();
+            return atualizar;
+        }
+    };
+})();
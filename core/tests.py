@@ -0,0 +1,898 @@
+import datetime
+import os
+import shutil
+import tempfile
+from datetime import time
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+from PIL import Image
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import atributos, compatibilidade, contadores, dashboard, geocoding, miniaturas, reputacao, site_config
+from core.areas import filtro_areas, filtro_areas_texto
+from core.buscas_salvas import invalidar_todas
+from core.candidatos import ranquear_candidatos
+from core.context_processors import site_config as contexto_site
+from core.geo import geohash_encode
+from core.idade import expressao_idade, filtro_idade, idade, nascidos_ate
+from core.matching import compilar_job, fit_counts, parse_areas, score_jobs
+from core.models import (
+    Avaliacao,
+    BuscaSalva,
+    Candidatura,
+    CompatibilidadeJob,
+    ConfiguracaoSite,
+    ContadorDemografico,
+    ContatoSite,
+    GeocodificacaoPendente,
+    Job,
+    JobDia,
+    PalavraBusca,
+    UserProfile,
+)
+
+
+class MuralDeVagasTests(TestCase):
+    """Mural de vagas (lista_vagas): consultas não crescem com o número de vagas."""
+
+    def setUp(self):
+        usuario = User.objects.create_user('promotor', 'promotor@example.com', 'senha')
+        self.perfil = UserProfile.objects.create(
+            user=usuario,
+            nome_completo='Promotor Teste',
+            cpf='00000000191',
+            status='aprovado',
+            genero='feminino',
+            data_nascimento=datetime.date(1995, 5, 10),
+        )
+        self.client.force_login(usuario)
+
+    def _criar_vagas(self, quantidade):
+        hoje = timezone.localdate()
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(quantidade):
+                job = Job.objects.create(titulo=f'Vaga {i}', status='aberto')
+                for d in range(3):
+                    JobDia.objects.create(
+                        job=job,
+                        data=hoje + datetime.timedelta(days=d - 1),
+                        hora_inicio=time(9, 0),
+                        hora_fim=time(18, 0),
+                        valor=Decimal('150.00'),
+                    )
+
+    def _consultas_do_mural(self, params=None):
+        self.client.get('/vagas/', params)  # aquece caches de processo
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.client.get('/vagas/', params)
+        self.assertEqual(resposta.status_code, 200)
+        return len(consultas), len(resposta.context['vagas_disponiveis'])
+
+    def test_consultas_constantes_com_numero_de_vagas(self):
+        for params in ({}, {'compativeis': '1'}):
+            with self.subTest(params=params):
+                Job.objects.all().delete()
+                self._criar_vagas(2)
+                poucas, exibidas = self._consultas_do_mural(params)
+                self.assertEqual(exibidas, 2)
+
+                self._criar_vagas(8)
+                self.client.get('/vagas/', params)
+                with self.assertNumQueries(poucas):
+                    resposta = self.client.get('/vagas/', params)
+                self.assertEqual(len(resposta.context['vagas_disponiveis']), 10)
+
+    def test_raio_e_ordem_por_distancia(self):
+        UserProfile.objects.filter(pk=self.perfil.pk).update(latitude=Decimal('-23.550000'), longitude=Decimal('-46.630000'))
+        with self.captureOnCommitCallbacks(execute=True):
+            for titulo, lat in (('Longe', '-23.900000'), ('Perto', '-23.560000'), ('Medio', '-23.600000')):
+                Job.objects.create(titulo=titulo, status='aberto', latitude=Decimal(lat), longitude=Decimal('-46.630000'))
+            Job.objects.create(titulo='Sem coordenadas', status='aberto')
+
+        resposta = self.client.get('/vagas/', {'raio': '10', 'ordem': 'distancia'})
+        vagas = resposta.context['vagas_disponiveis']
+        self.assertEqual([v.titulo for v in vagas], ['Perto', 'Medio'])
+        self.assertEqual([v.distance_km for v in vagas], [1.1, 5.6])
+
+        resposta = self.client.get('/vagas/', {'ordem': 'distancia'})
+        titulos = [v.titulo for v in resposta.context['vagas_disponiveis']]
+        self.assertEqual(titulos, ['Perto', 'Medio', 'Longe', 'Sem coordenadas'])
+
+
+class MatchingTests(TestCase):
+    """Requisitos compilados uma vez por conteúdo e avaliados num só passe."""
+
+    def _job(self, **campos):
+        return Job(titulo='Vaga', status='aberto', **campos)
+
+    def test_requisitos_compilados_sao_compartilhados(self):
+        a = self._job(tipo_servico='recepcao, Degustação', generos_aceitos='feminino')
+        b = self._job(tipo_servico='recepcao, Degustação', generos_aceitos='feminino')
+        self.assertIs(compilar_job(a), compilar_job(b))
+        b.generos_aceitos = 'masculino'
+        self.assertIsNot(compilar_job(a), compilar_job(b))
+        self.assertEqual(compilar_job(a).areas, frozenset({'recepcao', 'degustacao'}))
+
+    def test_conta_requisitos_atendidos(self):
+        perfil = UserProfile(
+            genero='feminino', areas_atuacao='recepcao', experiencia='pouca', nivel_ingles='intermediario',
+        )
+        job = self._job(
+            tipo_servico='recepcao', requer_experiencia=True, nivel_ingles_min='fluente',
+            generos_aceitos='feminino,nao_binario', olhos_aceitos='azul',
+        )
+        # área, experiência e gênero atendidos; inglês e olhos não
+        self.assertEqual(fit_counts(job, perfil), (3, 5))
+        livre = self._job(pk=2)
+        job.pk = 1
+        fits = score_jobs(perfil, [job, livre])
+        self.assertEqual(fits[1]['status'], 'bad')
+        self.assertEqual((fits[2]['status'], fits[2]['total']), ('good', 0))
+
+
+class AtributosBitsTests(TestCase):
+    """Gênero/etnia/olhos/cabelo em bits: um AND por dimensão exigida."""
+
+    def setUp(self):
+        atributos.invalidar_mascaras_jobs()
+        self.perfis = {}
+        for i, (genero, olhos) in enumerate([('feminino', 'azul'), ('feminino', 'verde'), ('masculino', 'azul')]):
+            self.perfis[(genero, olhos)] = UserProfile.objects.create(
+                user=User.objects.create_user(f'bits{i}', f'bits{i}@example.com', 'senha'),
+                nome_completo=f'Bits {i}', cpf=f'7000000{i:04d}', status='aprovado', genero=genero, olhos=olhos,
+            )
+        self.job = Job.objects.create(titulo='Olhos claros', status='aberto', generos_aceitos='feminino', olhos_aceitos='azul,verde')
+        self.livre = Job.objects.create(titulo='Livre', status='aberto')
+
+    def test_perfis_e_jobs_compativeis(self):
+        self.assertEqual(
+            set(atributos.perfis_compativeis(self.job)),
+            {self.perfis[('feminino', 'azul')], self.perfis[('feminino', 'verde')]},
+        )
+        masculino = self.perfis[('masculino', 'azul')].atributos_bits
+        self.assertEqual(atributos.jobs_compativeis(masculino), [self.livre.pk])
+        # valor fora dos choices continua exigido e não casa com ninguém
+        self.job.olhos_aceitos = 'roxo'
+        self.job.save()
+        self.assertEqual(atributos.perfis_compativeis(self.job).count(), 0)
+
+    def test_mascaras_versionadas_pelo_banco(self):
+        feminino = self.perfis[('feminino', 'azul')].atributos_bits
+        self.assertEqual(atributos.jobs_compativeis(feminino), [self.job.pk, self.livre.pk])
+        # gravação feita por outro processo (sem invalidar a cópia deste)
+        Job.objects.filter(pk=self.job.pk).update(
+            generos_bits=atributos.mascara_aceitos('genero', {'masculino'}),
+            atualizado_em=timezone.now() + datetime.timedelta(seconds=1),
+        )
+        self.assertEqual(atributos.jobs_compativeis(feminino), [self.livre.pk])
+
+
+class CandidatosTests(TestCase):
+    """Ranking de candidatos do job: requisitos, distância, nota e jobs."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            titulo='Recepção', status='aberto', generos_aceitos='feminino',
+            latitude=Decimal('-23.550000'), longitude=Decimal('-46.630000'),
+        )
+        self.perfis = {}
+        for i, (nome, genero, lat, nota) in enumerate([
+            ('Perto', 'feminino', '-23.560000', 4.0),
+            ('Longe', 'feminino', '-23.900000', 5.0),
+            ('Outro genero', 'masculino', '-23.550000', 5.0),
+            ('Sem local', 'feminino', None, 0.0),
+        ]):
+            perfil = UserProfile.objects.create(
+                user=User.objects.create_user(f'cand{i}', f'cand{i}@example.com', 'senha'),
+                nome_completo=nome, cpf=f'8000000{i:04d}', status='aprovado', genero=genero,
+            )
+            UserProfile.objects.filter(pk=perfil.pk).update(nota_media=nota)
+            if lat:
+                geocoding.gravar_coordenadas('userprofile', perfil.pk, float(lat), -46.63)
+            self.perfis[nome] = perfil
+
+    def _nomes(self, **opcoes):
+        return [c.nome for c in ranquear_candidatos(self.job, **opcoes)]
+
+    def test_ranking(self):
+        self.assertEqual(self._nomes(), ['Perto', 'Longe', 'Sem local', 'Outro genero'])
+        self.assertEqual(self._nomes(limite=2), ['Perto', 'Longe'])
+        self.assertEqual(self._nomes(so_compativeis=True), ['Perto', 'Longe', 'Sem local'])
+        self.assertEqual(self._nomes(raio_km=10), ['Perto', 'Outro genero'])
+
+    def test_view_do_admin(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'senha'))
+        resposta = self.client.get(f'/admin/core/job/{self.job.pk}/candidatos/', {'limite': '1'})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual([c.nome for c in resposta.context['candidatos']], ['Perto'])
+
+
+class FilaGeocodificacaoTests(TestCase):
+    """Fila de geocoding com o geocodificador stub (sem rede)."""
+
+    ENDERECO = 'Rua A, 10, Campinas, SP, Brasil'
+
+    def setUp(self):
+        usuario = User.objects.create_user('geo', 'geo@example.com', 'senha')
+        self.perfil = UserProfile.objects.create(
+            user=usuario, nome_completo='Promotor Geo', cpf='00000000272',
+            endereco='Rua A', numero='10', cidade='Campinas', estado='SP',
+        )
+        self.item = GeocodificacaoPendente.objects.create(
+            modelo='userprofile', objeto_id=self.perfil.pk, endereco=self.ENDERECO,
+        )
+
+    def _processar(self, resultado):
+        stub = geocoding.GeocodificadorStub({self.ENDERECO: resultado})
+        desfecho = geocoding.processar_item(self.item, stub)
+        self.item.refresh_from_db()
+        self.perfil.refresh_from_db()
+        return desfecho
+
+    def test_sucesso_grava_coordenadas(self):
+        self.assertEqual(self._processar((-22.9, -47.06)), 'ok')
+        self.assertEqual(self.item.status, 'ok')
+        self.assertEqual(float(self.perfil.latitude), -22.9)
+        self.assertEqual(float(self.perfil.longitude), -47.06)
+        self.assertEqual(self.perfil.geohash, geohash_encode(self.perfil.latitude, self.perfil.longitude))
+
+    def test_sem_resultado(self):
+        self.assertEqual(self._processar(None), 'sem_resultado')
+        self.assertEqual(self.item.status, 'sem_resultado')
+        self.assertIsNone(self.perfil.latitude)
+
+    def test_excecao_aplica_backoff(self):
+        antes = timezone.now()
+        self.assertEqual(self._processar(TimeoutError('sem rede')), 'erro')
+        self.assertEqual(self.item.status, 'pendente')
+        self.assertEqual(self.item.tentativas, 1)
+        self.assertIn('TimeoutError', self.item.ultimo_erro)
+        self.assertGreaterEqual(self.item.proxima_tentativa, antes + geocoding.backoff(1))
+        self.assertIsNone(self.perfil.latitude)
+
+        # Item ainda não vencido não é reprocessado
+        self.assertFalse(geocoding.processar_pendentes(geocoding.GeocodificadorStub(), geocoding.LimitadorTaxa(0)))
+
+        self.item.tentativas = geocoding.MAX_TENTATIVAS - 1
+        self.item.save()
+        self.assertEqual(self._processar(TimeoutError('sem rede')), 'falhou')
+        self.assertEqual(self.item.status, 'falhou')
+
+    def test_worker_com_stub(self):
+        call_command('geocode_worker', '--once', '--geocoder', 'stub', '--intervalo', '0', stdout=StringIO())
+        self.item.refresh_from_db()
+        self.perfil.refresh_from_db()
+        self.assertEqual(self.item.status, 'ok')
+        lat, lon = geocoding.GeocodificadorStub.coordenadas_falsas(self.ENDERECO)
+        self.assertEqual((float(self.perfil.latitude), float(self.perfil.longitude)), (lat, lon))
+
+    def test_intervalo_minimo_no_servico_externo(self):
+        nominatim = object.__new__(geocoding.GeocodificadorNominatim)
+        self.assertEqual(geocoding.limitador_para(nominatim, 0).intervalo, geocoding.INTERVALO_MINIMO_S)
+        self.assertEqual(geocoding.limitador_para(nominatim, 2.5).intervalo, 2.5)
+        self.assertEqual(geocoding.limitador_para(geocoding.GeocodificadorStub(), 0).intervalo, 0.0)
+        self.assertEqual(geocoding.limitador_para(geocoding.GeocodificadorStub(), -1).intervalo, 0.0)
+
+
+class GeocodeCacheTests(TestCase):
+    """GeocodeCache: endereço normalizado e centróide do CEP antes da consulta externa."""
+
+    def test_endereco_normalizado_consulta_uma_vez(self):
+        stub = geocoding.GeocodificadorStub({'Av. Paulista, 1000 - São Paulo': (-23.5, -46.6)})
+        self.assertEqual(geocoding.geocodificar('Av. Paulista, 1000 - São Paulo', '01310-100', stub), (-23.5, -46.6))
+        self.assertEqual(geocoding.geocodificar('AV PAULISTA 1000 SAO PAULO', None, stub), (-23.5, -46.6))
+        self.assertEqual(len(stub.consultas), 1)
+
+    def test_cep_como_fallback(self):
+        stub = geocoding.GeocodificadorStub({'Rua A, 1': (-23.0, -46.0), 'Rua B, 2': (-23.2, -46.2), 'Rua C, 3': None})
+        geocoding.geocodificar('Rua A, 1', '01310100', stub)
+        geocoding.geocodificar('Rua B, 2', '01310100', stub)
+        # endereço sem resultado cai no centróide dos pontos já vistos no CEP
+        lat, lon = geocoding.geocodificar('Rua C, 3', '01310100', stub)
+        self.assertAlmostEqual(lat, -23.1)
+        self.assertAlmostEqual(lon, -46.1)
+        self.assertEqual(stub.consultas, ['Rua A, 1', 'Rua B, 2', 'Rua C, 3'])
+        # resultado negativo também fica em cache
+        self.assertEqual(geocoding.geocodificar('Rua C, 3', None, stub), None)
+        self.assertEqual(len(stub.consultas), 3)
+
+
+class IndiceCompatibilidadeTests(TestCase):
+    """CompatibilidadeJob: marcado no save(), recalculado pelo worker."""
+
+    def setUp(self):
+        usuario = User.objects.create_user('compat', 'compat@example.com', 'senha')
+        self.perfil = UserProfile.objects.create(
+            user=usuario, nome_completo='Promotor Compat', cpf='00000000353',
+            status='aprovado', genero='feminino',
+        )
+        self.job = Job.objects.create(titulo='Vaga', status='aberto', generos_aceitos='feminino')
+
+    def _compatibilidade(self):
+        return CompatibilidadeJob.objects.filter(job=self.job, perfil=self.perfil).values_list('status', flat=True).first()
+
+    def test_reindexa_so_quando_requisito_muda(self):
+        self.assertTrue(Job.objects.get(pk=self.job.pk).compatibilidade_pendente)
+        contagem = compatibilidade.processar_pendentes()
+        self.assertEqual((contagem['job'], contagem['userprofile']), (1, 1))
+        self.assertEqual(self._compatibilidade(), 'good')
+
+        self.job.titulo = 'Vaga renomeada'
+        self.job.save()
+        self.perfil.bairro = 'Centro'
+        self.perfil.save()
+        self.assertFalse(Job.objects.get(pk=self.job.pk).compatibilidade_pendente)
+        self.assertFalse(UserProfile.objects.get(pk=self.perfil.pk).compatibilidade_pendente)
+        self.assertFalse(compatibilidade.processar_pendentes())
+
+        self.job.generos_aceitos = 'masculino'
+        self.job.save()
+        self.job.refresh_from_db()
+        self.assertTrue(self.job.compatibilidade_pendente)
+        # Até o worker rodar o mural avalia na hora, sem ler o índice velho
+        fit = compatibilidade.fits_para_perfil(self.perfil, [self.job])[self.job.pk]
+        self.assertEqual(fit['passed'], 0)
+        self.assertEqual(self._compatibilidade(), 'good')
+
+        call_command('compatibilidade_worker', '--once', stdout=StringIO())
+        self.assertEqual(self._compatibilidade(), fit['status'])
+
+    def test_job_fechado_sai_do_indice(self):
+        compatibilidade.processar_pendentes()
+        self.job.status = 'finalizado'
+        self.job.save()
+        compatibilidade.processar_pendentes()
+        self.assertIsNone(self._compatibilidade())
+
+
+class BuscaPromotoresTests(TestCase):
+    """api_search_promoters: prefixo de palavras do nome e paginação por cursor."""
+
+    NOMES = ('Júlia de Souza', 'Souza Júlio', 'Ana Julia', 'Bruno Alves', 'Carla Dias')
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'senha'))
+        for i, nome in enumerate(self.NOMES):
+            UserProfile.objects.create(
+                user=User.objects.create_user(f'busca{i}', f'busca{i}@example.com', 'senha'),
+                nome_completo=nome, cpf=f'6000000{i:04d}', status='aprovado',
+            )
+
+    def _buscar(self, **params):
+        resposta = self.client.get('/api/search-promoters/', params)
+        self.assertEqual(resposta.status_code, 200)
+        return resposta.json()
+
+    def test_prefixo_de_palavras(self):
+        nomes = [r['text'] for r in self._buscar(q='juli sou')['results']]
+        # nome que começa pela primeira palavra digitada vem antes
+        self.assertEqual(nomes, ['Júlia de Souza', 'Souza Júlio'])
+        self.assertEqual([r['text'] for r in self._buscar(q='ULIA')['results']], [])
+
+        perfil = UserProfile.objects.get(nome_completo='Bruno Alves')
+        perfil.nome_completo = 'Bruno Souto'
+        perfil.save()
+        self.assertEqual(
+            set(PalavraBusca.objects.filter(perfil=perfil).values_list('palavra', flat=True)), {'bruno', 'souto'}
+        )
+        self.assertEqual(len(self._buscar(q='sou')['results']), 3)
+
+    def test_cursor_percorre_sem_repetir(self):
+        nomes, cursor, paginas = [], None, 0
+        while True:
+            params = {'limit': 2, **({'cursor': cursor} if cursor else {})}
+            pagina = self._buscar(**params)
+            nomes += [r['text'] for r in pagina['results']]
+            paginas += 1
+            cursor = pagina['next']
+            if not cursor:
+                break
+        self.assertEqual(nomes, sorted(self.NOMES))
+        self.assertEqual(paginas, 3)
+
+        # cursor de outra ordenação (ou corrompido) é recusado
+        cursor = self._buscar(limit=2)['next']
+        self.assertEqual(self.client.get('/api/search-promoters/', {'ordem': 'nota', 'cursor': cursor}).status_code, 400)
+        self.assertEqual(self.client.get('/api/search-promoters/', {'cursor': 'xyz'}).status_code, 400)
+
+
+class FacetasPromotoresTests(TestCase):
+    """api_facetas_promotores conta sobre os mesmos filtros da Base de Promotores."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'senha'))
+        for i, (nome, genero, bairro, altura) in enumerate([
+            ('Ana Souza', 'feminino', 'Centro', Decimal('1.70')),
+            ('Bia Lima', 'feminino', 'Cambuí', Decimal('1.60')),
+            ('Caio Rocha', 'masculino', 'Centro', Decimal('1.80')),
+        ]):
+            usuario = User.objects.create_user(f'p{i}', f'p{i}@example.com', 'senha')
+            UserProfile.objects.create(
+                user=usuario, nome_completo=nome, cpf=f'0000000{i}000', status='aprovado',
+                genero=genero, bairro=bairro, altura=altura, cidade='Campinas', estado='SP',
+            )
+
+    def _generos(self, **params):
+        resposta = self.client.get('/api/search-promoters/facetas/', {'status__exact': 'aprovado', **params})
+        self.assertEqual(resposta.status_code, 200)
+        return {item['valor']: item['total'] for item in resposta.json()['facetas']['genero']}
+
+    def test_filtros_do_modal_mudam_as_contagens(self):
+        self.assertEqual(self._generos()['feminino'], 2)
+        centro = self._generos(bairro='Centro')
+        self.assertEqual((centro['feminino'], centro['masculino']), (1, 1))
+        self.assertEqual(self._generos(altura_min='1.65')['feminino'], 1)
+        self.assertEqual(self._generos(bairro='Centro', altura_max='1.75')['masculino'], 0)
+
+    def test_faceta_ignora_a_propria_selecao(self):
+        self.assertEqual(self._generos(genero='masculino')['feminino'], 2)
+
+    def test_termo_como_na_listagem(self):
+        # icontains da busca do admin (não só início de palavra)
+        self.assertEqual(self._generos(q='ouza')['feminino'], 1)
+        self.assertEqual(self._generos(status__exact='pendente')['feminino'], 0)
+
+    def test_exige_equipe(self):
+        self.client.logout()
+        resposta = self.client.get('/api/search-promoters/facetas/', {'status__exact': 'aprovado'})
+        self.assertNotEqual(resposta.status_code, 200)
+
+
+class DashboardSnapshotTests(TestCase):
+    """Snapshot de KPIs: guardado no cache compartilhado, invalidado pelos signals."""
+
+    def _criar_perfil(self, n, status):
+        usuario = User.objects.create_user(f'dash{n}', f'dash{n}@example.com', 'senha')
+        return UserProfile.objects.create(user=usuario, nome_completo=f'Dash {n}', cpf=f'1000000{n:04d}', status=status)
+
+    def test_cache_e_invalidacao(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._criar_perfil(1, 'pendente')
+        self.assertEqual(dashboard.obter_snapshot().kpi['pendentes'], 1)
+
+        # Lido do cache (banco, compartilhado): não recalcula
+        with self.assertNumQueries(1):
+            dashboard.obter_snapshot()
+        self.assertIsNotNone(caches['default'].get(dashboard.CACHE_KEY))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._criar_perfil(2, 'pendente')
+            self._criar_perfil(3, 'aprovado')
+        kpi = dashboard.obter_snapshot().kpi
+        self.assertEqual((kpi['total'], kpi['pendentes']), (3, 2))
+
+
+class ContadoresDemograficosTests(TestCase):
+    """ContadorDemografico acompanha saves, ações em massa e exclusões."""
+
+    def setUp(self):
+        for i, (genero, status) in enumerate([('feminino', 'aprovado'), ('feminino', 'pendente'), ('masculino', 'aprovado')]):
+            UserProfile.objects.create(
+                user=User.objects.create_user(f'contador{i}', f'contador{i}@example.com', 'senha'),
+                nome_completo=f'Contador {i}', cpf=f'5000000{i:04d}', genero=genero, status=status,
+                data_nascimento=datetime.date(1990 + i, 2, 28),
+            )
+
+    def _total(self, dimensao, valor, status):
+        linha = ContadorDemografico.objects.filter(dimensao=dimensao, valor=valor, status=status).first()
+        return linha.total if linha else 0
+
+    def test_sem_divergencia_apos_saves_acoes_e_exclusoes(self):
+        self.assertEqual(self._total('genero', 'feminino', 'aprovado'), 1)
+        perfil = UserProfile.objects.get(cpf='50000000001')
+        perfil.genero = 'nao_binario'
+        perfil.save()
+        contadores.update_com_contadores(UserProfile.objects.filter(status='pendente'), status='aprovado')
+        self.assertEqual(self._total('genero', 'nao_binario', 'aprovado'), 1)
+        self.assertEqual(self._total('total', '', 'aprovado'), 3)
+
+        UserProfile.objects.filter(genero='masculino').delete()
+        self.assertEqual(self._total('genero', 'masculino', 'aprovado'), 0)
+        self.assertEqual(self._total('total', '', 'aprovado'), 2)
+        self.assertEqual(contadores.reconciliar(corrigir=False), {})
+
+    def test_reconciliar_corrige_update_direto(self):
+        UserProfile.objects.filter(genero='feminino').update(status='reprovado')
+        divergencias = contadores.reconciliar()
+        self.assertEqual(divergencias[('genero', 'feminino', 'reprovado')], (0, 2))
+        self.assertEqual(divergencias[('total', '', 'aprovado')], (2, 1))
+        self.assertEqual(self._total('genero', 'feminino', 'reprovado'), 2)
+        self.assertEqual(contadores.reconciliar(corrigir=False), {})
+
+
+class SiteConfigTests(TestCase):
+    """Configuração do site em cache por processo, versionada pelo banco."""
+
+    def setUp(self):
+        self.config = ConfiguracaoSite.load()
+        site_config.invalidar_site_config()
+
+    def test_versao_vem_do_banco(self):
+        primeira = site_config.obter_site_config()
+        with self.assertNumQueries(1):
+            self.assertIs(site_config.obter_site_config(), primeira)
+        # outro processo salvou: a versão no banco muda e a cópia é descartada
+        ConfiguracaoSite.objects.filter(pk=1).update(
+            titulo_site='Novo título', atualizado_em=timezone.now() + datetime.timedelta(seconds=1)
+        )
+        atual = site_config.obter_site_config()
+        self.assertIsNot(atual, primeira)
+        self.assertEqual(atual.config.titulo_site, 'Novo título')
+
+    def test_contatos_compartilhados(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.config.contatos.all().delete()
+            ConfiguracaoSite.objects.filter(pk=1).update(instagram_link='https://www.instagram.com/castingcerto/')
+            ContatoSite.objects.create(configuracao=self.config, tipo='telefone', valor='(11) 1111-1111', telefone_tipo='telefone', ordem=1)
+            whatsapp = ContatoSite.objects.create(configuracao=self.config, tipo='telefone', valor='(11) 92222-2222', telefone_tipo='ambos', ordem=2)
+            email = ContatoSite.objects.create(configuracao=self.config, tipo='email', valor='oi@example.com', ordem=3)
+        contatos = site_config.obter_site_config().contatos
+        self.assertEqual((contatos.email_principal, contatos.whatsapp_principal), (email, whatsapp))
+        self.assertEqual(len(contatos.por_tipo['telefone']), 2)
+        self.assertEqual(contatos.instagram_handle, '@CASTINGCERTO')
+
+        # templates leem a mesma instância, sem montar de novo
+        contexto = contexto_site(RequestFactory().get('/'))
+        with self.assertNumQueries(1):
+            self.assertEqual(contexto['contatos_por_tipo'], contatos.por_tipo)
+            self.assertEqual(contexto['contato_whatsapp_principal'], whatsapp)
+
+
+class ReputacaoTests(TestCase):
+    """Nota média e jobs aprovados aplicados como diferença a cada gravação."""
+
+    def setUp(self):
+        self.perfil = UserProfile.objects.create(
+            user=User.objects.create_user('reputacao', 'reputacao@example.com', 'senha'),
+            nome_completo='Promotor Reputação', cpf='90000000001', status='aprovado',
+        )
+        self.outro = UserProfile.objects.create(
+            user=User.objects.create_user('reputacao2', 'reputacao2@example.com', 'senha'),
+            nome_completo='Outro Promotor', cpf='90000000002', status='aprovado',
+        )
+
+    def _reputacao(self, perfil):
+        perfil.refresh_from_db()
+        return perfil.nota_media, perfil.total_avaliacoes, perfil.total_jobs_aprovados
+
+    def test_avaliacoes(self):
+        a = Avaliacao.objects.create(promotor=self.perfil, cliente_nome='A', nota=5)
+        Avaliacao.objects.create(promotor=self.perfil, cliente_nome='B', nota=2)
+        self.assertEqual(self._reputacao(self.perfil), (3.5, 2, 0))
+        a.nota = 4
+        a.save()
+        self.assertEqual(self._reputacao(self.perfil), (3.0, 2, 0))
+        # avaliação movida para outro promotor
+        a.promotor = self.outro
+        a.save()
+        self.assertEqual(self._reputacao(self.perfil), (2.0, 1, 0))
+        self.assertEqual(self._reputacao(self.outro), (4.0, 1, 0))
+        Avaliacao.objects.filter(promotor=self.perfil).delete()
+        self.assertEqual(self._reputacao(self.perfil), (0.0, 0, 0))
+        self.assertEqual(reputacao.reconstruir(corrigir=False), 0)
+
+    def test_candidaturas_aprovadas(self):
+        jobs = [Job.objects.create(titulo=f'Job {i}', status='aberto') for i in range(3)]
+        candidaturas = [Candidatura.objects.create(job=job, modelo=self.perfil) for job in jobs]
+        self.assertEqual(self._reputacao(self.perfil)[2], 0)
+        for c in candidaturas:
+            c.status = 'aprovado'
+            c.save()
+        self.assertEqual(self._reputacao(self.perfil)[2], 3)
+        candidaturas[0].status = 'reprovado'
+        candidaturas[0].save()
+        jobs[1].delete()  # exclusão em cascata
+        self.assertEqual(self._reputacao(self.perfil)[2], 1)
+
+        UserProfile.objects.filter(pk=self.perfil.pk).update(total_jobs_aprovados=7)
+        self.assertEqual(reputacao.reconstruir(), 1)
+        self.assertEqual(self._reputacao(self.perfil)[2], 1)
+
+
+class OrdemReputacaoAdminTests(TestCase):
+    """Base de Promotores: ?ordem=nota|jobs e ?nota_min=/?jobs_min=."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'senha'))
+        for i, (nome, nota, avaliacoes, jobs) in enumerate([
+            ('Novata', 0.0, 0, 0), ('Experiente', 4.2, 10, 12), ('Estrela', 4.9, 3, 2),
+        ]):
+            perfil = UserProfile.objects.create(
+                user=User.objects.create_user(f'ordem{i}', f'ordem{i}@example.com', 'senha'),
+                nome_completo=nome, cpf=f'9100000{i:04d}', status='aprovado',
+            )
+            UserProfile.objects.filter(pk=perfil.pk).update(
+                nota_media=nota, total_avaliacoes=avaliacoes, total_jobs_aprovados=jobs,
+            )
+
+    def _nomes(self, **params):
+        resposta = self.client.get('/admin/core/userprofile/', {'status__exact': 'aprovado', **params})
+        self.assertEqual(resposta.status_code, 200)
+        return [perfil.nome_completo for perfil in resposta.context['cl'].result_list]
+
+    def test_ordena_e_filtra(self):
+        self.assertEqual(self._nomes(ordem='nota'), ['Estrela', 'Experiente', 'Novata'])
+        self.assertEqual(self._nomes(ordem='jobs'), ['Experiente', 'Estrela', 'Novata'])
+        self.assertEqual(self._nomes(ordem='nota', nota_min='4.5'), ['Estrela'])
+        self.assertEqual(self._nomes(ordem='jobs', jobs_min='3'), ['Experiente'])
+
+    def test_opcoes_do_modal(self):
+        resposta = self.client.get('/admin/core/userprofile/', {'status__exact': 'aprovado'})
+        for valor, rotulo in reputacao.ORDEM_CHOICES:
+            self.assertContains(resposta, f'<option value="{valor}">{rotulo}</option>', html=True)
+
+
+class MedidasNumericasTests(TestCase):
+    """calcado_num/manequim_num: faixas comparam números, não texto."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'senha'))
+        for i, (nome, calcado, manequim) in enumerate([
+            ('Cinco', '5', 'P'), ('Trinta e sete', '37,5', '38/40'), ('Quarenta', '40', '42'), ('Sem medida', '', None),
+        ]):
+            UserProfile.objects.create(
+                user=User.objects.create_user(f'medida{i}', f'medida{i}@example.com', 'senha'),
+                nome_completo=nome, cpf=f'9200000{i:04d}', status='aprovado', calcado=calcado, manequim=manequim,
+            )
+
+    def _nomes(self, **params):
+        resposta = self.client.get('/admin/core/userprofile/', {'status__exact': 'aprovado', **params})
+        self.assertEqual(resposta.status_code, 200)
+        return sorted(perfil.nome_completo for perfil in resposta.context['cl'].result_list)
+
+    def test_copias_numericas(self):
+        perfil = UserProfile.objects.get(nome_completo='Trinta e sete')
+        self.assertEqual((perfil.calcado_num, perfil.manequim_num), (Decimal('37.5'), 38))
+        self.assertEqual(UserProfile.objects.get(nome_completo='Cinco').manequim_num, None)
+
+    def test_faixas_do_admin(self):
+        self.assertEqual(self._nomes(sapato_min='6'), ['Quarenta', 'Trinta e sete'])
+        self.assertEqual(self._nomes(sapato_min='37', sapato_max='39'), ['Trinta e sete'])
+        self.assertEqual(self._nomes(manequim='38'), ['Trinta e sete'])
+        self.assertEqual(self._nomes(manequim='p'), ['Cinco'])
+
+
+class ExplicarFiltrosAdminTests(TestCase):
+    """explicar_filtros_admin reexecuta querystrings do access log com EXPLAIN."""
+
+    def test_reexecuta_e_mostra_o_plano(self):
+        User.objects.create_superuser('admin', 'admin@example.com', 'senha')
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as log:
+            log.write('10.0.0.1 - - "GET /admin/core/userprofile/?status=aprovado&genero__exact=feminino HTTP/1.1" 200\n')
+            log.write('10.0.0.1 - - "GET /admin/core/job/ HTTP/1.1" 200\n')
+            log.write('?sapato_min=36&sapato_max=38\n')
+        self.addCleanup(os.remove, log.name)
+        saida = StringIO()
+        call_command('explicar_filtros_admin', log.name, '--repeticoes', '1', stdout=saida)
+        saida = saida.getvalue()
+        self.assertIn('2 consulta(s) reexecutada(s)', saida)
+        self.assertIn('genero__exact=feminino&status__exact=aprovado', saida)
+        if connection.vendor == 'sqlite':
+            self.assertIn('perfil_status_calcado_idx', saida)
+
+
+class IdadeTests(TestCase):
+    """core.idade: filtro por intervalo de nascimento igual à idade exata, inclusive em 29/02."""
+
+    NASCIMENTOS = (
+        datetime.date(2000, 2, 29), datetime.date(2001, 2, 28), datetime.date(2001, 3, 1),
+        datetime.date(2004, 2, 29), datetime.date(2006, 2, 28), datetime.date(2006, 3, 1),
+    )
+    DIAS = (
+        datetime.date(2024, 2, 28), datetime.date(2024, 2, 29), datetime.date(2024, 3, 1),
+        datetime.date(2025, 2, 28), datetime.date(2025, 3, 1),
+    )
+
+    def test_aniversario_em_29_de_fevereiro(self):
+        nascimento = datetime.date(2000, 2, 29)
+        self.assertEqual(idade(nascimento, datetime.date(2019, 2, 28)), 18)
+        self.assertEqual(idade(nascimento, datetime.date(2019, 3, 1)), 19)
+        self.assertEqual(idade(nascimento, datetime.date(2020, 2, 29)), 20)
+        self.assertEqual(nascidos_ate(18, datetime.date(2024, 2, 29)), datetime.date(2006, 2, 28))
+
+    def test_filtro_e_sql_concordam_com_idade(self):
+        for i, nascimento in enumerate(self.NASCIMENTOS):
+            UserProfile.objects.create(
+                user=User.objects.create_user(f'idade{i}', f'idade{i}@example.com', 'senha'),
+                nome_completo=f'Idade {i}', cpf=f'9300000{i:04d}', status='aprovado', data_nascimento=nascimento,
+            )
+        for hoje in self.DIAS:
+            idades = {n: idade(n, hoje) for n in self.NASCIMENTOS}
+            with self.subTest(hoje=hoje):
+                calculadas = dict(
+                    UserProfile.objects.annotate(anos=expressao_idade(hoje=hoje)).values_list('data_nascimento', 'anos')
+                )
+                self.assertEqual(calculadas, idades)
+                for anos in (18, 19, 20, 23, 24):
+                    filtrados = set(
+                        UserProfile.objects.filter(filtro_idade(anos, anos, hoje=hoje)).values_list('data_nascimento', flat=True)
+                    )
+                    self.assertEqual(filtrados, {n for n, a in idades.items() if a == anos}, anos)
+
+
+class MiniaturasTests(TestCase):
+    """Miniaturas WebP geradas pelo worker, não na requisição do upload."""
+
+    def setUp(self):
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta, ignore_errors=True)
+        configuracao = override_settings(MEDIA_ROOT=pasta)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+        self.perfil = UserProfile.objects.create(
+            user=User.objects.create_user('miniatura', 'miniatura@example.com', 'senha'),
+            nome_completo='Promotor Foto', cpf='94000000001', status='aprovado',
+            foto_rosto=self._foto('rosto.png', (2000, 1000)),
+        )
+
+    def _foto(self, nome, tamanho):
+        saida = BytesIO()
+        Image.new('RGB', tamanho, 'red').save(saida, format='PNG')
+        return SimpleUploadedFile(nome, saida.getvalue(), content_type='image/png')
+
+    def _processar(self):
+        contagem = miniaturas.processar_pendentes()
+        self.perfil.refresh_from_db()
+        return contagem
+
+    def test_worker_gera_as_versoes(self):
+        self.assertTrue(self.perfil.miniaturas_pendentes)
+        self.assertFalse(self.perfil.miniaturas)
+        self.assertEqual(self._processar(), {'ok': 1})
+        self.assertFalse(self.perfil.miniaturas_pendentes)
+
+        versoes = self.perfil.miniaturas['foto_rosto']
+        storage = self.perfil.foto_rosto.storage
+        for tamanho, lado in miniaturas.TAMANHOS.items():
+            with storage.open(versoes[tamanho]) as f, Image.open(f) as imagem:
+                self.assertEqual((imagem.format, imagem.size), ('WEBP', (lado, lado // 2)))
+        self.assertEqual(
+            miniaturas.url_miniatura(self.perfil.miniaturas, 'foto_rosto', 'p', self.perfil.foto_rosto),
+            storage.url(versoes['p']),
+        )
+        self.assertEqual(miniaturas.srcset(self.perfil.miniaturas, 'foto_rosto').count('w,'), 2)
+
+    def test_foto_nova_substitui_as_versoes(self):
+        self._processar()
+        antigas = self.perfil.miniaturas['foto_rosto']
+        self.perfil.foto_rosto = self._foto('outra.png', (300, 600))
+        self.perfil.save()
+        self.assertTrue(self.perfil.miniaturas_pendentes)
+        self._processar()
+        storage = self.perfil.foto_rosto.storage
+        self.assertFalse(any(storage.exists(antigas[t]) for t in miniaturas.TAMANHOS))
+        self.assertTrue(all(storage.exists(self.perfil.miniaturas['foto_rosto'][t]) for t in miniaturas.TAMANHOS))
+
+
+class RaioAdminTests(TestCase):
+    """Filtro de raio da Base de Promotores (?job=&raio_km=)."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'senha'))
+        self.job = Job.objects.create(titulo='Evento', status='aberto', latitude=Decimal('-22.900000'), longitude=Decimal('-47.060000'))
+        # Criados do mais distante para o mais próximo (ordem padrão é -pk)
+        for i, (nome, lat, lon) in enumerate([
+            ('Longe', '-23.550000', '-46.630000'),   # São Paulo, ~80 km
+            ('Perto', '-22.910000', '-47.070000'),   # ~1,5 km
+            ('Medio', '-22.990000', '-47.150000'),   # ~13 km
+            ('Sem coordenadas', None, None),
+        ]):
+            usuario = User.objects.create_user(f'raio{i}', f'raio{i}@example.com', 'senha')
+            UserProfile.objects.create(
+                user=usuario, nome_completo=nome, cpf=f'2000000{i:04d}', status='aprovado',
+                latitude=Decimal(lat) if lat else None, longitude=Decimal(lon) if lon else None,
+            )
+
+    def _nomes(self, **params):
+        resposta = self.client.get('/admin/core/userprofile/', {'status__exact': 'aprovado', **params})
+        self.assertEqual(resposta.status_code, 200)
+        return [perfil.nome_completo for perfil in resposta.context['cl'].result_list]
+
+    def test_filtra_e_ordena_por_distancia(self):
+        self.assertEqual(self._nomes(job=self.job.pk, raio_km=50), ['Perto', 'Medio'])
+        self.assertEqual(self._nomes(job=self.job.pk, raio_km=100), ['Perto', 'Medio', 'Longe'])
+
+    def test_ordem_do_modal_prevalece(self):
+        # ?ordem=nota: todos sem avaliação, desempata por -pk
+        self.assertEqual(self._nomes(job=self.job.pk, raio_km=100, ordem='nota'), ['Medio', 'Perto', 'Longe'])
+
+
+class AreasAtuacaoTests(TestCase):
+    """Texto areas_atuacao -> UserProfile.areas, com a mesma regra do matching."""
+
+    def _perfil(self, n, areas):
+        usuario = User.objects.create_user(f'area{n}', f'area{n}@example.com', 'senha')
+        return UserProfile.objects.create(
+            user=usuario, nome_completo=f'Area {n}', cpf=f'3000000{n:04d}', status='aprovado', areas_atuacao=areas,
+        )
+
+    def test_mesma_regra_do_matching(self):
+        texto = 'recepcao, Garçom/Garçonete; xpto, Outros: malabarista'
+        perfil = self._perfil(1, texto)
+        slugs = set(perfil.areas.values_list('slug', flat=True))
+        self.assertEqual(slugs, {'recepcao', 'garcom'})
+        self.assertEqual(slugs, parse_areas(texto))
+
+        perfil.areas_atuacao = 'dj, outros, Outros: malabarista'
+        perfil.save()
+        self.assertEqual(set(perfil.areas.values_list('slug', flat=True)), {'dj', 'outros'})
+
+    def test_filtros_do_admin(self):
+        self._perfil(1, 'recepcao, xpto')
+        self._perfil(2, 'bartender, outros, Outros: malabarista')
+        por_area = UserProfile.objects.filter(filtro_areas({'outros'})).values_list('nome_completo', flat=True)
+        self.assertEqual(list(por_area), ['Area 2'])
+        # Termo do modal sem área conhecida cai no texto
+        por_texto = UserProfile.objects.filter(filtro_areas_texto('garçom, malabar')).values_list('nome_completo', flat=True)
+        self.assertEqual(list(por_texto), ['Area 2'])
+        self.assertEqual(UserProfile.objects.filter(filtro_areas_texto('recep')).count(), 1)
+
+
+class BuscasSalvasTests(TestCase):
+    """Buscas salvas: resultado materializado em ResultadoBuscaSalva e mantido pelos signals."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'senha')
+        self.client.force_login(self.admin)
+        self.perfis = {}
+        for i, (nome, genero, estado) in enumerate([('Ana', 'feminino', 'SP'), ('Bia', 'feminino', 'RJ'), ('Caio', 'masculino', 'SP')]):
+            usuario = User.objects.create_user(f'busca{i}', f'busca{i}@example.com', 'senha')
+            self.perfis[nome] = UserProfile.objects.create(
+                user=usuario, nome_completo=nome, cpf=f'4000000{i:04d}', status='aprovado', genero=genero, estado=estado,
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/admin/core/userprofile/buscas/salvar/', {
+                'nome': 'Mulheres SP', 'querystring': 'status__exact=aprovado&genero__exact=feminino&estado=SP&p=3',
+            })
+        self.busca = BuscaSalva.objects.get()
+
+    def _ids(self):
+        self.busca.refresh_from_db()
+        ids = set(self.busca.resultados.values_list('perfil_id', flat=True))
+        self.assertEqual(self.busca.total, len(ids))
+        return ids
+
+    def _abrir(self):
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.client.get('/admin/core/userprofile/', {'busca': self.busca.pk, 'status__exact': 'aprovado'})
+        self.assertEqual(resposta.status_code, 200)
+        # Subconsulta na tabela de resultados, não uma lista de ids
+        self.assertTrue(any('core_resultadobuscasalva' in c['sql'] for c in consultas.captured_queries))
+        return sorted(p.nome_completo for p in resposta.context['cl'].queryset)
+
+    def test_materializa_e_abre(self):
+        self.assertEqual(self._ids(), {self.perfis['Ana'].pk})
+        self.assertEqual(self._abrir(), ['Ana'])
+
+    def test_incremental(self):
+        bia = self.perfis['Bia']
+        with self.captureOnCommitCallbacks(execute=True):
+            bia.estado = 'SP'
+            bia.save()
+        self.assertEqual(self._ids(), {self.perfis['Ana'].pk, bia.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.perfis['Ana'].delete()
+        self.assertEqual(self._ids(), {bia.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bia.genero = 'masculino'
+            bia.save()
+        self.assertEqual(self._ids(), set())
+
+    def test_acao_em_massa_invalida(self):
+        UserProfile.objects.filter(pk=self.perfis['Bia'].pk).update(estado='SP')
+        invalidar_todas()
+        self.busca.refresh_from_db()
+        self.assertIsNone(self.busca.calculado_em)
+        self.assertEqual(self._abrir(), ['Ana', 'Bia'])
+        self.assertEqual(self._ids(), {self.perfis['Ana'].pk, self.perfis['Bia'].pk})
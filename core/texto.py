@@ -0,0 +1,31 @@
+"""
+Normalização de texto para comparação e busca.
+
+normalizar: minúsculas, sem acentos e sem pontuação, com espaços
+colapsados ("  Júlia  D'Ávila " -> "julia d avila"). Usado pela chave do
+GeocodeCache e pela coluna de busca do UserProfile.
+
+numero: primeiro número de um campo livre ("38,5" -> 38.5, "37/38" -> 37),
+para as colunas numéricas de calçado e manequim.
+"""
+
+import re
+import unicodedata
+from decimal import Decimal
+
+_NUMERO_RE = re.compile(r'\d+(?:[.,]\d+)?')
+
+
+def normalizar(texto: str | None) -> str:
+    texto = unicodedata.normalize('NFKD', texto or '')
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).casefold()
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', texto).split())
+
+
+def numero(texto: str | None, maximo: int = 999) -> Decimal | None:
+    """Primeiro número do texto (vírgula ou ponto decimal); None se não houver."""
+    achado = _NUMERO_RE.search(str(texto or ''))
+    if not achado:
+        return None
+    valor = Decimal(achado.group().replace(',', '.'))
+    return valor if valor <= maximo else None
@@ -1,4 +1,5 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth import login
@@ -7,11 +8,19 @@ from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
 from django.http import JsonResponse
-from django.db.models import Q
-from .models import Job, Candidatura, UserProfile, Pergunta, Resposta, Avaliacao, Apresentacao
+from django.db.models import Prefetch, Q
+from .models import Job, JobDia, Candidatura, UserProfile, Pergunta, Resposta, Avaliacao, Apresentacao
 from .forms import CadastroForm
-import datetime
-import math
+from .busca import apos_cursor, codificar_cursor, decodificar_cursor, filtrar_por_termo
+from .atributos import jobs_compativeis
+from .compatibilidade import fits_para_perfil
+from .buscas_salvas import queryset_listagem
+from .facetas import FACETAS, contar_facetas, filtrar_facetas, selecionados as facetas_selecionadas
+from .geo import distancias_km, filtrar_por_raio, filtro_bounding_box, haversine_km
+from .idade import expressao_idade, idade
+from .matching import compilar_job, score_jobs
+from .miniaturas import srcset, url_miniatura
+from .reputacao import ORDENS as ORDENS_REPUTACAO, filtrar_reputacao
 
 from pathlib import Path
 from django.templatetags.static import static
@@ -101,19 +110,6 @@ def privacidade(request):
     return render(request, 'privacidade.html')
 
 
-def _idade_em_anos(data_nascimento):
-    if not data_nascimento:
-        return None
-    try:
-        hoje = timezone.now().date()
-        anos = hoje.year - data_nascimento.year
-        if (hoje.month, hoje.day) < (data_nascimento.month, data_nascimento.day):
-            anos -= 1
-        return max(0, anos)
-    except Exception:
-        return None
-
-
 def _instagram_normalizado(instagram_raw: str | None):
     raw = (instagram_raw or '').strip()
     if not raw:
@@ -145,23 +141,23 @@ def apresentacao_publica(request, uuid):
     for it in itens_qs:
         p = it.promotor
 
-        foto_rosto_url = None
-        foto_corpo_url = None
-        try:
-            foto_rosto_url = p.foto_rosto.url if getattr(p, 'foto_rosto', None) else None
-        except Exception:
-            foto_rosto_url = None
-        try:
-            foto_corpo_url = p.foto_corpo.url if getattr(p, 'foto_corpo', None) else None
-        except Exception:
-            foto_corpo_url = None
+        # Versão média como src; srcset deixa o navegador escolher pela largura do card
+        fotos = {}
+        for campo in ('foto_rosto', 'foto_corpo'):
+            try:
+                fotos[campo] = (
+                    url_miniatura(p.miniaturas, campo, 'm', getattr(p, campo)),
+                    srcset(p.miniaturas, campo),
+                )
+            except Exception:
+                fotos[campo] = (None, '')
 
         ig_text, ig_url = _instagram_normalizado(getattr(p, 'instagram', None))
 
         itens.append(
             {
                 'nome': getattr(p, 'nome_completo', '') or '',
-                'idade': _idade_em_anos(getattr(p, 'data_nascimento', None)),
+                'idade': idade(getattr(p, 'data_nascimento', None)),
                 'altura': str(getattr(p, 'altura', '') or '').replace(',', '.'),
                 'manequim': getattr(p, 'manequim', None),
                 'calcado': getattr(p, 'calcado', None),
@@ -169,8 +165,10 @@ def apresentacao_publica(request, uuid):
                 'uf': getattr(p, 'estado', None),
                 'instagram': ig_text,
                 'instagram_url': ig_url,
-                'foto_rosto_url': foto_rosto_url,
-                'foto_corpo_url': foto_corpo_url,
+                'foto_rosto_url': fotos['foto_rosto'][0],
+                'foto_rosto_srcset': fotos['foto_rosto'][1],
+                'foto_corpo_url': fotos['foto_corpo'][0],
+                'foto_corpo_srcset': fotos['foto_corpo'][1],
             }
         )
 
@@ -220,181 +218,83 @@ def lista_vagas(request):
     vagas_disponiveis_qs = Job.objects.filter(status='aberto').exclude(id__in=ids_candidaturas).order_by('-criado_em')
 
     # 3. Histórico de Atividades
-    meus_eventos = Candidatura.objects.filter(modelo=perfil).order_by('-data_candidatura')
+    meus_eventos = Candidatura.objects.filter(modelo=perfil).select_related('job').order_by('-data_candidatura')
 
     # 4. Cálculo de Progresso (Gamificação)
     progresso = 50 
     if perfil.foto_rosto: progresso += 25
     if perfil.foto_corpo: progresso += 25
     progresso = min(progresso, 100)
-    
-    def _haversine_km(lat1, lon1, lat2, lon2):
-        r = 6371.0
-        p1 = math.radians(float(lat1))
-        p2 = math.radians(float(lat2))
-        dp = math.radians(float(lat2) - float(lat1))
-        dl = math.radians(float(lon2) - float(lon1))
-        a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return r * c
-
-    def _parse_csv_set(raw: str):
-        raw = (raw or '').strip()
-        if not raw:
-            return set()
-        return {p.strip() for p in raw.replace('\n', ',').split(',') if p and p.strip()}
-
-    def _parse_areas(raw: str):
-        # Aceita tokens ou labels legados; ignora "Outros: ..."
-        raw = (raw or '').strip()
-        if not raw:
-            return set()
-        raw = raw.split('Outros:', 1)[0]
-        parts = [p.strip() for p in raw.split(',') if p and p.strip()]
-        allowed = {k for (k, _lbl) in UserProfile.AREAS_ATUACAO_CHOICES}
-        label_to_value = {str(lbl).casefold(): val for val, lbl in UserProfile.AREAS_ATUACAO_CHOICES}
-        out = set()
-        for part in parts:
-            if part in allowed:
-                out.add(part)
-                continue
-            mapped = label_to_value.get(str(part).casefold())
-            if mapped:
-                out.add(mapped)
-        return out
-
-    def _idioma_rank(val: str | None) -> int:
-        order = {'basico': 1, 'intermediario': 2, 'fluente': 3}
-        return order.get(val or '', 0)
-
-    def _fit_info(job: Job, perfil: UserProfile):
-        total = 0
-        passed = 0
-
-        # Tipo de serviço
-        job_serv = _parse_areas(job.tipo_servico)
-        if job_serv:
-            total += 1
-            perfil_serv = _parse_areas(perfil.areas_atuacao)
-            if perfil_serv.intersection(job_serv):
-                passed += 1
-
-        # Experiência
-        if getattr(job, 'requer_experiencia', False):
-            total += 1
-            if (perfil.experiencia or '') != 'sem_experiencia':
-                passed += 1
-
-        # Sexo/Gênero
-        generos = _parse_csv_set(job.generos_aceitos)
-        if generos:
-            total += 1
-            if (perfil.genero or '') in generos:
-                passed += 1
-
-        # Etnia
-        etnias = _parse_csv_set(job.etnias_aceitas)
-        if etnias:
-            total += 1
-            if (perfil.etnia or '') in etnias:
-                passed += 1
-
-        # Cor dos olhos
-        olhos = _parse_csv_set(getattr(job, 'olhos_aceitos', '') or '')
-        if olhos:
-            total += 1
-            if (perfil.olhos or '') in olhos:
-                passed += 1
 
-        # Tipo de cabelo
-        cabelo_tipos = _parse_csv_set(getattr(job, 'cabelo_tipos_aceitos', '') or '')
-        if cabelo_tipos:
-            total += 1
-            if (perfil.cabelo_tipo or '') in cabelo_tipos:
-                passed += 1
-
-        # Comprimento do cabelo
-        cabelo_comps = _parse_csv_set(getattr(job, 'cabelo_comprimentos_aceitos', '') or '')
-        if cabelo_comps:
-            total += 1
-            if (getattr(perfil, 'cabelo_comprimento', None) or '') in cabelo_comps:
-                passed += 1
-
-        # Inglês mínimo
-        if job.nivel_ingles_min:
-            total += 1
-            if _idioma_rank(perfil.nivel_ingles) >= _idioma_rank(job.nivel_ingles_min):
-                passed += 1
-
-        if total == 0:
-            return {
-                'status': 'good',
-                'message': 'Sem exigências obrigatórias — seu perfil pode se candidatar.',
-                'passed': 0,
-                'total': 0,
-            }
-
-        if passed == total:
-            return {
-                'status': 'good',
-                'message': 'Seu perfil atende aos requisitos.',
-                'passed': passed,
-                'total': total,
-            }
-
-        missing = total - passed
-        if missing <= 1 or (passed / total) >= 0.7:
-            return {
-                'status': 'almost',
-                'message': 'Seu perfil atende a quase todos requisitos.',
-                'passed': passed,
-                'total': total,
-            }
-
-        return {
-            'status': 'bad',
-            'message': 'Seu perfil não atende aos requisitos.',
-            'passed': passed,
-            'total': total,
-        }
-
-    vagas_disponiveis = list(vagas_disponiveis_qs.prefetch_related('dias'))
     perfil_lat = getattr(perfil, 'latitude', None)
     perfil_lon = getattr(perfil, 'longitude', None)
+    tem_coordenadas = perfil_lat is not None and perfil_lon is not None
 
-    for job in vagas_disponiveis:
-        # Distância
-        job.distance_km = None
-        if perfil_lat is not None and perfil_lon is not None and getattr(job, 'latitude', None) is not None and getattr(job, 'longitude', None) is not None:
-            try:
-                job.distance_km = round(_haversine_km(perfil_lat, perfil_lon, job.latitude, job.longitude), 1)
-            except Exception:
-                job.distance_km = None
-
-        # Próximo dia/horário (para destaque)
-        try:
-            job.next_dia = job.dias.order_by('data').first()
-        except Exception:
-            job.next_dia = None
-
-        # Compatibilidade
-        job.fit = _fit_info(job, perfil)
+    # Filtro "até N km" e ordenação por distância (só quando o perfil tem coordenadas)
+    raio_km = None
+    try:
+        raio_km = int(request.GET.get('raio') or 0) or None
+    except (TypeError, ValueError):
+        raio_km = None
+    ordem = (request.GET.get('ordem') or '').strip()
+
+    # "Só compatíveis": vagas cujas exigências de gênero/etnia/olhos/cabelo o perfil atende
+    # (AND de bits sobre as máscaras das vagas abertas, em cache)
+    so_compativeis = request.GET.get('compativeis') == '1'
+    if so_compativeis:
+        vagas_disponiveis_qs = vagas_disponiveis_qs.filter(id__in=jobs_compativeis(perfil.atributos_bits))
+
+    if raio_km and tem_coordenadas:
+        # Pré-filtro no banco pelo retângulo que contém o raio; o corte exato vem depois.
+        vagas_disponiveis_qs = vagas_disponiveis_qs.filter(**filtro_bounding_box(perfil_lat, perfil_lon, raio_km))
+
+    # Dias já ordenados em uma única consulta (evita N+1 no "próximo dia")
+    dias_ordenados = Prefetch('dias', queryset=JobDia.objects.order_by('data', 'hora_inicio', 'id'))
+    vagas_disponiveis = list(vagas_disponiveis_qs.prefetch_related(dias_ordenados))
+    hoje = timezone.localdate()
+    fits = fits_para_perfil(perfil, vagas_disponiveis)
+    choice_map = dict(UserProfile.AREAS_ATUACAO_CHOICES)
+
+    # Distâncias de todas as vagas calculadas de uma vez
+    distancias = distancias_km(perfil_lat, perfil_lon, [(job.latitude, job.longitude) for job in vagas_disponiveis])
+
+    for job, dist in zip(vagas_disponiveis, distancias):
+        job.distance_km = round(dist, 1) if dist is not None else None
+
+        # Próximo dia/horário (para destaque): o primeiro a partir de hoje,
+        # ou o primeiro cadastrado quando todos já passaram.
+        dias_job = job.dias.all()
+        job.next_dia = next((d for d in dias_job if d.data >= hoje), None)
+        if job.next_dia is None and dias_job:
+            job.next_dia = dias_job[0]
+
+        # Compatibilidade (índice pré-calculado)
+        job.fit = fits.get(job.pk)
 
         # Labels de tipo de serviço para exibição
         try:
-            choice_map = dict(UserProfile.AREAS_ATUACAO_CHOICES)
-            job.tipo_servico_labels = [choice_map.get(t, t) for t in sorted(_parse_areas(job.tipo_servico))]
+            job.tipo_servico_labels = [choice_map.get(t, t) for t in sorted(compilar_job(job).areas)]
         except Exception:
             job.tipo_servico_labels = []
 
+    if raio_km and tem_coordenadas:
+        vagas_disponiveis = [job for job in vagas_disponiveis if job.distance_km is not None and job.distance_km <= raio_km]
+    if ordem == 'distancia' and tem_coordenadas:
+        vagas_disponiveis.sort(key=lambda job: (job.distance_km is None, job.distance_km or 0))
+
     context = {
         'perfil': perfil,
         'vagas_disponiveis': vagas_disponiveis,
+        'raio_km': raio_km,
+        'opcoes_raio': (5, 10, 25, 50, 100),
+        'ordem': ordem,
+        'so_compativeis': so_compativeis,
+        'tem_coordenadas': tem_coordenadas,
         'meus_eventos': meus_eventos,
         'progresso': progresso,
-        'nota_media': perfil.nota_media(),
-        'total_jobs': perfil.total_jobs(),
-        'total_avaliacoes': perfil.avaliacoes.count(),
+        'nota_media': round(perfil.nota_media, 1) if perfil.total_avaliacoes else 0,
+        'total_jobs': perfil.total_jobs_aprovados,
+        'total_avaliacoes': perfil.total_avaliacoes,
         'is_admin': False
     }
     
@@ -404,126 +304,6 @@ def lista_vagas(request):
 @login_required(login_url='/login/')
 def detalhe_vaga(request, job_id):
     job = get_object_or_404(Job, id=job_id)
-    def _haversine_km(lat1, lon1, lat2, lon2):
-        r = 6371.0
-        p1 = math.radians(float(lat1))
-        p2 = math.radians(float(lat2))
-        dp = math.radians(float(lat2) - float(lat1))
-        dl = math.radians(float(lon2) - float(lon1))
-        a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return r * c
-
-    def _parse_csv_set(raw: str):
-        raw = (raw or '').strip()
-        if not raw:
-            return set()
-        return {p.strip() for p in raw.replace('\n', ',').split(',') if p and p.strip()}
-
-    def _parse_areas(raw: str):
-        raw = (raw or '').strip()
-        if not raw:
-            return set()
-        raw = raw.split('Outros:', 1)[0]
-        parts = [p.strip() for p in raw.split(',') if p and p.strip()]
-        allowed = {k for (k, _lbl) in UserProfile.AREAS_ATUACAO_CHOICES}
-        label_to_value = {str(lbl).casefold(): val for val, lbl in UserProfile.AREAS_ATUACAO_CHOICES}
-        out = set()
-        for part in parts:
-            if part in allowed:
-                out.add(part)
-                continue
-            mapped = label_to_value.get(str(part).casefold())
-            if mapped:
-                out.add(mapped)
-        return out
-
-    def _idioma_rank(val: str | None) -> int:
-        order = {'basico': 1, 'intermediario': 2, 'fluente': 3}
-        return order.get(val or '', 0)
-
-    def _fit_info(job: Job, perfil: UserProfile):
-        total = 0
-        passed = 0
-
-        job_serv = _parse_areas(job.tipo_servico)
-        if job_serv:
-            total += 1
-            perfil_serv = _parse_areas(perfil.areas_atuacao)
-            if perfil_serv.intersection(job_serv):
-                passed += 1
-
-        if getattr(job, 'requer_experiencia', False):
-            total += 1
-            if (perfil.experiencia or '') != 'sem_experiencia':
-                passed += 1
-
-        generos = _parse_csv_set(job.generos_aceitos)
-        if generos:
-            total += 1
-            if (perfil.genero or '') in generos:
-                passed += 1
-
-        etnias = _parse_csv_set(job.etnias_aceitas)
-        if etnias:
-            total += 1
-            if (perfil.etnia or '') in etnias:
-                passed += 1
-
-        olhos = _parse_csv_set(getattr(job, 'olhos_aceitos', '') or '')
-        if olhos:
-            total += 1
-            if (perfil.olhos or '') in olhos:
-                passed += 1
-
-        cabelo_tipos = _parse_csv_set(getattr(job, 'cabelo_tipos_aceitos', '') or '')
-        if cabelo_tipos:
-            total += 1
-            if (perfil.cabelo_tipo or '') in cabelo_tipos:
-                passed += 1
-
-        cabelo_comps = _parse_csv_set(getattr(job, 'cabelo_comprimentos_aceitos', '') or '')
-        if cabelo_comps:
-            total += 1
-            if (getattr(perfil, 'cabelo_comprimento', None) or '') in cabelo_comps:
-                passed += 1
-
-        if job.nivel_ingles_min:
-            total += 1
-            if _idioma_rank(perfil.nivel_ingles) >= _idioma_rank(job.nivel_ingles_min):
-                passed += 1
-
-        if total == 0:
-            return {
-                'status': 'good',
-                'message': 'Sem exigências obrigatórias — seu perfil pode se candidatar.',
-                'passed': 0,
-                'total': 0,
-            }
-
-        if passed == total:
-            return {
-                'status': 'good',
-                'message': 'Seu perfil atende aos requisitos.',
-                'passed': passed,
-                'total': total,
-            }
-
-        missing = total - passed
-        if missing <= 1 or (passed / total) >= 0.7:
-            return {
-                'status': 'almost',
-                'message': 'Seu perfil atende a quase todos requisitos.',
-                'passed': passed,
-                'total': total,
-            }
-
-        return {
-            'status': 'bad',
-            'message': 'Seu perfil não atende aos requisitos.',
-            'passed': passed,
-            'total': total,
-        }
 
     dias = job.dias.all().order_by('data')
 
@@ -544,10 +324,12 @@ def detalhe_vaga(request, job_id):
         ja_candidatou = Candidatura.objects.filter(job=job, modelo=perfil).exists()
 
         # Requisitos para exibição (somente os selecionados)
+        requisitos = compilar_job(job)
+        aceitos = dict(requisitos.aceitos)
         requirements = []
         try:
             choice_map = dict(UserProfile.AREAS_ATUACAO_CHOICES)
-            serv_labels = [choice_map.get(t, t) for t in sorted(_parse_areas(job.tipo_servico))]
+            serv_labels = [choice_map.get(t, t) for t in sorted(requisitos.areas)]
             outros_txt = (getattr(job, 'tipo_servico_outros', '') or '').strip()
             if outros_txt:
                 serv_labels.append(outros_txt)
@@ -559,27 +341,27 @@ def detalhe_vaga(request, job_id):
         if getattr(job, 'requer_experiencia', False):
             requirements.append(('Experiência', 'Precisa ter experiência'))
 
-        generos = sorted(_parse_csv_set(job.generos_aceitos))
+        generos = sorted(aceitos.get('genero', ()))
         if generos:
             gen_labels = {'masculino': 'Masculino', 'feminino': 'Feminino'}
             requirements.append(('Sexo', ', '.join([gen_labels.get(g, g) for g in generos])))
 
-        etnias = sorted(_parse_csv_set(job.etnias_aceitas))
+        etnias = sorted(aceitos.get('etnia', ()))
         if etnias:
             et_map = dict(UserProfile.ETNIA_CHOICES)
             requirements.append(('Cor/Etnia', ', '.join([et_map.get(e, e) for e in etnias])))
 
-        olhos = sorted(_parse_csv_set(getattr(job, 'olhos_aceitos', '') or ''))
+        olhos = sorted(aceitos.get('olhos', ()))
         if olhos:
             o_map = dict(UserProfile.OLHOS_CHOICES)
             requirements.append(('Cor dos olhos', ', '.join([o_map.get(o, o) for o in olhos])))
 
-        cabelo_tipos = sorted(_parse_csv_set(getattr(job, 'cabelo_tipos_aceitos', '') or ''))
+        cabelo_tipos = sorted(aceitos.get('cabelo_tipo', ()))
         if cabelo_tipos:
             c_map = dict(UserProfile.CABELO_TIPO_CHOICES)
             requirements.append(('Tipo de cabelo', ', '.join([c_map.get(c, c) for c in cabelo_tipos])))
 
-        cabelo_comps = sorted(_parse_csv_set(getattr(job, 'cabelo_comprimentos_aceitos', '') or ''))
+        cabelo_comps = sorted(aceitos.get('cabelo_comprimento', ()))
         if cabelo_comps:
             cc_map = dict(UserProfile.CABELO_TAM_CHOICES)
             requirements.append(('Comprimento do cabelo', ', '.join([cc_map.get(c, c) for c in cabelo_comps])))
@@ -595,11 +377,11 @@ def detalhe_vaga(request, job_id):
         distance_km = None
         if getattr(perfil, 'latitude', None) is not None and getattr(perfil, 'longitude', None) is not None and getattr(job, 'latitude', None) is not None and getattr(job, 'longitude', None) is not None:
             try:
-                distance_km = round(_haversine_km(perfil.latitude, perfil.longitude, job.latitude, job.longitude), 1)
+                distance_km = round(haversine_km(perfil.latitude, perfil.longitude, job.latitude, job.longitude), 1)
             except Exception:
                 distance_km = None
 
-        fit = _fit_info(job, perfil)
+        fit = score_jobs(perfil, [job])[job.pk]
 
         return render(request, 'job_detail.html', {
             'job': job,
@@ -713,7 +495,7 @@ def perfil_publico(request, uuid):
     return render(request, 'publico_perfil.html', {
         'perfil': perfil, 
         'avaliacoes': avaliacoes, 
-        'nota_media': perfil.nota_media()
+        'nota_media': round(perfil.nota_media, 1) if perfil.total_avaliacoes else 0
     })
 
 # --- 8. AVALIAR PROMOTOR (NOVA LÓGICA INTEGRADA) ---
@@ -737,70 +519,133 @@ def avaliar_promotor(request, uuid):
 
 
 
-@login_required
-def api_search_promoters(request):
+def _base_busca_promotores(request):
+    """Promotores aprovados + termo (?q=) + reputação + raio, sem os filtros de faceta.
+
+    Retorna (queryset, centro); centro é None sem filtro de raio.
+    """
     term = request.GET.get('q', '').strip()
     
     # Base QuerySet: Apenas aprovados
     qs = UserProfile.objects.filter(status='aprovado')
 
-    if term:
-        # Se tiver busca, filtra por nome ou CPF
-        qs = qs.filter(Q(nome_completo__icontains=term) | Q(cpf__icontains=term))
-    
-    # Limita e ordena (traz os 50 primeiros em ordem alfabética para facilitar a busca visual)
-    qs = qs.order_by('nome_completo')
-
-    # --- FILTROS EXTENDIDOS (Popup) ---
-    f_genero = request.GET.get('genero', '').strip()
-    if f_genero:
-        qs = qs.filter(genero=f_genero)
-
-    f_etnia = request.GET.get('etnia', '').strip()
-    if f_etnia:
-        qs = qs.filter(etnia=f_etnia)
-        
-    f_cabelo_tipo = request.GET.get('cabelo_tipo', '').strip()
-    if f_cabelo_tipo:
-        qs = qs.filter(cabelo_tipo=f_cabelo_tipo)
-        
-    f_cabelo_comprimento = request.GET.get('cabelo_comprimento', '').strip()
-    if f_cabelo_comprimento:
-        qs = qs.filter(cabelo_comprimento=f_cabelo_comprimento)
-
-    f_olhos = request.GET.get('olhos', '').strip()
-    if f_olhos:
-        qs = qs.filter(olhos=f_olhos)
-        
-    f_cidade = request.GET.get('cidade', '').strip()
-    if f_cidade:
-        qs = qs.filter(cidade__icontains=f_cidade)
-
-    f_estado = request.GET.get('estado', '').strip()
-    if f_estado:
-        qs = qs.filter(estado__iexact=f_estado)
-
-    # Limita (traz os 50 primeiros)
-    qs = qs[:50]
+    # Busca por nome (prefixo de palavras, sem acentos) ou CPF; melhores casamentos primeiro
+    qs = filtrar_por_termo(qs, term)
+
+    # Reputação mínima (?nota_min=, ?jobs_min=): colunas desnormalizadas
+    qs = filtrar_reputacao(qs, request.GET)
 
+    # --- RAIO (?job=<id> ou ?lat=&lon=, com ?raio_km=) ---
+    centro = None
+    try:
+        raio_km = float(request.GET.get('raio_km', '').replace(',', '.'))
+    except ValueError:
+        raio_km = None
+    if raio_km and raio_km > 0:
+        f_job = request.GET.get('job', '').strip()
+        if f_job:
+            job = Job.objects.filter(pk=f_job).only('latitude', 'longitude').first() if f_job.isdigit() else None
+            if job is not None and job.latitude is not None and job.longitude is not None:
+                centro = (job.latitude, job.longitude)
+        else:
+            try:
+                centro = (float(request.GET['lat']), float(request.GET['lon']))
+            except (KeyError, ValueError):
+                centro = None
+    if centro is not None:
+        qs = filtrar_por_raio(qs, centro[0], centro[1], raio_km)
+    return qs, centro
+
+
+@staff_member_required
+def api_facetas_promotores(request):
+    """Contagem por valor de cada faceta do modal para o filtro atual.
+
+    Com ?status__exact= (modal da Base de Promotores) a base é a própria
+    listagem do admin: busca (?q= por icontains), abas, faixas, áreas,
+    bairro, raio etc. Sem ele (seletor de promotores da apresentação), a
+    mesma base de api_search_promoters. Só equipe: expõe totais de perfis
+    pendentes/reprovados.
+    """
+    selecao = facetas_selecionadas(request.GET)
+    if 'status__exact' in request.GET:
+        # A contagem de cada faceta não aplica a seleção dela (contar_facetas)
+        params = request.GET.copy()
+        for parametro in list(params):
+            if parametro.split('__', 1)[0] in FACETAS:
+                del params[parametro]
+        qs = queryset_listagem(params, request.user)
+    else:
+        qs, _centro = _base_busca_promotores(request)
+    return JsonResponse({'facetas': contar_facetas(qs, selecao)})
+
+
+@login_required
+def api_search_promoters(request):
+    qs, centro = _base_busca_promotores(request)
+
+    # --- FILTROS EXTENDIDOS (Popup: genero, etnia, olhos, cabelo, cidade, estado) ---
+    qs = filtrar_facetas(qs, facetas_selecionadas(request.GET))
+
+    ordem_reputacao = ORDENS_REPUTACAO.get(request.GET.get('ordem', '').strip())
+    if ordem_reputacao:
+        # ?ordem=nota|jobs: "melhor avaliados" / "mais trabalhos" (colunas indexadas)
+        ordem = (*ordem_reputacao, 'id')
+    elif centro is not None:
+        # Ordena pela distância em vez da ordem alfabética
+        ordem = ('distancia_km2', 'id')
+    else:
+        # Melhores casamentos primeiro, depois ordem alfabética
+        ordem = ('relevancia', 'nome_completo', 'id')
+    qs = qs.order_by(*ordem)
+
+    # --- PAGINAÇÃO POR CURSOR (?cursor=<next da página anterior>&limit=) ---
+    try:
+        limite = min(max(int(request.GET.get('limit', 50)), 1), 100)
+    except ValueError:
+        limite = 50
+    cursor = request.GET.get('cursor', '').strip()
+    if cursor:
+        valores = decodificar_cursor(cursor, ordem)
+        if valores is None:
+            return JsonResponse({'error': 'Cursor inválido para esta busca.'}, status=400)
+        qs = apos_cursor(qs, ordem, valores)
+
+    # Só as colunas usadas na resposta (+ as da ordenação, para o cursor)
+    campos = [
+        'id', 'nome_completo', 'foto_rosto', 'miniaturas', 'cidade', 'estado', 'genero', 'altura', 'idade',
+        'nota_media', 'total_jobs_aprovados',
+    ]
+    if centro is not None:
+        campos += ['latitude', 'longitude']
+    campos_ordem = [campo.lstrip('-') for campo in ordem]
+    # Idade calculada no SELECT (expressão de core.idade), sem laço por linha
+    qs = qs.annotate(idade=expressao_idade())
+    linhas = list(qs.values(*dict.fromkeys(campos + campos_ordem))[:limite + 1])
+    proximo = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        proximo = codificar_cursor(ordem, [linhas[-1][campo] for campo in campos_ordem])
+
+    generos = dict(UserProfile.GENERO_CHOICES)
     results = []
-    today = datetime.date.today()
-    for p in qs:
-        foto = p.foto_rosto.url if p.foto_rosto else None
-        
-        # Calcular Idade
-        idade = None
-        if p.data_nascimento:
-            idade = today.year - p.data_nascimento.year - ((today.month, today.day) < (p.data_nascimento.month, p.data_nascimento.day))
-        
+    for p in linhas:
         results.append({
-            'id': p.pk, 
-            'text': p.nome_completo, 
-            'foto': foto, 
-            'cidade': p.cidade, 
-            'uf': p.estado,
-            'genero': p.get_genero_display() if p.genero else None,
-            'altura': str(p.altura).replace('.', ',') if p.altura else None,
-            'idade': idade
+            'id': p['id'], 
+            'text': p['nome_completo'], 
+            # Miniatura WebP (cai na original enquanto não houver)
+            'foto': url_miniatura(p['miniaturas'], 'foto_rosto', 'p', p['foto_rosto']),
+            'foto_srcset': srcset(p['miniaturas'], 'foto_rosto'),
+            'cidade': p['cidade'], 
+            'uf': p['estado'],
+            'genero': generos.get(p['genero'], p['genero']) if p['genero'] else None,
+            'altura': str(p['altura']).replace('.', ',') if p['altura'] else None,
+            'idade': p['idade'],
+            'nota': round(p['nota_media'], 1),
+            'jobs': p['total_jobs_aprovados'],
+            'distancia_km': (
+                round(haversine_km(centro[0], centro[1], p['latitude'], p['longitude']), 1)
+                if centro is not None else None
+            ),
         })
-    return JsonResponse({'results': results})
+    return JsonResponse({'results': results, 'next': proximo})
@@ -123,6 +123,27 @@ LOGIN_REDIRECT_URL = 'lista_vagas'
 LOGOUT_REDIRECT_URL = 'home'
 LOGIN_URL = 'login'
 
+# --- GEOCODING ---
+# Fila processada por `manage.py geocode_worker`: 'nominatim' ou 'stub' (offline)
+GEOCODIFICADOR = os.getenv('GEOCODIFICADOR', 'nominatim')
+# Validade do GeocodeCache (dias): resultados encontrados / "sem resultado"
+GEOCODE_CACHE_TTL_DIAS = 180
+GEOCODE_CACHE_TTL_NEGATIVO_DIAS = 30
+
+# --- CACHE ---
+# Compartilhado entre os processos (gunicorn): a invalidação feita por um
+# worker vale para todos. Tabela criada com `manage.py createcachetable`.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'core_cache',
+    }
+}
+
+# --- DASHBOARD ---
+# Validade (s) do snapshot de KPIs do admin (invalidado também pelos signals)
+DASHBOARD_CACHE_TTL = 60
+
 # --- CONFIGURAÇÃO DO ADMIN (JAZZMIN) ---
 JAZZMIN_SETTINGS = {
     # Textos
@@ -40,6 +40,7 @@ urlpatterns = [
     path('quem-somos/', views.quem_somos, name='quem_somos'),
     path('privacidade/', views.privacidade, name='privacidade'),
     path('api/search-promoters/', views.api_search_promoters, name='api_search_promoters'),
+    path('api/search-promoters/facetas/', views.api_facetas_promotores, name='api_facetas_promotores'),
 ]
 
 # CONFIGURAÇÃO PARA ARQUIVOS DE MÍDIA (FOTOS)